@@ -17,10 +17,14 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 
 import random
-from typing import Generator, List, Tuple, Union
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, Generator, List, Tuple, Union
 
 import math
-from constant_sorrow.constants import NO_CONTRACT_AVAILABLE
+from constant_sorrow.constants import NO_CONTRACT_AVAILABLE, PER_BLOCK, PER_PERIOD, IMMUTABLE
 from eth_utils.address import to_checksum_address
 from eth_tester.exceptions import TransactionFailed
 from twisted.logger import Logger
@@ -38,7 +42,10 @@ from nucypher.blockchain.eth.constants import (
     MULTISIG_CONTRACT_NAME,
     ETH_ADDRESS_BYTE_LENGTH
 )
-from nucypher.blockchain.eth.decorators import validate_checksum_address
+from nucypher.blockchain.eth.batch import BatchContractReader
+from nucypher.blockchain.eth.cache import ContractCallCache
+from nucypher.blockchain.eth.clients import EthereumTesterClient
+from nucypher.blockchain.eth.decorators import validate_checksum_address, cached_call
 from nucypher.blockchain.eth.interfaces import BlockchainInterface, BlockchainInterfaceFactory
 from nucypher.blockchain.eth.registry import AllocationRegistry, BaseContractRegistry
 from nucypher.blockchain.eth.utils import epoch_to_period
@@ -68,6 +75,14 @@ class ContractAgency:
             cls.__agents[registry_id][agent_class] = agent
             return agent
 
+    @classmethod
+    def clear_call_caches(cls) -> None:
+        """Forgets every cached view call result of the agency's agents, e.g. after the chain is reverted."""
+        for agents in cls.__agents.values():
+            for agent in agents.values():
+                if agent.call_cache is not None:
+                    agent.call_cache.clear()
+
 
 class EthereumContractAgent:
     """
@@ -81,6 +96,9 @@ class EthereumContractAgent:
     # TODO - #842: Gas Management
     DEFAULT_TRANSACTION_GAS_LIMITS = {}
 
+    # Read-through cache of view calls (see `cached_call`); set to 0 to disable.
+    DEFAULT_CALL_CACHE_SIZE = ContractCallCache.DEFAULT_MAX_SIZE
+
     class ContractNotDeployed(Exception):
         pass
 
@@ -88,7 +106,8 @@ class EthereumContractAgent:
                  registry: BaseContractRegistry,
                  provider_uri: str = None,
                  contract: Contract = None,
-                 transaction_gas: int = None
+                 transaction_gas: int = None,
+                 call_cache_size: int = None
                  ) -> None:
 
         self.log = Logger(self.__class__.__name__)
@@ -109,6 +128,10 @@ class EthereumContractAgent:
             transaction_gas = EthereumContractAgent.DEFAULT_TRANSACTION_GAS_LIMITS
         self.transaction_gas = transaction_gas
 
+        if call_cache_size is None:
+            call_cache_size = self.DEFAULT_CALL_CACHE_SIZE
+        self.call_cache = ContractCallCache(blockchain=self.blockchain, max_size=call_cache_size) if call_cache_size else None
+
         super().__init__()
         self.log.info("Initialized new {} for {} with {} and {}".format(self.__class__.__name__,
                                                                         self.contract.address,
@@ -135,6 +158,10 @@ class EthereumContractAgent:
     def contract_name(self) -> str:
         return self.registry_contract_name
 
+    def batch_reader(self, block_identifier: int = None) -> BatchContractReader:
+        """Returns a reader evaluating many calls at a single block (the latest one, by default)."""
+        return BatchContractReader(blockchain=self.blockchain, block_identifier=block_identifier)
+
     @property
     def owner(self):
         if not self._proxy_name:
@@ -201,12 +228,55 @@ class NucypherTokenAgent(EthereumContractAgent):
         return approve_and_call_receipt
 
 
+class StakerDistribution:
+    """
+    Snapshot of the active stakers' locked tokens for one period, laid out as a
+    cumulative (prefix-sum) array so that each sampling point can be resolved
+    to a staker with a binary search.
+    """
+
+    def __init__(self, period: int, duration: int, stakers: List[Tuple[str, int]]):
+        self.period = period
+        self.duration = duration
+
+        self.addresses = list()
+        self.cumulative_tokens = list()
+        total_tokens = 0
+        for staker_address, locked_tokens in stakers:
+            if not locked_tokens:
+                continue  # An empty stake can never be selected
+            total_tokens += locked_tokens
+            self.addresses.append(staker_address)
+            self.cumulative_tokens.append(total_tokens)
+        self.total_tokens = total_tokens
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __getitem__(self, point: int) -> str:
+        """Returns the staker whose stake contains the given point of the distribution"""
+        if not 0 <= point < self.total_tokens:
+            raise IndexError(f"Point {point} is outside of the stake distribution (0 - {self.total_tokens}).")
+        return self.addresses[bisect_right(self.cumulative_tokens, point)]
+
+
 class StakingEscrowAgent(EthereumContractAgent):
 
     registry_contract_name = STAKING_ESCROW_CONTRACT_NAME
     _proxy_name = DISPATCHER_CONTRACT_NAME
 
-    DEFAULT_PAGINATION_SIZE = 30    # TODO: Use dynamic pagination size (see #1424)
+    # Dynamic pagination of getActiveStakers (see #1424): starting from the default size,
+    # pages grow until the provider errors out or takes too long to answer, and shrink back when it does.
+    DEFAULT_PAGINATION_SIZE = 30
+    MAX_PAGINATION_SIZE = 3000
+    SLOW_PAGE_SECONDS = 2.0
+    PAGINATION_WORKERS = 4
+    _pagination_size = DEFAULT_PAGINATION_SIZE
+
+    # Staker distributions, shared by all agents (and so all policies) in this process.
+    # Keyed by (contract address, duration); replaced when the current period changes.
+    __distributions = dict()  # type: Dict[Tuple[str, int], StakerDistribution]
+    __distributions_lock = Lock()
 
     class NotEnoughStakers(Exception):
         pass
@@ -215,18 +285,25 @@ class StakingEscrowAgent(EthereumContractAgent):
     # Staker Network Status
     #
 
+    @cached_call(PER_BLOCK)
     def get_staker_population(self) -> int:
         """Returns the number of stakers on the blockchain"""
         return self.contract.functions.getStakersLength().call()
 
+    @cached_call(PER_BLOCK)
     def get_current_period(self) -> int:
         """Returns the current period"""
         return self.contract.functions.getCurrentPeriod().call()
 
+    @cached_call(PER_BLOCK)  # Not PER_PERIOD, which is worked out from this; the contract can be upgraded
+    def get_seconds_per_period(self) -> int:
+        return self.contract.functions.secondsPerPeriod().call()
+
     def get_stakers(self) -> List[str]:
         """Returns a list of stakers"""
-        num_stakers = self.get_staker_population()
-        stakers = [self.contract.functions.stakers(i).call() for i in range(num_stakers)]
+        reader = self.batch_reader()
+        num_stakers = reader.call(self.contract.functions.getStakersLength())
+        stakers = reader.call_many(self.contract.functions.stakers(i) for i in range(num_stakers))
         return stakers
 
     def partition_stakers_by_activity(self) -> Tuple[List[str], List[str], List[str]]:
@@ -235,13 +312,14 @@ class StakingEscrowAgent(EthereumContractAgent):
         The second, stakers that confirmed for current period but haven't confirmed next yet.
         The third contains stakers that have missed activity confirmation before current period"""
 
-        num_stakers = self.get_staker_population()
-        current_period = self.get_current_period()
+        reader = self.batch_reader()
+        num_stakers = reader.call(self.contract.functions.getStakersLength())
+        current_period = reader.call(self.contract.functions.getCurrentPeriod())
+        stakers = reader.call_many(self.contract.functions.stakers(i) for i in range(num_stakers))
+        last_active_periods = reader.call_many(self.contract.functions.getLastActivePeriod(staker) for staker in stakers)
 
         active_stakers, pending_stakers, missing_stakers = [], [], []
-        for i in range(num_stakers):
-            staker = self.contract.functions.stakers(i).call()
-            last_active_period = self.get_last_active_period(staker)
+        for staker, last_active_period in zip(stakers, last_active_periods):
             if last_active_period == current_period + 1:
                 active_stakers.append(staker)
             elif last_active_period == current_period:
@@ -252,26 +330,31 @@ class StakingEscrowAgent(EthereumContractAgent):
         return active_stakers, pending_stakers, missing_stakers
 
     def get_all_active_stakers(self, periods: int, pagination_size: int = None) -> Tuple[int, List[str]]:
-        """Only stakers which confirmed the current period (in the previous period) are used."""
+        """
+        Only stakers which confirmed the current period (in the previous period) are used.
+
+        On light clients (or when a `pagination_size` is given) the list is read in pages.
+        All pages are read at the same block number, so the result is consistent even if
+        the staker set changes while paging.  Without an explicit `pagination_size`,
+        the page size adapts to the provider (see `DEFAULT_PAGINATION_SIZE`).
+        """
         if not periods > 0:
             raise ValueError("Period must be > 0")
 
+        adaptive = pagination_size is None and self.blockchain.is_light
         if pagination_size is None:
-            pagination_size = StakingEscrowAgent.DEFAULT_PAGINATION_SIZE if self.blockchain.is_light else 0
+            pagination_size = self._pagination_size if self.blockchain.is_light else 0
         elif pagination_size < 0:
             raise ValueError("Pagination size must be >= 0")
 
         if pagination_size > 0:
-            num_stakers = self.get_staker_population()
-            start_index = 0
-            n_tokens = 0
-            stakers = list()
-            while start_index < num_stakers:
-                temp_locked_tokens, temp_stakers = \
-                    self.contract.functions.getActiveStakers(periods, start_index, pagination_size).call()
-                n_tokens += temp_locked_tokens
-                stakers += temp_stakers
-                start_index += pagination_size
+            block_number = self.blockchain.client.block_number
+            num_stakers = self.contract.functions.getStakersLength().call(block_identifier=block_number)
+            n_tokens, stakers = self.__get_active_stakers_pages(periods=periods,
+                                                                num_stakers=num_stakers,
+                                                                pagination_size=pagination_size,
+                                                                block_number=block_number,
+                                                                adaptive=adaptive)
         else:
             n_tokens, stakers = self.contract.functions.getActiveStakers(periods, 0, 0).call()
 
@@ -281,6 +364,67 @@ class StakingEscrowAgent(EthereumContractAgent):
 
         return n_tokens, stakers
 
+    def __get_active_stakers_page(self, periods: int, start_index: int, pagination_size: int, block_number: int):
+        function = self.contract.functions.getActiveStakers(periods, start_index, pagination_size)
+        locked_tokens, stakers = function.call(block_identifier=block_number)
+        return locked_tokens, list(stakers)
+
+    def __get_active_stakers_pages(self,
+                                   periods: int,
+                                   num_stakers: int,
+                                   pagination_size: int,
+                                   block_number: int,
+                                   adaptive: bool
+                                   ) -> Tuple[int, List]:
+        n_tokens, stakers = 0, list()
+        start_index = 0
+
+        if adaptive:
+            # Probe the provider with sequential pages, growing them while they come back fast
+            # and halving them on errors.  Stops once the size settles or everything is read.
+            while start_index < num_stakers:
+                started = time.monotonic()
+                try:
+                    locked_tokens, page = self.__get_active_stakers_page(periods, start_index, pagination_size, block_number)
+                except Exception as e:  # Providers report oversized calls in several different ways
+                    if pagination_size == 1:
+                        raise
+                    pagination_size = max(pagination_size // 2, 1)
+                    self.log.debug(f"getActiveStakers page failed ({e}); reducing page size to {pagination_size}")
+                    continue
+                elapsed = time.monotonic() - started
+
+                n_tokens += locked_tokens
+                stakers += page
+                start_index += pagination_size
+
+                if elapsed > self.SLOW_PAGE_SECONDS:
+                    pagination_size = max(pagination_size // 2, 1)
+                    break
+                elif pagination_size >= self.MAX_PAGINATION_SIZE:
+                    break
+                pagination_size = min(pagination_size * 2, self.MAX_PAGINATION_SIZE)
+
+            self._pagination_size = pagination_size  # Remembered for the next call
+
+        # Read the remaining pages concurrently, all pinned to the same block.
+        def read_page(index: int):
+            return self.__get_active_stakers_page(periods, index, pagination_size, block_number)
+
+        start_indices = range(start_index, num_stakers, pagination_size)
+        if isinstance(self.blockchain.client, EthereumTesterClient):
+            pages = list(map(read_page, start_indices))  # py-evm is not thread-safe
+        else:
+            with ThreadPoolExecutor(max_workers=self.PAGINATION_WORKERS) as executor:
+                pages = list(executor.map(read_page, start_indices))  # Preserves the order of the pages
+
+        for locked_tokens, page in pages:
+            n_tokens += locked_tokens
+            stakers += page
+
+        return n_tokens, stakers
+
+    @cached_call(PER_PERIOD)
     def get_all_locked_tokens(self, periods: int, pagination_size: int = None) -> int:
         all_locked_tokens, _stakers = self.get_all_active_stakers(periods=periods, pagination_size=pagination_size)
         return all_locked_tokens
@@ -289,6 +433,7 @@ class StakingEscrowAgent(EthereumContractAgent):
     # StakingEscrow Contract API
     #
 
+    @cached_call(PER_BLOCK)
     def get_global_locked_tokens(self, at_period: int = None) -> int:
         """
         Gets the number of locked tokens for *all* stakers that have
@@ -316,6 +461,7 @@ class StakingEscrowAgent(EthereumContractAgent):
     def get_staker_info(self, staker_address: str):
         return self.contract.functions.stakerInfo(staker_address).call()
 
+    @cached_call(PER_BLOCK)
     @validate_checksum_address
     def get_locked_tokens(self, staker_address: str, periods: int = 0) -> int:
         """
@@ -373,6 +519,7 @@ class StakingEscrowAgent(EthereumContractAgent):
         receipt = self.blockchain.send_transaction(contract_function=contract_function, sender_address=staker_address)
         return receipt
 
+    @cached_call(PER_BLOCK)
     @validate_checksum_address
     def get_last_active_period(self, staker_address: str) -> int:
         period = self.contract.functions.getLastActivePeriod(staker_address).call()
@@ -498,6 +645,7 @@ class StakingEscrowAgent(EthereumContractAgent):
         # TODO: Handle WindDownSet event (see #1193)
         return receipt
 
+    @cached_call(PER_PERIOD)  # Parameters change when the contract is upgraded
     def staking_parameters(self) -> Tuple:
         parameter_signatures = (
             # Period
@@ -532,10 +680,11 @@ class StakingEscrowAgent(EthereumContractAgent):
         Staker addresses are returned in the order in which they registered with the StakingEscrow contract's ledger
 
         """
-
-        for index in range(self.get_staker_population()):
-            staker_address = self.contract.functions.stakers(index).call()
-            yield staker_address
+        reader = self.batch_reader()
+        num_stakers = reader.call(self.contract.functions.getStakersLength())
+        for start in range(0, num_stakers, reader.MAX_BATCH_SIZE):
+            indices = range(start, min(start + reader.MAX_BATCH_SIZE, num_stakers))
+            yield from reader.call_many(self.contract.functions.stakers(index) for index in indices)
 
     def sample(self,
                quantity: int,
@@ -563,37 +712,24 @@ class StakingEscrowAgent(EthereumContractAgent):
         In this case, Stakers 0, 1, 3 and 5 will be selected.
 
         Only stakers which confirmed the current period (in the previous period) are used.
+
+        The stake distribution is downloaded once per period and shared (see `get_staker_distribution`);
+        each point is then resolved with a binary search over the cumulative stakes.
         """
 
         system_random = random.SystemRandom()
-        n_tokens, stakers = self.get_all_active_stakers(periods=duration, pagination_size=pagination_size)
+        distribution = self.get_staker_distribution(duration=duration, pagination_size=pagination_size)
+        n_tokens = distribution.total_tokens
         if n_tokens == 0:
             raise self.NotEnoughStakers('There are no locked tokens for duration {}.'.format(duration))
 
         sample_size = quantity
         for _ in range(attempts):
             sample_size = math.ceil(sample_size * additional_ursulas)
-            points = sorted(system_random.randrange(n_tokens) for _ in range(sample_size))
+            points = [system_random.randrange(n_tokens) for _ in range(sample_size)]
             self.log.debug(f"Sampling {sample_size} stakers with random points: {points}")
 
-            addresses = set()
-
-            point_index = 0
-            sum_of_locked_tokens = 0
-            staker_index = 0
-            stakers_len = len(stakers)
-            while staker_index < stakers_len and point_index < sample_size:
-                current_staker = stakers[staker_index][0]
-                staker_tokens = stakers[staker_index][1]
-                next_sum_value = sum_of_locked_tokens + staker_tokens
-
-                point = points[point_index]
-                if sum_of_locked_tokens <= point < next_sum_value:
-                    addresses.add(to_checksum_address(current_staker))
-                    point_index += 1
-                else:
-                    staker_index += 1
-                    sum_of_locked_tokens = next_sum_value
+            addresses = set(distribution[point] for point in points)
 
             self.log.debug(f"Sampled {len(addresses)} stakers: {list(addresses)}")
             if len(addresses) >= quantity:
@@ -601,6 +737,27 @@ class StakingEscrowAgent(EthereumContractAgent):
 
         raise self.NotEnoughStakers('Selection failed after {} attempts'.format(attempts))
 
+    def get_staker_distribution(self, duration: int, pagination_size: int = None) -> StakerDistribution:
+        """
+        Returns the stake distribution of stakers active for at least `duration` periods.
+        The distribution is cached process-wide and only re-downloaded when the current period changes.
+        """
+        current_period = self.get_current_period()
+        cache_key = (self.contract_address, duration)
+        with StakingEscrowAgent.__distributions_lock:
+            distribution = StakingEscrowAgent.__distributions.get(cache_key)
+            if distribution is None or distribution.period != current_period:
+                _n_tokens, stakers = self.get_all_active_stakers(periods=duration, pagination_size=pagination_size)
+                distribution = StakerDistribution(period=current_period, duration=duration, stakers=stakers)
+                StakingEscrowAgent.__distributions[cache_key] = distribution
+                self.log.debug(f"Cached stake distribution of {len(distribution)} stakers for period {current_period}")
+        return distribution
+
+    @classmethod
+    def clear_staker_distributions(cls) -> None:
+        with cls.__distributions_lock:
+            cls.__distributions.clear()
+
     def get_completed_work(self, bidder_address: str):
         total_completed_work = self.contract.functions.getCompletedWork(bidder_address).call()
         return total_completed_work
@@ -942,6 +1099,7 @@ class AdjudicatorAgent(EthereumContractAgent):
     def penalty_history(self, staker_address: str) -> int:
         return self.contract.functions.penaltyHistory(staker_address).call()
 
+    @cached_call(PER_PERIOD)  # Parameters change when the contract is upgraded
     def slashing_parameters(self) -> Tuple:
         parameter_signatures = (
             'hashAlgorithm',                    # Hashing algorithm
@@ -1094,6 +1252,7 @@ class WorkLockAgent(EthereumContractAgent):
         date = self.contract.functions.endBidDate().call()
         return date
 
+    @cached_call(IMMUTABLE)
     def worklock_parameters(self) -> Tuple:
         parameter_signatures = (
             'tokenSupply',
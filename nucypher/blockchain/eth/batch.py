@@ -0,0 +1,120 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from typing import Any, Iterable, List
+
+import requests
+from eth_abi import decode_abi
+from eth_utils import to_bytes
+from twisted.logger import Logger
+from web3 import HTTPProvider
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract import ContractFunction
+
+
+class BatchContractReader:
+    """
+    Evaluates many contract view calls at a single, pinned block.
+
+    Over HTTP, calls are sent as JSON-RPC batch requests (`MAX_BATCH_SIZE` calls per round trip),
+    falling back to sequential calls if the node refuses the batch.  Other providers (IPC, websockets
+    and eth-tester) send one request at a time through web3, so they always make plain sequential
+    calls, still pinned to the same block.
+    """
+
+    MAX_BATCH_SIZE = 500
+
+    class BatchCallFailed(RuntimeError):
+        pass
+
+    def __init__(self, blockchain, block_identifier: int = None):
+        self.log = Logger(self.__class__.__name__)
+        self.blockchain = blockchain
+        if block_identifier is None:
+            block_identifier = blockchain.client.block_number
+        self.block_identifier = block_identifier
+        self.round_trips = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(block={self.block_identifier})"
+
+    @property
+    def supports_batching(self) -> bool:
+        return isinstance(self.blockchain.w3.provider, HTTPProvider)
+
+    def call(self, contract_function: ContractFunction) -> Any:
+        """Evaluates a single contract call at the pinned block."""
+        return contract_function.call(block_identifier=self.block_identifier)
+
+    def call_many(self, contract_functions: Iterable[ContractFunction]) -> List[Any]:
+        """Evaluates all the contract calls at the pinned block, returning their results in order."""
+        contract_functions = list(contract_functions)
+        if not self.supports_batching:
+            return self.__sequential_call(contract_functions)
+
+        results = list()
+        for start in range(0, len(contract_functions), self.MAX_BATCH_SIZE):
+            chunk = contract_functions[start:start + self.MAX_BATCH_SIZE]
+            results.extend(self.__batch_call(chunk))
+        return results
+
+    def __sequential_call(self, contract_functions: List[ContractFunction]) -> List[Any]:
+        self.round_trips += len(contract_functions)
+        return [self.call(function) for function in contract_functions]
+
+    def __batch_call(self, contract_functions: List[ContractFunction]) -> List[Any]:
+        block = hex(self.block_identifier)
+        batch = [{'jsonrpc': '2.0',
+                  'id': request_id,
+                  'method': 'eth_call',
+                  'params': [{'to': function.address, 'data': function._encode_transaction_data()}, block]}
+                 for request_id, function in enumerate(contract_functions)]
+
+        provider = self.blockchain.w3.provider
+        response = requests.post(provider.endpoint_uri, json=batch, **provider.get_request_kwargs())
+        response.raise_for_status()
+        self.round_trips += 1
+
+        replies = response.json()
+        if not isinstance(replies, list):
+            # Nodes that won't serve a batch (e.g. one that's too large) may answer it with a single error.
+            error = replies.get('error') if isinstance(replies, dict) else replies
+            self.log.info(f"Batch of {len(contract_functions)} calls was refused ({error}); calling them one at a time.")
+            return self.__sequential_call(contract_functions)
+
+        responses = {item['id']: item for item in replies}
+        results = list()
+        for request_id, function in enumerate(contract_functions):
+            try:
+                result = responses[request_id]['result']
+            except KeyError:
+                error = responses.get(request_id, {}).get('error', 'no response')
+                raise self.BatchCallFailed(f"{function.fn_name}{tuple(function.args)} failed: {error}")
+            results.append(self.decode(function, to_bytes(hexstr=result)))
+        return results
+
+    @staticmethod
+    def decode(contract_function: ContractFunction, return_data: bytes) -> Any:
+        """Decodes raw call output the same way web3's ContractFunction.call does."""
+        output_types = get_abi_output_types(contract_function.abi)
+        output_data = decode_abi(output_types, return_data)
+        normalized_data = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, output_data)
+        if len(normalized_data) == 1:
+            return normalized_data[0]
+        return normalized_data
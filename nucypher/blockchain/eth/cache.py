@@ -0,0 +1,120 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Tuple
+
+from constant_sorrow.constants import PER_BLOCK, PER_PERIOD, IMMUTABLE
+
+from nucypher.blockchain.eth.clients import EthereumTesterClient
+
+
+class ContractCallCache:
+    """
+    Bounded, least-recently-used cache of contract view call results for an agent.
+
+    Each entry is stored along with the scope it was read in:
+
+        IMMUTABLE  - Valid forever (e.g. constructor parameters of a contract that can't be upgraded).
+        PER_PERIOD - Valid until the period of the latest block changes.
+        PER_BLOCK  - Valid until a new block is seen.
+
+    The latest block is polled at most once every `block_poll_interval` seconds,
+    and immediately after a transaction sent through this process is mined.
+    """
+
+    DEFAULT_MAX_SIZE = 1024
+    DEFAULT_BLOCK_POLL_INTERVAL = 1  # seconds
+
+    def __init__(self, blockchain, max_size: int = DEFAULT_MAX_SIZE, block_poll_interval: float = None):
+        self.blockchain = blockchain
+        self.max_size = max_size
+
+        if block_poll_interval is None:
+            # eth-tester is in-process and time travels; always read its latest block.
+            local = isinstance(blockchain.client, EthereumTesterClient)
+            block_poll_interval = 0 if local else self.DEFAULT_BLOCK_POLL_INTERVAL
+        self.block_poll_interval = block_poll_interval
+
+        self.__entries = OrderedDict()
+        self.__lock = RLock()
+        self.__latest_block = (-1, 0)  # (number, timestamp)
+        self.__last_poll = 0.0
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__last_poll = 0.0
+
+    def latest_block(self) -> Tuple[int, int]:
+        """Returns the (number, timestamp) of the latest known block, polling the provider if it's due."""
+        number, _timestamp = self.__latest_block
+        now = time.monotonic()
+        stale = now - self.__last_poll >= self.block_poll_interval
+        behind = getattr(self.blockchain, 'latest_transaction_block', -1) > number
+        if stale or behind:
+            block = self.blockchain.w3.eth.getBlock('latest')
+            self.__latest_block = (block.number, block.timestamp)
+            self.__last_poll = now
+        return self.__latest_block
+
+    def scope_marker(self, agent, scope) -> Any:
+        if scope is IMMUTABLE:
+            return IMMUTABLE
+        number, timestamp = self.latest_block()
+        if scope is PER_PERIOD:
+            get_seconds_per_period = getattr(agent, 'get_seconds_per_period', None)
+            if get_seconds_per_period is not None:
+                return PER_PERIOD, timestamp // get_seconds_per_period()
+        return PER_BLOCK, number
+
+    def read_through(self, agent, func: Callable, scope, args: tuple, kwargs: dict) -> Any:
+        try:
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            return func(agent, *args, **kwargs)  # Unhashable arguments; don't cache
+
+        marker = self.scope_marker(agent, scope)
+        with self.__lock:
+            try:
+                entry_marker, value = self.__entries[key]
+            except KeyError:
+                pass
+            else:
+                if entry_marker == marker:
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+        value = func(agent, *args, **kwargs)
+        with self.__lock:
+            self.misses += 1
+            self.__entries[key] = (marker, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+        return value
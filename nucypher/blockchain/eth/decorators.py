@@ -106,6 +106,30 @@ def validate_secret(func: Callable) -> Callable:
     return wrapped
 
 
+def cached_call(scope) -> Callable:
+    """
+    Read-through caching of an agent's contract view call.
+
+    `scope` declares when a cached result becomes invalid: PER_BLOCK, PER_PERIOD or IMMUTABLE.
+    Results are stored in the agent's `call_cache` (see ContractCallCache); agents without
+    one (i.e. with caching disabled) always call through to the contract.
+    """
+
+    def decorator(func: Callable) -> Callable:
+
+        @functools.wraps(func)
+        def wrapped(agent, *args, **kwargs):
+            call_cache = getattr(agent, 'call_cache', None)
+            if call_cache is None:
+                return func(agent, *args, **kwargs)
+            return call_cache.read_through(agent, func, scope, args, kwargs)
+
+        wrapped.cache_scope = scope
+        return wrapped
+
+    return decorator
+
+
 def only_me(func):
     """Decorator to enforce invocation of permissioned actor methods"""
     def wrapped(actor=None, *args, **kwargs):
@@ -183,6 +183,7 @@ class BlockchainInterface:
         self.client = NO_BLOCKCHAIN_CONNECTION  # type: Web3Client
         self.transacting_power = READ_ONLY_INTERFACE
         self.is_light = light
+        self.latest_transaction_block = -1  # Block number of the last transaction mined via this interface
 
     def __repr__(self):
         r = '{name}({uri})'.format(name=self.__class__.__name__, uri=self.provider_uri)
@@ -421,6 +422,7 @@ class BlockchainInterface:
             raise
         else:
             self.log.debug(f"[RECEIPT-{transaction_name}] | txhash: {receipt['transactionHash'].hex()}")
+            self.latest_transaction_block = max(self.latest_transaction_block, receipt['blockNumber'])
 
         #
         # Confirm
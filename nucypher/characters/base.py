@@ -43,7 +43,7 @@ from umbral.signing import Signature
 from nucypher.blockchain.eth.agents import StakingEscrowAgent
 from nucypher.blockchain.eth.interfaces import BlockchainInterface
 from nucypher.blockchain.eth.registry import BaseContractRegistry, InMemoryContractRegistry
-from nucypher.characters.control.controllers import JSONRPCController, CLIController
+from nucypher.characters.control.controllers import CLIController, JSONRPCController, MessagePackRPCController
 from nucypher.config.keyring import NucypherKeyring
 from nucypher.config.node import CharacterConfiguration
 from nucypher.crypto.api import encrypt_and_sign
@@ -443,7 +443,7 @@ class Character(Learner):
 
             if sig_header == SIGNATURE_IS_ON_CIPHERTEXT:
                 # The ciphertext is what is signed - note that for later.
-                message = message_kit.ciphertext
+                message = bytes(message_kit.ciphertext)
                 if not signature:
                     raise ValueError("Can't check a signature on the ciphertext if don't provide one.")
 
@@ -519,11 +519,18 @@ class Character(Learner):
 
         self._checksum_address = public_address
 
-    def make_rpc_controller(self, crash_on_error: bool = False):
+    def make_rpc_controller(self,
+                            crash_on_error: bool = False,
+                            binary: bool = False,
+                            workers: int = JSONRPCController.DEFAULT_WORKERS,
+                            batch_concurrency: int = None):
         app_name = bytes(self.stamp).hex()[:6]
-        controller = JSONRPCController(app_name=app_name,
-                                       crash_on_error=crash_on_error,
-                                       interface=self.interface)
+        controller_class = MessagePackRPCController if binary else JSONRPCController
+        controller = controller_class(app_name=app_name,
+                                      crash_on_error=crash_on_error,
+                                      interface=self.interface,
+                                      workers=workers,
+                                      batch_concurrency=batch_concurrency)
 
         self.controller = controller
         return controller
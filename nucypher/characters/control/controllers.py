@@ -1,21 +1,37 @@
 import inspect
 import json
+import os
+import socket
+import stat
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from json import JSONDecodeError
-from typing import Callable
+from typing import Callable, Union
 
 import maya
+import msgpack
 from flask import Response, Flask
 from hendrix.deploy.base import HendrixDeploy
 from marshmallow import Schema
-from twisted.internet import reactor, stdio
+from twisted.internet import defer, reactor, stdio
 from twisted.logger import Logger
 
-from nucypher.characters.control.emitters import StdoutEmitter, WebEmitter, JSONRPCStdoutEmitter
+from nucypher.characters.control.emitters import (JSONRPCStdoutEmitter,
+                                                  MessagePackRPCStdoutEmitter,
+                                                  MSGPACK_CONTENT_TYPE,
+                                                  StdoutEmitter,
+                                                  WebEmitter)
 from nucypher.characters.control.interfaces import CharacterPublicInterface
+from nucypher.characters.control.metrics import ControllerMetrics
 from nucypher.characters.control.specifications.exceptions import SpecificationError
-from nucypher.cli.processes import JSONRPCLineReceiver
-from nucypher.utilities.controllers import JSONRPCTestClient
+from nucypher.cli.processes import (JSONRPCLineReceiver,
+                                    JSONRPCSocketReceiver,
+                                    MessagePackRPCReceiver,
+                                    MessagePackRPCSocketReceiver,
+                                    RPCSocketFactory)
+from nucypher.utilities.controllers import JSONRPCTestClient, MessagePackRPCTestClient
 
 
 class CharacterControllerBase(ABC):
@@ -29,20 +45,41 @@ class CharacterControllerBase(ABC):
     (stdio, http, in-memory python containers, other IPC, or another protocol.)
     """
     _emitter_class = NotImplemented
+    metrics = None  # type: ControllerMetrics
 
     def __init__(self):
 
         # Control Emitter
         self.emitter = self._emitter_class()
 
-    def _perform_action(self, action: str, request: dict) -> dict:
+    def enable_metrics(self, metrics: ControllerMetrics = None) -> ControllerMetrics:
+        """Starts recording calls, errors, payload sizes and latencies of every interface method."""
+        self.metrics = metrics or ControllerMetrics()
+        return self.metrics
+
+    def _perform_action(self, action: str, request: dict, binary: bool = False) -> dict:
         """
         This method is where input validation and method invocation
         happens for all character actions.
+
+        Binary transports (msgpack) get bytes in the response data instead of base64 or hex strings.
         """
+        if self.metrics is None:
+            return self.__perform_action(action=action, request=request, binary=binary)
+
+        start = time.perf_counter()
+        try:
+            response_data = self.__perform_action(action=action, request=request, binary=binary)
+        except Exception:
+            self.metrics.observe_call(action, duration=time.perf_counter() - start, error=True)
+            raise
+        self.metrics.observe_call(action, duration=time.perf_counter() - start)
+        return response_data
+
+    def __perform_action(self, action: str, request: dict, binary: bool) -> dict:
         request = request or {}  # for requests with no input params request can be ''
         method = getattr(self.interface, action, None)
-        serializer = method._schema
+        serializer = method._binary_schema if binary else method._schema
         params = serializer.load(request) # input validation will occur here.
 
         response = method(**params)  # < ---- INLET
@@ -129,23 +166,91 @@ class CLIController(CharacterControlServer):
         return self.emitter.ipc(response=response, request_id=start.epoch, duration=maya.now() - start)
 
 
+def _deferred_from_future(future: Future) -> defer.Deferred:
+    """A Deferred firing, on the reactor thread, with the outcome of a worker pool future."""
+    d = defer.Deferred()
+
+    def done(future):
+        exception = future.exception()
+        if exception is None:
+            reactor.callFromThread(d.callback, future.result())
+        else:
+            reactor.callFromThread(d.errback, exception)
+
+    future.add_done_callback(done)
+    return d
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Removes a Unix socket left behind by a controller that's gone; anything else at the path is left alone."""
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        return  # Not ours to remove; listening fails instead.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)  # Nothing listens on it any more.
+
+
 class JSONRPCController(CharacterControlServer):
+    """
+    Calls run on a pool of worker threads, so a slow call (a Bob retrieving, say) doesn't hold
+    up the others.  Requests from transports (stdio or a Unix socket) are dispatched as they come:
+    their responses are written as soon as each call completes, possibly out of order, with their
+    request's id.  Members of a batch run in parallel, at most `batch_concurrency` at a time.
+    """
 
     _emitter_class = JSONRPCStdoutEmitter
+    _socket_receiver_class = JSONRPCSocketReceiver
+    binary_transport = False
+
+    DEFAULT_WORKERS = 4
+    SOCKET_MODE = 0o600
 
-    def start(self):
+    def __init__(self, *args, workers: int = DEFAULT_WORKERS, batch_concurrency: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = workers
+        self.batch_concurrency = batch_concurrency or workers
+        self.__executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                 thread_name_prefix=f'JSON-RPC-{self.app_name}')
+        return self.__executor
+
+    def start(self, socket_path: str = None):
         _transport = self.make_control_transport()
+        if socket_path:
+            _socket_transport = self.make_socket_transport(socket_path=socket_path)
+        reactor.addSystemEventTrigger('before', 'shutdown', self.executor.shutdown, False)
         reactor.run()  # < ------ Blocking Call (Reactor)
 
     def test_client(self) -> JSONRPCTestClient:
         test_client = JSONRPCTestClient(rpc_controller=self)
         return test_client
 
+    def make_emitter(self, sink: Callable):
+        """An emitter writing to `sink`, for responses to go back on the connection their requests came from."""
+        return self._emitter_class(sink=sink)
+
     def make_control_transport(self):
         transport = stdio.StandardIO(JSONRPCLineReceiver(rpc_controller=self))
         return transport
 
-    def handle_procedure_call(self, control_request) -> int:
+    def make_socket_transport(self, socket_path: str):
+        factory = RPCSocketFactory(rpc_controller=self, receiver_class=self._socket_receiver_class)
+        _remove_stale_socket(socket_path)
+        port = reactor.listenUNIX(socket_path, factory, mode=self.SOCKET_MODE)  # Only this user may connect
+        self.log.info(f"RPC endpoint opened at {socket_path}.")
+        return port
+
+    def read_procedure_call(self, control_request) -> tuple:
 
         # Validate request and read request metadata
         jsonrpc2 = control_request['jsonrpc']
@@ -160,12 +265,10 @@ class JSONRPCController(CharacterControlServer):
         if method_name not in self._get_interfaces():
             raise self.emitter.MethodNotFound(f'No method called {method_name}')
 
-        return self.call_interface(method_name=method_name,
-                                   request=method_params,
-                                   request_id=request_id)
+        return method_name, method_params, request_id
 
-    def handle_message(self, message: dict, *args, **kwargs) -> int:
-        """Handle single JSON RPC message"""
+    def read_message(self, message: dict) -> tuple:
+        """Validate a single JSON RPC message, and read its method name, params and id"""
 
         try:
             _request_id = message['id']
@@ -175,26 +278,64 @@ class JSONRPCController(CharacterControlServer):
         except TypeError:
             raise self.emitter.InvalidRequest(f'Request object not valid: {type(message)}')
         else:             # RPC
-            return self.handle_procedure_call(control_request=message)
+            return self.read_procedure_call(control_request=message)
+
+    def handle_procedure_call(self, control_request) -> int:
+        method_name, method_params, request_id = self.read_procedure_call(control_request)
+        return self.call_interface(method_name=method_name,
+                                   request=method_params,
+                                   request_id=request_id)
+
+    def handle_message(self, message: dict, request_bytes: int = 0, *args, **kwargs) -> int:
+        """Handle single JSON RPC message"""
+        method_name, method_params, request_id = self.read_message(message)
+        return self.call_interface(method_name=method_name,
+                                   request=method_params,
+                                   request_id=request_id,
+                                   request_bytes=request_bytes)
 
     def handle_batch(self, control_requests: list) -> int:
+        """Handle a batch of JSON RPC messages in parallel on the worker pool, responding in order"""
 
         if not control_requests:
             e = self.emitter.InvalidRequest()
             return self.emitter.error(e)
 
-        batch_size = 0
-        for request in control_requests:  # TODO: parallelism
-            response_size = self.handle_message(message=request)
-            batch_size += response_size
+        def submit(message):
+            method_name, method_params, request_id = self.read_message(message)
+            call = self.executor.submit(self._perform_action,
+                                        action=method_name,
+                                        request=method_params,
+                                        binary=self.binary_transport)
+            return method_name, request_id, maya.now(), call
+
+        def respond(method_name, request_id, received, call):
+            response = call.result()
+            size = self.emitter.ipc(response=response, request_id=request_id, duration=maya.now() - received)
+            self.__observe_payload(method_name, response_bytes=size)
+            return size
+
+        batch_size, pending = 0, deque()
+        for request in control_requests:
+            if len(pending) == self.batch_concurrency:
+                batch_size += respond(*pending.popleft())
+            pending.append(submit(request))
+        while pending:
+            batch_size += respond(*pending.popleft())
         return batch_size
 
+    def load_request(self, control_request: bytes):
+        try:
+            return json.loads(control_request)
+        except JSONDecodeError:
+            raise self.emitter.ParseError
+
     def handle_request(self, control_request: bytes, *args, **kwargs) -> int:
 
+        request_bytes = self.__request_size(control_request)
         try:
-            control_request = json.loads(control_request)
-        except JSONDecodeError:
-            e = self.emitter.ParseError()
+            control_request = self.load_request(control_request)
+        except self.emitter.ParseError as e:
             return self.emitter.error(e)
 
         # Handle batch of messages
@@ -203,7 +344,7 @@ class JSONRPCController(CharacterControlServer):
 
         # Handle single message
         try:
-            return self.handle_message(message=control_request, *args, **kwargs)
+            return self.handle_message(message=control_request, request_bytes=request_bytes, *args, **kwargs)
 
         except self.emitter.JSONRPCError as e:
             return self.emitter.error(e)
@@ -213,21 +354,119 @@ class JSONRPCController(CharacterControlServer):
                 raise
             return self.emitter.error(e)
 
-    def call_interface(self, method_name, request, request_id: int = None):
+    def dispatch_request(self, control_request: bytes, emitter=None) -> defer.Deferred:
+        """
+        Handle a request, or a batch, without blocking the reactor: calls run on the worker pool,
+        and each response is written by `emitter` (the controller's own by default) as soon as its call completes.
+        Fires with the number of bytes written.
+        """
+        emitter = emitter or self.emitter
+        request_bytes = self.__request_size(control_request)
+        try:
+            control_request = self.load_request(control_request)
+        except self.emitter.ParseError as e:
+            return defer.succeed(emitter.error(e))
+
+        # Handle single message
+        if not isinstance(control_request, list):
+            return self.__dispatch_message(message=control_request, emitter=emitter, request_bytes=request_bytes)
+
+        # Handle batch of messages
+        if not control_request:
+            return defer.succeed(emitter.error(self.emitter.InvalidRequest()))
+        semaphore = defer.DeferredSemaphore(self.batch_concurrency)
+        calls = [semaphore.run(self.__dispatch_message, message=message, emitter=emitter) for message in control_request]
+        d = defer.gatherResults(calls, consumeErrors=True)
+        d.addCallback(sum)
+        return d
+
+    def __dispatch_message(self, message: dict, emitter, request_bytes: int = 0) -> defer.Deferred:
+        try:
+            method_name, method_params, request_id = self.read_message(message)
+        except self.emitter.JSONRPCError as e:
+            # A request with an ID (e.g. for an unknown method) gets it back with its error.
+            request_id = message.get('id') if isinstance(message, dict) else None
+            return defer.succeed(emitter.error(e, request_id=request_id))
+
+        received = maya.now()
+        call = self.executor.submit(self._perform_action,
+                                    action=method_name,
+                                    request=method_params,
+                                    binary=self.binary_transport)
+
+        def respond(response):
+            size = emitter.ipc(response=response, request_id=request_id, duration=maya.now() - received)
+            self.__observe_payload(method_name, request_bytes=request_bytes, response_bytes=size)
+            return size
+
+        def fail(failure):
+            if self.crash_on_error:
+                return failure
+            self.log.info(f"RPC request #{request_id} ({method_name}) failed: {failure.getErrorMessage()}")
+            if failure.check(SpecificationError):
+                return emitter.error(self.emitter.InvalidParams(), request_id=request_id)
+            return emitter.error(self.emitter.InternalError(), request_id=request_id)
+
+        d = _deferred_from_future(call)
+        d.addCallbacks(respond, fail)
+        return d
+
+    def call_interface(self, method_name, request, request_id: int = None, request_bytes: int = 0):
         received = maya.now()
         internal_request_id = received.epoch
         if request_id is None:
             request_id = internal_request_id
-        response = self._perform_action(action=method_name, request=request)
+        response = self._perform_action(action=method_name, request=request, binary=self.binary_transport)
         responded = maya.now()
         duration = responded - received
-        return self.emitter.ipc(response=response, request_id=request_id, duration=duration)
+        size = self.emitter.ipc(response=response, request_id=request_id, duration=duration)
+        self.__observe_payload(method_name, request_bytes=request_bytes, response_bytes=size)
+        return size
+
+    @staticmethod
+    def __request_size(control_request) -> int:
+        # Requests already unpacked by their transport, and members of a batch, aren't counted.
+        return len(control_request) if isinstance(control_request, (bytes, bytearray, str)) else 0
+
+    def __observe_payload(self, method_name: str, request_bytes: int = 0, response_bytes: int = 0) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_payload(method_name, request_bytes=request_bytes, response_bytes=response_bytes or 0)
+
+
+class MessagePackRPCController(JSONRPCController):
+    """
+    JSON-RPC over msgpack instead of JSON: the same requests and responses, with message kits,
+    treasure maps, keys and signatures as bytes rather than base64 or hex strings.
+    """
+
+    _emitter_class = MessagePackRPCStdoutEmitter
+    _socket_receiver_class = MessagePackRPCSocketReceiver
+    binary_transport = True
+
+    def test_client(self) -> MessagePackRPCTestClient:
+        test_client = MessagePackRPCTestClient(rpc_controller=self)
+        return test_client
+
+    def make_control_transport(self):
+        transport = stdio.StandardIO(MessagePackRPCReceiver(rpc_controller=self))
+        return transport
+
+    def load_request(self, control_request: Union[bytes, dict, list]):
+        if not isinstance(control_request, (bytes, bytearray)):
+            return control_request  # Already unpacked from the stream by MessagePackRPCReceiver
+        try:
+            return msgpack.unpackb(control_request, raw=False)
+        except (msgpack.exceptions.UnpackException, ValueError):
+            raise self.emitter.ParseError
 
 
 class WebController(CharacterControlServer):
     """
     A wrapper around a JSON control interface that
     handles web requests to exert control over a character.
+
+    Requests with a msgpack body ('application/msgpack') are answered in msgpack,
+    unless they Accept only JSON; JSON requests can Accept msgpack responses as well.
     """
 
     _emitter_class = WebEmitter
@@ -249,9 +488,24 @@ class WebController(CharacterControlServer):
 
         self._transport = Flask(self.app_name)
 
+        @self._transport.route('/metrics', methods=['GET'])
+        def metrics() -> Response:
+            """Prometheus metrics of the controller's calls, if enabled."""
+            return self.metrics_response()
+
         # Return FlaskApp decorator
         return self._transport
 
+    def metrics_response(self) -> Response:
+        if self.metrics is None:
+            return Response("Metrics are not enabled for this controller.", status=404)
+        try:
+            from nucypher.utilities.metrics import controller_metrics_exposition
+        except ImportError as e:
+            return Response(str(e), status=501)
+        exposition, content_type = controller_metrics_exposition(controller=self)
+        return Response(exposition, status=200, content_type=content_type)
+
     def start(self, http_port: int, dry_run: bool = False):
 
         self.log.info("Starting HTTP Character Control...")
@@ -265,23 +519,44 @@ class WebController(CharacterControlServer):
     def __call__(self, *args, **kwargs):
         return self.handle_request(*args, **kwargs)
 
+    _msgpack_content_types = (MSGPACK_CONTENT_TYPE, 'application/x-msgpack')
+
+    @classmethod
+    def is_msgpack(cls, control_request) -> bool:
+        """Whether the body of the request is msgpack."""
+        return control_request.mimetype in cls._msgpack_content_types
+
+    @classmethod
+    def responds_in_msgpack(cls, control_request) -> bool:
+        """Negotiates the response's content type: the request's own, unless its Accept header prefers the other."""
+        offered = ['application/json', *cls._msgpack_content_types]
+        if cls.is_msgpack(control_request):
+            offered.reverse()
+        best_match = control_request.accept_mimetypes.best_match(offered, default=offered[0])
+        return best_match in cls._msgpack_content_types
+
     def handle_request(self, method_name, control_request, *args, **kwargs) -> Response:
 
         _400_exceptions = (SpecificationError,
                            TypeError,
                            JSONDecodeError,
+                           msgpack.exceptions.UnpackException,
                            self.emitter.MethodNotFound)
 
+        binary = self.responds_in_msgpack(control_request)
         try:
             request_body = control_request.data or dict()
             if request_body:
-                request_body = json.loads(request_body)
+                if self.is_msgpack(control_request):
+                    request_body = msgpack.unpackb(request_body, raw=False)
+                else:
+                    request_body = json.loads(request_body)
             request_body.update(kwargs)
 
             if method_name not in self._get_interfaces():
                 raise self.emitter.MethodNotFound(f'No method called {method_name}')
 
-            response = self._perform_action(action=method_name, request=request_body)
+            response = self._perform_action(action=method_name, request=request_body, binary=binary)
 
         #
         # Client Errors
@@ -325,4 +600,9 @@ class WebController(CharacterControlServer):
         #
         else:
             self.log.debug(f"{method_name} [200 - OK]")
-            return self.emitter.respond(response=response)
+            http_response = self.emitter.respond(response=response, binary=binary)
+            if self.metrics is not None:
+                self.metrics.observe_payload(method_name,
+                                             request_bytes=len(control_request.data),
+                                             response_bytes=len(http_response.get_data()))
+            return http_response
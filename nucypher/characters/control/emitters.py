@@ -5,11 +5,14 @@ from functools import partial
 from typing import Callable, Union
 
 import click
+import msgpack
 from flask import Response
 from twisted.logger import Logger
 
 import nucypher
 
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+
 
 def null_stream():
     return open(os.devnull, 'w')
@@ -66,7 +69,7 @@ class StdoutEmitter:
             for k, v in response.items():
                 click.secho(message=f'{k} ...... {v}', fg=self.default_color)
 
-    def error(self, e):
+    def error(self, e, request_id: int = None):
         if self.verbosity >= 1:
             e_str = str(e)
             click.echo(message=e_str)
@@ -120,18 +123,18 @@ class JSONRPCStdoutEmitter(StdoutEmitter):
         return response_data
 
     @staticmethod
-    def assemble_error(message, code, data=None) -> dict:
+    def assemble_error(message, code, data=None, message_id: int = None) -> dict:
         response_data = {'jsonrpc': '2.0',
                          'error': {'code': str(code),
                                    'message': str(message),
                                    'data': data},
-                         'id': None}  # error has no ID
+                         'id': None if message_id is None else str(message_id)}  # None if the request's ID is unknown
         return response_data
 
     def __serialize(self, data: dict, delimiter=delimiter, as_bytes: bool = False) -> Union[str, bytes]:
 
         # Serialize
-        serialized_response = JSONRPCStdoutEmitter.transport_serializer(data)   # type: str
+        serialized_response = type(self).transport_serializer(data)   # type: Union[str, bytes]
 
         if as_bytes:
             serialized_response = bytes(serialized_response, encoding='utf-8')  # type: bytes
@@ -147,7 +150,7 @@ class JSONRPCStdoutEmitter(StdoutEmitter):
     def __write(self, data: dict):
         """Outlet"""
 
-        serialized_response = self.__serialize(data=data)
+        serialized_response = self.__serialize(data=data, delimiter=self.delimiter)
 
         # Write to stdout file descriptor
         number_of_written_bytes = self.sink(serialized_response)  # < ------ OUTLET
@@ -176,12 +179,13 @@ class JSONRPCStdoutEmitter(StdoutEmitter):
         self.log.info(f"OK | Responded to IPC request #{request_id} with {size} bytes, took {duration}")
         return size
 
-    def error(self, e):
+    def error(self, e, request_id: int = None):
         """
         Write RPC error object to stdout and return the number of bytes written.
+        The error carries the ID of the request that failed, if it could be read.
         """
         try:
-            assembled_error = self.assemble_error(message=e.message, code=e.code)
+            assembled_error = self.assemble_error(message=e.message, code=e.code, message_id=request_id)
         except AttributeError:
             if not isinstance(e, self.JSONRPCError):
                 self.log.info(str(e))
@@ -197,6 +201,24 @@ class JSONRPCStdoutEmitter(StdoutEmitter):
         return null_stream()
 
 
+def _write_to_binary_stdout(data: bytes) -> int:
+    size = sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+    return size
+
+
+class MessagePackRPCStdoutEmitter(JSONRPCStdoutEmitter):
+    """
+    JSON-RPC responses packed with msgpack instead of JSON: bytes are written as they are,
+    and responses need no delimiter since msgpack objects delimit themselves.
+    """
+
+    transport_serializer = partial(msgpack.packb, use_bin_type=True)
+    delimiter = None
+
+    default_sink_callable = staticmethod(_write_to_binary_stdout)
+
+
 class WebEmitter:
 
     class MethodNotFound(BaseException):
@@ -205,6 +227,7 @@ class WebEmitter:
 
     _crash_on_error_default = False
     transport_serializer = json.dumps
+    binary_transport_serializer = partial(msgpack.packb, use_bin_type=True)
     _default_sink_callable = Response
 
     def __init__(self,
@@ -237,12 +260,17 @@ class WebEmitter:
             raise e
         return drone_character.sink(str(e), status=response_code)
 
-    def respond(drone_character, response) -> Response:
+    def respond(drone_character, response, binary: bool = False) -> Response:
         assembled_response = drone_character.assemble_response(response=response)
-        serialized_response = WebEmitter.transport_serializer(assembled_response)
+        if binary:
+            serialized_response = WebEmitter.binary_transport_serializer(assembled_response)
+            content_type = MSGPACK_CONTENT_TYPE
+        else:
+            serialized_response = WebEmitter.transport_serializer(assembled_response)
+            content_type = "application/javascript"
 
         # ---------- HTTP OUTPUT
-        response = drone_character.sink(response=serialized_response, status=200, content_type="application/javascript")
+        response = drone_character.sink(response=serialized_response, status=200, content_type=content_type)
         return response
 
     def get_stream(self, *args, **kwargs):
@@ -1,6 +1,6 @@
 import functools
 from base64 import b64decode
-from typing import Union
+from typing import List, Union
 
 import maya
 from umbral.keys import UmbralPublicKey
@@ -15,6 +15,7 @@ from nucypher.network.middleware import NotFound
 def attach_schema(schema):
     def callable(func):
         func._schema = schema()
+        func._binary_schema = schema(context={'binary': True})  # For msgpack transports
 
         @functools.wraps(func)
         def wrapped(*args, **kwargs):
@@ -142,7 +143,7 @@ class AliceInterface(CharacterPublicInterface):
         policy_encrypting_key = self.character.get_policy_encrypting_key_from_label(label)
 
         # TODO #846: May raise UnknownOpenSSLError and InvalidTag.
-        message_kit = UmbralMessageKit.from_bytes(message_kit)
+        message_kit = UmbralMessageKit.from_buffer(message_kit)
 
         enrico = Enrico.from_public_keys(
             verifying_key=message_kit.sender_verifying_key,
@@ -194,7 +195,7 @@ class BobInterface(CharacterPublicInterface):
 
         policy_encrypting_key = UmbralPublicKey.from_bytes(policy_encrypting_key)
         alice_verifying_key = UmbralPublicKey.from_bytes(alice_verifying_key)
-        message_kit = UmbralMessageKit.from_bytes(
+        message_kit = UmbralMessageKit.from_buffer(
             message_kit)  # TODO #846: May raise UnknownOpenSSLError and InvalidTag.
 
         enrico = Enrico.from_public_keys(verifying_key=message_kit.sender_verifying_key,
@@ -235,3 +236,16 @@ class EnricoInterface(CharacterPublicInterface):
         message_kit, signature = self.character.encrypt_message(bytes(message, encoding='utf-8'))
         response_data = {'message_kit': message_kit, 'signature': signature}
         return response_data
+
+    @attach_schema(enrico.EncryptMessages)
+    def encrypt_messages(self, messages: List[str]):
+        """
+        Character control endpoint for encrypting many messages at once, in parallel.
+        """
+        encrypted = self.character.encrypt_messages_to_bytes(bytes(message, encoding='utf-8') for message in messages)
+        message_kits, signatures = list(), list()
+        for message_kit, signature in encrypted:
+            message_kits.append(message_kit)
+            signatures.append(signature)
+        response_data = {'message_kits': message_kits, 'signatures': signatures}
+        return response_data
@@ -0,0 +1,74 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Tuple
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)  # seconds
+
+
+class MethodMetrics:
+    """Calls, errors, payload sizes and latencies of one interface method."""
+
+    def __init__(self, number_of_buckets: int):
+        self.calls = 0
+        self.errors = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency_sum = 0.0
+        self.latency_counts = [0] * (number_of_buckets + 1)  # The last one counts calls slower than every bucket
+
+    def copy(self) -> 'MethodMetrics':
+        metrics = MethodMetrics(number_of_buckets=len(self.latency_counts) - 1)
+        metrics.__dict__.update(self.__dict__)
+        metrics.latency_counts = list(self.latency_counts)
+        return metrics
+
+    def cumulative_latency_counts(self) -> List[int]:
+        """Calls at most as slow as each bucket, as in Prometheus histograms; the last one is every call."""
+        counts, total = list(), 0
+        for count in self.latency_counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+class ControllerMetrics:
+    """
+    Per-method counts of a character controller's calls and errors, bytes of their requests and responses,
+    and histograms of their latencies.  Controllers have none unless metrics are enabled.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.__methods = dict()  # type: Dict[str, MethodMetrics]
+        self.__lock = Lock()  # Calls can run on worker threads
+
+    def __method(self, method_name: str) -> MethodMetrics:
+        try:
+            return self.__methods[method_name]
+        except KeyError:
+            metrics = self.__methods[method_name] = MethodMetrics(number_of_buckets=len(self.buckets))
+            return metrics
+
+    def observe_call(self, method_name: str, duration: float, error: bool = False) -> None:
+        bucket = bisect_left(self.buckets, duration)
+        with self.__lock:
+            metrics = self.__method(method_name)
+            metrics.calls += 1
+            metrics.errors += error
+            metrics.latency_sum += duration
+            metrics.latency_counts[bucket] += 1
+
+    def observe_payload(self, method_name: str, request_bytes: int = 0, response_bytes: int = 0) -> None:
+        with self.__lock:
+            metrics = self.__method(method_name)
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+
+    def stats(self) -> Dict[str, MethodMetrics]:
+        """A consistent copy of the metrics of every method called so far."""
+        with self.__lock:
+            return {method_name: metrics.copy() for method_name, metrics in self.__methods.items()}
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__methods.clear()
@@ -19,4 +19,14 @@ class EncryptMessage(BaseSchema):
 
     # output
     message_kit = fields.UmbralMessageKit(dump_only=True)
-    signature = fields.String(dump_only=True) # maybe we need a signature field?
+    signature = fields.UmbralSignature(dump_only=True)
+
+
+class EncryptMessages(BaseSchema):
+
+    # input
+    messages = fields.List(fields.String(), required=True, load_only=True)
+
+    # output
+    message_kits = fields.List(fields.UmbralMessageKit(), dump_only=True)
+    signatures = fields.List(fields.UmbralSignature(), dump_only=True)
@@ -4,4 +4,5 @@ from nucypher.characters.control.specifications.fields.messagekit import *
 from nucypher.characters.control.specifications.fields.datetime import *
 from nucypher.characters.control.specifications.fields.label import *
 from nucypher.characters.control.specifications.fields.cleartext import *
+from nucypher.characters.control.specifications.fields.signature import *
 from nucypher.characters.control.specifications.fields.misc import *
@@ -8,3 +8,11 @@ class BaseField:
     def __init__(self, *args, **kwargs):
         self.click = kwargs.pop('click', None)
         super().__init__(*args, **kwargs)
+
+    @property
+    def binary(self) -> bool:
+        """
+        True if the schema serializes for a binary transport (msgpack), which carries bytes as they are
+        instead of base64 or hex strings.  Either way, fields load both bytes and strings.
+        """
+        return self.context.get('binary', False)
@@ -5,7 +5,11 @@ from nucypher.characters.control.specifications.fields.base import BaseField
 class Cleartext(BaseField, fields.String):
 
     def _serialize(self, value, attr, data, **kwargs):
+        if self.binary:
+            return value
         return value.decode()
 
     def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, bytes):
+            return b64encode(value).decode()
         return b64encode(bytes(value, encoding='utf-8')).decode()
@@ -6,6 +6,8 @@ from nucypher.characters.control.specifications.exceptions import InvalidInputDa
 class Key(BaseField, fields.Field):
 
     def _serialize(self, value, attr, obj, **kwargs):
+        if self.binary:
+            return bytes(value)
         return bytes(value).hex()
 
     def _deserialize(self, value, attr, data, **kwargs):
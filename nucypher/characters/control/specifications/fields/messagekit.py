@@ -8,7 +8,11 @@ from nucypher.characters.control.specifications.exceptions import InvalidInputDa
 class UmbralMessageKit(BaseField, fields.Field):
 
     def _serialize(self, value: UmbralMessageKitClass, attr, obj, **kwargs):
-        return b64encode(value.to_bytes()).decode()
+        if not isinstance(value, bytes):  # Not serialized yet
+            value = value.to_bytes()
+        if self.binary:
+            return value
+        return b64encode(value).decode()
 
     def _deserialize(self, value, attr, data, **kwargs):
         if isinstance(value, bytes):
@@ -0,0 +1,20 @@
+from base64 import b64decode, b64encode
+from marshmallow import fields
+from nucypher.characters.control.specifications.fields.base import BaseField
+from nucypher.characters.control.specifications.exceptions import InvalidInputData, InvalidNativeDataTypes
+
+
+class UmbralSignature(BaseField, fields.Field):
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        if self.binary:
+            return bytes(value)
+        return b64encode(bytes(value)).decode()
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, bytes):
+            return value
+        try:
+            return b64decode(value)
+        except InvalidNativeDataTypes as e:
+            raise InvalidInputData(f"Could not parse {self.name}: {e}")
@@ -11,9 +11,13 @@ from nucypher.crypto.kits import UmbralMessageKit
 class TreasureMap(BaseField, fields.Field):
 
     def _serialize(self, value, attr, obj, **kwargs):
+        if self.binary:
+            return bytes(value)
         return b64encode(bytes(value)).decode()
 
     def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, bytes):
+            return value
         try:
             return b64decode(value)
         except InvalidNativeDataTypes as e:
@@ -17,11 +17,14 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import json
 from base64 import b64encode, b64decode
-from collections import OrderedDict
+import multiprocessing
+import os
+from collections import OrderedDict, deque
 from functools import partial
+from itertools import islice
 from json.decoder import JSONDecodeError
 from random import shuffle
-from typing import Dict, Iterable, List, Set, Tuple, Union
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Set, Tuple, Union
 
 import maya
 import time
@@ -35,7 +38,7 @@ from cryptography.hazmat.primitives.serialization import Encoding
 from cryptography.x509 import load_pem_x509_certificate, Certificate, NameOID
 from eth_utils import to_checksum_address
 from flask import request, Response
-from twisted.internet import threads
+from twisted.internet import reactor, threads
 from twisted.logger import Logger
 
 import nucypher
@@ -50,13 +53,25 @@ from nucypher.characters.control.controllers import (
 )
 from nucypher.characters.control.interfaces import AliceInterface, BobInterface, EnricoInterface
 from nucypher.config.storages import NodeStorage, ForgetfulNodeStorage
-from nucypher.crypto.api import keccak_digest, encrypt_and_sign
+from nucypher.crypto.api import keccak_digest, encrypt_and_sign, encrypt_and_sign_batch, init_batch_encryption
 from nucypher.crypto.constants import PUBLIC_KEY_LENGTH, PUBLIC_ADDRESS_LENGTH
 from nucypher.crypto.kits import UmbralMessageKit
+from nucypher.crypto.pools import KFragPool
 from nucypher.crypto.powers import SigningPower, DecryptingPower, DelegatingPower, TransactingPower, PowerUpError
+from nucypher.crypto.sessions import EncryptionSession, SessionEnvelope
 from nucypher.crypto.signing import InvalidSignature
+from nucypher.crypto.streaming import (DEFAULT_CHUNK_SIZE,
+                                       Source,
+                                       StreamHeader,
+                                       StreamReader,
+                                       decrypt_stream,
+                                       encrypt_stream)
+from nucypher.keystore.collector import ExpiredArrangementCollector
 from nucypher.keystore.keypairs import HostingKeypair
 from nucypher.keystore.threading import ThreadedSession
+from nucypher.keystore.treasure_maps import TreasureMapStore
+from nucypher.network.admission import AdmissionController
+from nucypher.network.announcements import AnnouncementVerifier
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.middleware import RestMiddleware, UnexpectedResponse, NotFound
 from nucypher.network.nicknames import nickname_from_seed
@@ -99,6 +114,9 @@ class Alice(Character, BlockchainPolicyAuthor):
                  network_middleware: RestMiddleware = None,
                  controller: bool = True,
 
+                 # KFrag Precomputation
+                 max_precomputed_kfrags: int = KFragPool.DEFAULT_MAX_KFRAGS,
+
                  *args, **kwargs) -> None:
 
         #
@@ -143,6 +161,10 @@ class Alice(Character, BlockchainPolicyAuthor):
         self.active_policies = dict()
         self.revocation_kits = dict()
 
+        self._max_precomputed_kfrags = max_precomputed_kfrags
+        self._kfrag_pool = None  # Created on first use of precompute_kfrags
+        self.__kfrag_pool_stops_with_reactor = False
+
     def add_active_policy(self, active_policy):
         """
         Adds a Policy object that is active on the NuCypher network to Alice's
@@ -171,12 +193,54 @@ class Alice(Character, BlockchainPolicyAuthor):
         """
 
         bob_encrypting_key = bob.public_keys(DecryptingPower)
+        m, n = m or self.m, n or self.n
+
+        # Use KFrags generated ahead of time for this grant, if any.
+        if self._kfrag_pool is not None:
+            precomputed = self._kfrag_pool.take(bob_encrypting_key=bob_encrypting_key, label=label, m=m, n=n)
+            if precomputed is not None:
+                self.log.debug(f"Using {n} precomputed KFrags for label {label}")
+                return precomputed
+
         delegating_power = self._crypto_power.power_ups(DelegatingPower)
         return delegating_power.generate_kfrags(bob_pubkey_enc=bob_encrypting_key,
                                                 signer=self.stamp,
                                                 label=label,
-                                                m=m or self.m,
-                                                n=n or self.n)
+                                                m=m,
+                                                n=n)
+
+    @property
+    def kfrag_pool(self) -> KFragPool:
+        if self._kfrag_pool is None:
+            self._kfrag_pool = KFragPool(delegating_power=self._crypto_power.power_ups(DelegatingPower),
+                                         signer=self.stamp,
+                                         max_kfrags=self._max_precomputed_kfrags)
+            if not self.__kfrag_pool_stops_with_reactor:
+                reactor.addSystemEventTrigger('before', 'shutdown', self.shutdown_kfrag_pool)
+                self.__kfrag_pool_stops_with_reactor = True
+        return self._kfrag_pool
+
+    def shutdown_kfrag_pool(self) -> None:
+        """
+        Disposes of any precomputed KFrags and stops the pool's workers once they've finished the batch in hand.
+        The pool is created again the next time it's needed.  This happens when the reactor stops, too.
+        """
+        pool, self._kfrag_pool = self._kfrag_pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def precompute_kfrags(self, bob: 'Bob', label: bytes, m: int = None, n: int = None):
+        """
+        Generates KFrags for an expected grant in the background.  A subsequent
+        `create_policy` or `grant` for the same Bob, label, m and n will use them
+        instead of generating KFrags on the spot.
+
+        Returns a Future which resolves to the (policy public key, KFrags) pair.
+        """
+        return self.kfrag_pool.schedule(bob_encrypting_key=bob.public_keys(DecryptingPower),
+                                        label=label,
+                                        m=m or self.m,
+                                        n=n or self.n)
 
     def create_policy(self, bob: "Bob", label: bytes, **policy_params):
         """
@@ -666,7 +730,7 @@ class Bob(Character):
         self.follow_treasure_map(treasure_map=treasure_map, block=block)
 
     def retrieve(self,
-                 *message_kits: UmbralMessageKit,
+                 *message_kits: Union[UmbralMessageKit, SessionEnvelope],
                  alice_verifying_key: UmbralPublicKey,
                  label: bytes,
                  enrico: "Enrico" = None,
@@ -820,6 +884,11 @@ class Bob(Character):
                 #  - This line is unreachable when NotEnoughUrsulas
 
             for message in message_kits:
+                if isinstance(message, SessionEnvelope):
+                    # One capsule for the whole session: its header holds the key to every message.
+                    session_key = self.verify_from(message.sender, message.header, decrypt=True)
+                    cleartexts.extend(message.decrypt(session_key))
+                    continue
                 delivered_cleartext = self.verify_from(message.sender, message, decrypt=True)
                 cleartexts.append(delivered_cleartext)
         finally:
@@ -830,6 +899,24 @@ class Bob(Character):
 
         return cleartexts
 
+    def retrieve_stream(self, source: Source, sink: BinaryIO, **kwargs) -> StreamHeader:
+        """
+        Decrypts a stream made with `Enrico.encrypt_stream` from `source` to `sink`, in constant memory.
+        The keyword arguments are those of `retrieve`, which is used to activate the stream's capsule.
+        """
+        return decrypt_stream(source, sink, open_header=partial(self.__open_stream_header, **kwargs))
+
+    def open_stream(self, source: Source, **kwargs) -> StreamReader:
+        """
+        Like `retrieve_stream`, but for random access to the chunks of a seekable stream
+        once its capsule is activated.
+        """
+        return StreamReader(source, open_header=partial(self.__open_stream_header, **kwargs))
+
+    def __open_stream_header(self, message_kit: UmbralMessageKit, **kwargs) -> bytes:
+        stream_key, = self.retrieve(message_kit, **kwargs)
+        return stream_key
+
     def make_web_controller(drone_bob, crash_on_error: bool = False):
 
         app_name = bytes(drone_bob.stamp).hex()[:6]
@@ -920,6 +1007,11 @@ class Ursula(Teacher, Character, Worker):
                  tls_curve: EllipticCurve = None,
                  known_nodes: Iterable = None,
 
+                 # Admission Control (off unless max_in_flight_requests is given; 0 client_request_rate turns off just rate limiting)
+                 max_in_flight_requests: int = 0,
+                 client_request_rate: float = AdmissionController.DEFAULT_CLIENT_RATE,
+                 client_request_burst: int = AdmissionController.DEFAULT_CLIENT_BURST,
+
                  **character_kwargs
                  ) -> None:
 
@@ -955,6 +1047,7 @@ class Ursula(Teacher, Character, Worker):
         self.log.debug(f"URSULA worker: {worker_address}, staker {checksum_address}")
         if is_me is True:  # TODO: #340
             self._stored_treasure_maps = dict()
+            self._arrangement_collector = None
 
             #
             # Ursula is a Decentralized Worker
@@ -992,10 +1085,18 @@ class Ursula(Teacher, Character, Worker):
                 #
                 # REST Server (Ephemeral Self-Ursula)
                 #
+                if max_in_flight_requests:
+                    self.admission = AdmissionController(max_in_flight=max_in_flight_requests,
+                                                         client_rate=client_request_rate,
+                                                         client_burst=client_request_burst)
+                else:
+                    self.admission = None
+                self.announcement_verifier = AnnouncementVerifier(node=self)
                 rest_app, datastore = make_rest_app(
                     this_node=self,
                     db_filepath=db_filepath,
                     serving_domains=domains,
+                    admission=self.admission,
                 )
 
                 # TODO: attach status app to rest_app
@@ -1010,6 +1111,9 @@ class Ursula(Teacher, Character, Worker):
                                                    rest_app=rest_app, datastore=datastore,
                                                    hosting_power=tls_hosting_power)
 
+                # Published TreasureMaps live in the datastore rather than in memory.
+                self.treasure_maps = TreasureMapStore(datastore=datastore)
+
             #
             # Stranger-Ursula
             #
@@ -1349,6 +1453,12 @@ class Ursula(Teacher, Character, Worker):
         except AttributeError:
             raise AttributeError("No rest server attached")
 
+    @property
+    def arrangement_collector(self) -> ExpiredArrangementCollector:
+        if self._arrangement_collector is None:
+            self._arrangement_collector = ExpiredArrangementCollector(datastore=self.datastore)
+        return self._arrangement_collector
+
     @property
     def rest_url(self):
         try:
@@ -1375,13 +1485,20 @@ class Ursula(Teacher, Character, Worker):
     #
 
     def work_orders(self, bob=None) -> List['WorkOrder']:
-        with ThreadedSession(self.datastore.engine):
+        with ThreadedSession(self.datastore.engine) as session:
             if not bob:  # All
-                return self.datastore.get_workorders()
+                return self.datastore.get_workorders(session=session)
             else:  # Filter
-                work_orders_from_bob = self.datastore.get_workorders(bob_verifying_key=bytes(bob.stamp))
+                work_orders_from_bob = self.datastore.get_workorders(bob_verifying_key=bytes(bob.stamp),
+                                                                     session=session)
                 return work_orders_from_bob
 
+    def work_order_count(self, bob=None) -> int:
+        """Counts saved work orders without loading them; safe to call on large datastores."""
+        with ThreadedSession(self.datastore.engine) as session:
+            bob_verifying_key = bytes(bob.stamp) if bob else None
+            return self.datastore.count_workorders(bob_verifying_key=bob_verifying_key, session=session)
+
     def _reencrypt(self, kfrag: KFrag, work_order: 'WorkOrder', alice_verifying_key: UmbralPublicKey):
 
         # Prepare a bytestring for concatenating re-encrypted
@@ -1415,8 +1532,16 @@ class Enrico(Character):
     _interface_class = EnricoInterface
     _default_crypto_powerups = [SigningPower]
 
+    DEFAULT_ENCRYPTION_CHUNK_SIZE = 64  # Messages per task sent to a worker process
+
+    # Worker processes are never forked from this one, which may be running the (multithreaded) reactor.
+    ENCRYPTION_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
     def __init__(self, policy_encrypting_key=None, controller: bool = True, *args, **kwargs):
         self._policy_pubkey = policy_encrypting_key
+        self.__encryption_pool = None
+        self.__encryption_workers = None
+        self.__stops_with_reactor = False
 
         # Encrico never uses the blockchain, hence federated_only)
         kwargs['federated_only'] = True
@@ -1438,6 +1563,111 @@ class Enrico(Character):
         message_kit.policy_pubkey = self.policy_pubkey  # TODO: We can probably do better here.
         return message_kit, signature
 
+    def encrypt_messages(self,
+                         messages: Iterable[bytes],
+                         workers: int = None,
+                         chunk_size: int = DEFAULT_ENCRYPTION_CHUNK_SIZE
+                         ) -> Iterator[Tuple[UmbralMessageKit, Signature]]:
+        """
+        Encrypts many messages, yielding each MessageKit and signature in order as soon as it's ready.
+
+        Messages are encrypted and signed in chunks of `chunk_size` across `workers` processes
+        (one per core by default); with a single worker, they're encrypted in this process.
+        """
+        if workers == 1:
+            for message in messages:
+                yield self.encrypt_message(message)
+            return
+        for message_kit_bytes, signature_bytes in self.__encrypt_in_pool(messages, workers, chunk_size):
+            message_kit = UmbralMessageKit.from_buffer(message_kit_bytes)
+            message_kit.policy_pubkey = self.policy_pubkey
+            yield message_kit, Signature.from_bytes(signature_bytes)
+
+    def encrypt_messages_to_bytes(self,
+                                  messages: Iterable[bytes],
+                                  workers: int = None,
+                                  chunk_size: int = DEFAULT_ENCRYPTION_CHUNK_SIZE
+                                  ) -> Iterator[Tuple[bytes, bytes]]:
+        """
+        Like `encrypt_messages`, but yields serialized MessageKits and signatures,
+        sparing the work of deserializing them when they're only going to be sent on.
+        """
+        if workers == 1:
+            for message in messages:
+                message_kit, signature = self.encrypt_message(message)
+                yield message_kit.to_bytes(), bytes(signature)
+            return
+        yield from self.__encrypt_in_pool(messages, workers, chunk_size)
+
+    def __encryption_pool_for(self, workers: int):
+        if self.__encryption_pool is not None and self.__encryption_workers == workers:
+            return self.__encryption_pool
+        self.shutdown_encryption_pool()
+
+        keypair = self._crypto_power.power_ups(SigningPower).keypair
+        if keypair._privkey is PUBLIC_ONLY:
+            raise SigningPower.not_found_error("This Enrico has only a public signing key; it can't sign messages.")
+
+        # The keys are handed to each worker once, when it starts.
+        context = multiprocessing.get_context(self.ENCRYPTION_START_METHOD)
+        self.__encryption_pool = context.Pool(processes=workers,
+                                              initializer=init_batch_encryption,
+                                              initargs=(self.policy_pubkey.to_bytes(), keypair._privkey.to_bytes()))
+        self.__encryption_workers = workers
+        if not self.__stops_with_reactor:
+            reactor.addSystemEventTrigger('before', 'shutdown', self.shutdown_encryption_pool)
+            self.__stops_with_reactor = True
+        return self.__encryption_pool
+
+    def shutdown_encryption_pool(self) -> None:
+        """
+        Stops the worker processes of `encrypt_messages`, once they've finished what they were given.
+        They're started again the next time they're needed.  This happens when the reactor stops, too.
+        """
+        pool, self.__encryption_pool, self.__encryption_workers = self.__encryption_pool, None, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def __encrypt_in_pool(self, messages: Iterable[bytes], workers: int, chunk_size: int) -> Iterator[Tuple[bytes, bytes]]:
+        workers = workers or os.cpu_count()
+        pool = self.__encryption_pool_for(workers)
+
+        # Keep every worker busy, but don't read (and encrypt) more of the messages than that ahead of the caller.
+        pending = deque()
+        messages = iter(messages)
+        while True:
+            chunk = list(islice(messages, chunk_size))
+            if chunk:
+                pending.append(pool.apply_async(encrypt_and_sign_batch, (chunk,)))
+            if not pending:
+                return
+            if len(pending) >= workers * 2 or not chunk:
+                yield from pending.popleft().get()
+
+    def start_session(self) -> EncryptionSession:
+        """
+        Starts a session of messages that all share one capsule, so that Bob can retrieve any number
+        of them (packed in a SessionEnvelope) with a single capsule activation.
+        """
+        session = EncryptionSession(self.policy_pubkey, signer=self.stamp)
+        session.header.policy_pubkey = self.policy_pubkey
+        return session
+
+    def encrypt_stream(self,
+                       source: Source,
+                       sink: BinaryIO,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE
+                       ) -> StreamHeader:
+        """
+        Encrypts a payload of any size, read from `source` (a file-like object, memory map or buffer),
+        into a stream of authenticated chunks written to `sink`, in constant memory.
+        Bob decrypts it with `Bob.retrieve_stream`, or `Bob.open_stream` for random access to its chunks.
+        """
+        header = encrypt_stream(self.policy_pubkey, source, sink, signer=self.stamp, chunk_size=chunk_size)
+        header.message_kit.policy_pubkey = self.policy_pubkey
+        return header
+
     @classmethod
     def from_alice(cls, alice: Alice, label: bytes):
         """
@@ -1476,7 +1706,12 @@ class Enrico(Character):
             """
             Character control endpoint for encrypting data for a policy and
             receiving the messagekit (and signature) to give to Bob.
+
+            msgpack requests (or requests accepting msgpack) go through the controller.
             """
+            if controller.is_msgpack(request) or controller.responds_in_msgpack(request):
+                return controller(method_name='encrypt_message', control_request=request)
+
             try:
                 request_data = json.loads(request.data)
                 message = request_data['message']
@@ -1496,4 +1731,27 @@ class Enrico(Character):
 
             return Response(json.dumps(response_data), status=200)
 
+        @enrico_control.route('/encrypt_messages', methods=['POST'])
+        def encrypt_messages():
+            """
+            Character control endpoint for encrypting many messages for a policy at once.
+
+            A JSON request ({"messages": [...]}) is answered with lists of base64 messagekits and signatures.
+            An 'application/octet-stream' request of length-prefixed messages is answered with a stream of
+            length-prefixed messagekits, each followed by its signature, sent as soon as they're encrypted.
+            """
+            if request.mimetype != 'application/octet-stream':
+                return controller(method_name='encrypt_messages', control_request=request)
+
+            try:
+                messages = BytestringSplitter(VariableLengthBytestring).repeat(request.data)
+            except BytestringSplittingError as e:
+                return Response(str(e), status=400)
+
+            def encrypted_messages():
+                for message_kit, signature in drone_enrico.encrypt_messages_to_bytes(messages):
+                    yield bytes(VariableLengthBytestring(message_kit)) + signature
+
+            return Response(encrypted_messages(), status=200, mimetype='application/octet-stream')
+
         return controller
@@ -586,6 +586,13 @@ def establish_deployer_registry(emitter,
     return registry
 
 
+def export_controller_metrics(controller) -> None:
+    """Measures a character controller's calls and exports them to Prometheus (see `register_controller_metrics`)."""
+    # Prevent import without prometheus installed
+    from nucypher.utilities.metrics import register_controller_metrics
+    register_controller_metrics(controller)
+
+
 def get_or_update_configuration(emitter, config_class, filepath: str, config_options):
 
     try:
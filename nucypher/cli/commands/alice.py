@@ -30,6 +30,7 @@ from nucypher.cli.options import (
     group_options,
     option_config_file,
     option_config_root,
+    option_controller_metrics,
     option_controller_port,
     option_dev,
     option_discovery_port,
@@ -310,10 +311,11 @@ def destroy(general_config, config_options, config_file, force):
 @alice.command()
 @option_config_file
 @option_controller_port(default=AliceConfiguration.DEFAULT_CONTROLLER_PORT)
+@option_controller_metrics
 @option_dry_run
 @group_general_config
 @group_character_options
-def run(general_config, character_options, config_file, controller_port, dry_run):
+def run(general_config, character_options, config_file, controller_port, controller_metrics, dry_run):
     """
     Start Alice's web controller.
     """
@@ -324,6 +326,8 @@ def run(general_config, character_options, config_file, controller_port, dry_run
         # RPC
         if general_config.json_ipc:
             rpc_controller = ALICE.make_rpc_controller()
+            if controller_metrics:
+                actions.export_controller_metrics(rpc_controller)
             _transport = rpc_controller.make_control_transport()
             rpc_controller.start()
             return
@@ -332,6 +336,8 @@ def run(general_config, character_options, config_file, controller_port, dry_run
         else:
             emitter.message(f"Alice Verifying Key {bytes(ALICE.stamp).hex()}", color="green", bold=True)
             controller = ALICE.make_web_controller(crash_on_error=general_config.debug)
+            if controller_metrics:
+                actions.export_controller_metrics(controller)
             ALICE.log.info('Starting HTTP Character Web Controller')
             emitter.message(f'Running HTTP Alice Controller at http://localhost:{controller_port}')
             return controller.start(http_port=controller_port, dry_run=dry_run)
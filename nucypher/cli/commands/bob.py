@@ -11,6 +11,7 @@ from nucypher.cli.options import (
     option_checksum_address,
     option_config_file,
     option_config_root,
+    option_controller_metrics,
     option_controller_port,
     option_dev,
     option_discovery_port,
@@ -170,9 +171,10 @@ def init(general_config, config_options, config_root):
 @group_character_options
 @option_config_file
 @option_controller_port(default=BobConfiguration.DEFAULT_CONTROLLER_PORT)
+@option_controller_metrics
 @option_dry_run
 @group_general_config
-def run(general_config, character_options, config_file, controller_port, dry_run):
+def run(general_config, character_options, config_file, controller_port, controller_metrics, dry_run):
     """
     Start Bob's controller.
     """
@@ -183,6 +185,8 @@ def run(general_config, character_options, config_file, controller_port, dry_run
     # RPC
     if general_config.json_ipc:
         rpc_controller = BOB.make_rpc_controller()
+        if controller_metrics:
+            actions.export_controller_metrics(rpc_controller)
         _transport = rpc_controller.make_control_transport()
         rpc_controller.start()
         return
@@ -193,6 +197,8 @@ def run(general_config, character_options, config_file, controller_port, dry_run
     emitter.message(f"Bob Encrypting Key {bob_encrypting_key}", color="blue", bold=True)
     # Start Controller
     controller = BOB.make_web_controller(crash_on_error=general_config.debug)
+    if controller_metrics:
+        actions.export_controller_metrics(controller)
     BOB.log.info('Starting HTTP Character Web Controller')
     return controller.start(http_port=controller_port, dry_run=dry_run)
 
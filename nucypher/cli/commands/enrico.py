@@ -3,8 +3,9 @@ from umbral.keys import UmbralPublicKey
 
 from nucypher.characters.banners import ENRICO_BANNER
 from nucypher.characters.lawful import Enrico
+from nucypher.cli import actions
 from nucypher.cli.config import group_general_config
-from nucypher.cli.options import option_dry_run, option_policy_encrypting_key
+from nucypher.cli.options import option_controller_metrics, option_dry_run, option_policy_encrypting_key
 from nucypher.cli.types import NETWORK_PORT
 from nucypher.characters.control.interfaces import EnricoInterface
 
@@ -21,8 +22,9 @@ def enrico():
 @option_policy_encrypting_key(required=True)
 @option_dry_run
 @click.option('--http-port', help="The host port to run Enrico HTTP services on", type=NETWORK_PORT)
+@option_controller_metrics
 @group_general_config
-def run(general_config, policy_encrypting_key, dry_run, http_port):
+def run(general_config, policy_encrypting_key, dry_run, http_port, controller_metrics):
     """
     Start Enrico's controller.
     """
@@ -36,12 +38,16 @@ def run(general_config, policy_encrypting_key, dry_run, http_port):
     # RPC
     if general_config.json_ipc:
         rpc_controller = ENRICO.make_rpc_controller()
+        if controller_metrics:
+            actions.export_controller_metrics(rpc_controller)
         _transport = rpc_controller.make_control_transport()
         rpc_controller.start()
         return
 
     ENRICO.log.info('Starting HTTP Character Web Controller')
     controller = ENRICO.make_web_controller()
+    if controller_metrics:
+        actions.export_controller_metrics(controller)
     return controller.start(http_port=http_port, dry_run=dry_run)
 
 
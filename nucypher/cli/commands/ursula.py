@@ -21,7 +21,7 @@ from json import JSONDecodeError
 
 import click
 from constant_sorrow.constants import NO_BLOCKCHAIN_CONNECTION
-from twisted.internet import stdio
+from twisted.internet import reactor, stdio
 
 from nucypher.blockchain.economics import EconomicsFactory
 from nucypher.blockchain.eth.utils import datetime_at_period
@@ -325,7 +325,8 @@ def forget(general_config, config_options, config_file):
 @group_general_config
 @click.option('--interactive', '-I', help="Run interactively", is_flag=True, default=False)
 @click.option('--metrics-port', help="Run a Prometheus metrics exporter on specified HTTP port", type=NETWORK_PORT)
-def run(general_config, character_options, config_file, interactive, dry_run, metrics_port):
+@click.option('--async-rest', help="Serve the REST API with the Twisted-native server instead of Hendrix", is_flag=True, default=False)
+def run(general_config, character_options, config_file, interactive, dry_run, metrics_port, async_rest):
     """
     Run an "Ursula" node.
     """
@@ -346,6 +347,9 @@ def run(general_config, character_options, config_file, interactive, dry_run, me
 
     if interactive:
         stdio.StandardIO(UrsulaCommandProtocol(ursula=URSULA, emitter=emitter))
+    if not dry_run:
+        URSULA.arrangement_collector.start()
+        URSULA.announcement_verifier.start()
     if metrics_port:
         # Prevent import without prometheus installed
         from nucypher.utilities.metrics import initialize_prometheus_exporter
@@ -364,6 +368,11 @@ def run(general_config, character_options, config_file, interactive, dry_run, me
         if dry_run:
             # Prevent the cataloging of services, and do not run the reactor
             return  # <-- ABORT - (Last Chance)
+        if async_rest:
+            from nucypher.network.async_server import AsyncRESTServer
+            AsyncRESTServer(ursula=URSULA).listen()
+            reactor.run()  # <--- Blocking Call (Reactor)
+            return
         node_deployer = URSULA.get_deployer()
         node_deployer.addServices()
         node_deployer.catalogServers(node_deployer.hendrix)
@@ -32,6 +32,7 @@ from nucypher.cli.types import (
 option_checksum_address = click.option('--checksum-address', help="Run with a specified account", type=EIP55_CHECKSUM_ADDRESS)
 option_config_file = click.option('--config-file', help="Path to configuration file", type=EXISTING_READABLE_FILE)
 option_config_root = click.option('--config-root', help="Custom configuration directory", type=click.Path())
+option_controller_metrics = click.option('--controller-metrics', help="Measure controller calls, served at the web controller's /metrics and exported to Prometheus", is_flag=True)
 option_dev = click.option('--dev', '-d', help="Enable development mode", is_flag=True)
 option_db_filepath = click.option('--db-filepath', help="The database filepath to connect to", type=click.STRING)
 option_dry_run = click.option('--dry-run', '-x', help="Execute normally without actually starting the node", is_flag=True)
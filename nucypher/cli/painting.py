@@ -128,7 +128,7 @@ def paint_node_status(emitter, ursula, start_time):
              'Rest Interface ...... {}'.format(ursula.rest_url()),
              'Node Storage Type ... {}'.format(ursula.node_storage._name.capitalize()),
              'Known Nodes ......... {}'.format(len(ursula.known_nodes)),
-             'Work Orders ......... {}'.format(len(ursula.work_orders())),
+             'Work Orders ......... {}'.format(ursula.work_order_count()),
              teacher]
 
     if not ursula.federated_only:
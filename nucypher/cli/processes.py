@@ -18,11 +18,13 @@ import json
 import os
 from collections import deque
 from json import JSONDecodeError
+from typing import Union
 
 import click
 import maya
+import msgpack
 from twisted.internet import reactor
-from twisted.internet.protocol import connectionDone
+from twisted.internet.protocol import Factory, Protocol, connectionDone
 from twisted.internet.stdio import StandardIO
 from twisted.logger import Logger
 from twisted.protocols.basic import LineReceiver
@@ -239,4 +241,89 @@ class JSONRPCLineReceiver(LineReceiver):
     def lineReceived(self, line):
         line = line.strip(self.delimiter)
         if line:
-            self.rpc_controller.handle_request(control_request=line)
+            self.rpc_controller.dispatch_request(control_request=line)
+
+
+class JSONRPCSocketReceiver(LineReceiver):
+    """
+    A client connection to the Unix socket of a JSON-RPC controller.  Requests are dispatched
+    as they come, and each response is written back on this connection as soon as it's ready.
+    """
+
+    delimiter = b'\n'
+    MAX_LENGTH = 64 * 1024 * 1024  # Requests can carry large message kits
+
+    def __init__(self, rpc_controller):
+        super().__init__()
+        self.rpc_controller = rpc_controller
+        self.emitter = rpc_controller.make_emitter(sink=self.write_response)
+
+    def write_response(self, response: Union[str, bytes]) -> int:
+        if isinstance(response, str):
+            response = response.encode('utf-8')
+        self.transport.write(response)
+        return len(response)
+
+    def lineReceived(self, line):
+        line = line.strip()
+        if line:
+            self.rpc_controller.dispatch_request(control_request=line, emitter=self.emitter)
+
+
+class RPCSocketFactory(Factory):
+    """Builds a receiver, with its own emitter, for each client connecting to an RPC controller's socket."""
+
+    def __init__(self, rpc_controller, receiver_class):
+        self.rpc_controller = rpc_controller
+        self.protocol = receiver_class
+
+    def buildProtocol(self, addr):
+        receiver = self.protocol(rpc_controller=self.rpc_controller)
+        receiver.factory = self
+        return receiver
+
+
+class MessagePackRPCReceiver(Protocol):
+    """
+    Reads msgpack-packed JSON-RPC requests from stdin.  Requests delimit themselves,
+    so they can hold any bytes, and be split across reads or share one.
+    """
+
+    def __init__(self, rpc_controller):
+        super().__init__()
+        self.rpc_controller = rpc_controller
+        self.emitter = rpc_controller.emitter
+        self.__unpacker = msgpack.Unpacker(raw=False)
+        self.log = Logger(f"MessagePack-RPC-{rpc_controller.app_name}")
+
+    def connectionMade(self):
+        self.log.info("MessagePack RPC endpoint opened on stdio. Listening for messages.")
+
+    def dataReceived(self, data):
+        self.__unpacker.feed(data)
+        while True:
+            try:
+                control_request = next(self.__unpacker)
+            except StopIteration:  # Wait for more data
+                return
+            except (msgpack.exceptions.UnpackException, ValueError):
+                # The stream can't be resynchronized after garbage; start over with the next read.
+                self.__unpacker = msgpack.Unpacker(raw=False)
+                self.emitter.error(self.emitter.ParseError())
+                return
+            self.rpc_controller.dispatch_request(control_request=control_request, emitter=self.emitter)
+
+
+class MessagePackRPCSocketReceiver(MessagePackRPCReceiver):
+    """A client connection to the Unix socket of a msgpack RPC controller."""
+
+    def __init__(self, rpc_controller):
+        super().__init__(rpc_controller=rpc_controller)
+        self.emitter = rpc_controller.make_emitter(sink=self.write_response)
+
+    def connectionMade(self):
+        pass
+
+    def write_response(self, response: bytes) -> int:
+        self.transport.write(response)
+        return len(response)
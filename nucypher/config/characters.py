@@ -30,6 +30,7 @@ from nucypher.blockchain.eth.actors import StakeHolder
 from nucypher.config.constants import DEFAULT_CONFIG_ROOT
 from nucypher.config.keyring import NucypherKeyring
 from nucypher.config.node import CharacterConfiguration
+from nucypher.network.admission import AdmissionController
 
 
 class UrsulaConfiguration(CharacterConfiguration):
@@ -44,6 +45,9 @@ class UrsulaConfiguration(CharacterConfiguration):
     __DEFAULT_TLS_CURVE = ec.SECP384R1
     DEFAULT_DB_NAME = '{}.db'.format(_NAME)
 
+    # Requests waiting for admission hold a WSGI thread, so admission control is only on when configured.
+    DEFAULT_MAX_IN_FLIGHT_REQUESTS = 0
+
     def __init__(self,
                  dev_mode: bool = False,
                  worker_address: str = None,
@@ -52,6 +56,9 @@ class UrsulaConfiguration(CharacterConfiguration):
                  rest_port: int = None,
                  tls_curve: EllipticCurve = None,
                  certificate: Certificate = None,
+                 max_in_flight_requests: int = None,
+                 client_request_rate: float = None,
+                 client_request_burst: int = None,
                  *args, **kwargs) -> None:
 
         if not rest_port:
@@ -65,6 +72,18 @@ class UrsulaConfiguration(CharacterConfiguration):
         self.certificate = certificate
         self.db_filepath = db_filepath or UNINITIALIZED_CONFIGURATION
         self.worker_address = worker_address
+
+        # Admission control: a max_in_flight_requests of 0 turns it off, and a client_request_rate of 0
+        # turns off per-client rate limiting only.
+        if max_in_flight_requests is None:
+            max_in_flight_requests = self.DEFAULT_MAX_IN_FLIGHT_REQUESTS
+        if client_request_rate is None:
+            client_request_rate = AdmissionController.DEFAULT_CLIENT_RATE
+        if client_request_burst is None:
+            client_request_burst = AdmissionController.DEFAULT_CLIENT_BURST
+        self.max_in_flight_requests = max_in_flight_requests
+        self.client_request_rate = client_request_rate
+        self.client_request_burst = client_request_burst
         super().__init__(dev_mode=dev_mode, *args, **kwargs)
 
     def generate_runtime_filepaths(self, config_root: str) -> dict:
@@ -83,6 +102,9 @@ class UrsulaConfiguration(CharacterConfiguration):
             rest_host=self.rest_host,
             rest_port=self.rest_port,
             db_filepath=self.db_filepath,
+            max_in_flight_requests=self.max_in_flight_requests,
+            client_request_rate=self.client_request_rate,
+            client_request_burst=self.client_request_burst,
         )
         return {**super().static_payload(), **payload}
 
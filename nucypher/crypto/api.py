@@ -17,7 +17,7 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 import datetime
 from ipaddress import IPv4Address
 from random import SystemRandom
-from typing import Tuple
+from typing import List, Tuple
 
 import sha3
 from constant_sorrow import constants
@@ -36,7 +36,7 @@ from eth_account.messages import encode_defunct
 from eth_utils import to_checksum_address, is_checksum_address
 from umbral import pre
 from umbral.keys import UmbralPrivateKey, UmbralPublicKey
-from umbral.signing import Signature
+from umbral.signing import Signature, Signer
 
 from nucypher.crypto.constants import SHA256
 from nucypher.crypto.kits import UmbralMessageKit
@@ -256,3 +256,31 @@ def encrypt_and_sign(recipient_pubkey_enc: UmbralPublicKey,
         message_kit = UmbralMessageKit(ciphertext=ciphertext, capsule=capsule)
 
     return message_kit, signature
+
+
+_batch_encryption_keys = None  # This worker process's (recipient key, signer), set by init_batch_encryption
+
+
+def init_batch_encryption(recipient_pubkey_enc_bytes: bytes, signing_key_bytes: bytes) -> None:
+    """
+    Initializer of worker processes running `encrypt_and_sign_batch`, so that the keys are sent
+    to each worker once, rather than along with every batch.
+    """
+    global _batch_encryption_keys
+    from nucypher.crypto.signing import SignatureStamp  # Avoid circular import
+    signing_key = UmbralPrivateKey.from_bytes(signing_key_bytes)
+    signer = SignatureStamp(verifying_key=signing_key.get_pubkey(), signer=Signer(signing_key))
+    _batch_encryption_keys = UmbralPublicKey.from_bytes(recipient_pubkey_enc_bytes), signer
+
+
+def encrypt_and_sign_batch(plaintexts: List[bytes]) -> List[Tuple[bytes, bytes]]:
+    """
+    Encrypts and signs each plaintext as `encrypt_and_sign` does, with the keys given to `init_batch_encryption`,
+    returning serialized MessageKits and Signatures.  Takes and returns only bytes, so it can run in a worker process.
+    """
+    recipient_pubkey_enc, signer = _batch_encryption_keys
+    results = list()
+    for plaintext in plaintexts:
+        message_kit, signature = encrypt_and_sign(recipient_pubkey_enc, plaintext=plaintext, signer=signer)
+        results.append((message_kit.to_bytes(), bytes(signature)))
+    return results
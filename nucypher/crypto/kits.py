@@ -14,8 +14,18 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
+from typing import List
+
 from constant_sorrow.constants import UNKNOWN_SENDER, NOT_SIGNED
-from bytestring_splitter import BytestringKwargifier, VariableLengthBytestring
+from bytestring_splitter import (BytestringKwargifier,
+                                 BytestringSplittingError,
+                                 VariableLengthBytestring,
+                                 VARIABLE_HEADER_LENGTH)
+from umbral.config import default_params
+from umbral.keys import UmbralPublicKey
+from umbral.pre import Capsule
+
+from nucypher.crypto.constants import CAPSULE_LENGTH, PUBLIC_KEY_LENGTH
 from nucypher.crypto.splitters import key_splitter, capsule_splitter
 
 
@@ -55,17 +65,54 @@ class MessageKit(CryptoKit):
         self.sender_verifying_key = sender_verifying_key
         self._signature = signature
 
-    def to_bytes(self, include_alice_pubkey=True):
+    def to_buffers(self, include_alice_pubkey=True) -> List[bytes]:
+        """
+        The serialized kit as a list of buffers, for scatter writes (`socket.sendmsg`, `writelines`),
+        without copying the ciphertext.
+        """
         # We include the capsule first.
-        as_bytes = bytes(self.capsule)
+        buffers = [bytes(self.capsule)]
 
         # Then, before the ciphertext, we see if we're including alice's public key.
         # We want to put that first because it's typically of known length.
         if include_alice_pubkey and self.sender_verifying_key:
-            as_bytes += bytes(self.sender_verifying_key)
+            buffers.append(bytes(self.sender_verifying_key))
+
+        # The ciphertext, as a VariableLengthBytestring.
+        try:
+            buffers.append(len(self.ciphertext).to_bytes(VARIABLE_HEADER_LENGTH, "big"))
+        except OverflowError:
+            raise ValueError(f"The ciphertext is too long: the max length is {256 ** VARIABLE_HEADER_LENGTH - 1} bytes.")
+        buffers.append(self.ciphertext)
+        return buffers
 
-        as_bytes += VariableLengthBytestring(self.ciphertext)
-        return as_bytes
+    def to_bytes(self, include_alice_pubkey=True):
+        # Joining copies everything, once, into a buffer of the right size.
+        return bytes().join(self.to_buffers(include_alice_pubkey=include_alice_pubkey))
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'MessageKit':
+        """
+        Parses a kit serialized with `to_bytes`, keeping the ciphertext as a memoryview
+        over `buffer` instead of copying it.  The buffer must not change while the kit is in use.
+        """
+        view = memoryview(buffer)
+        key_offset = CAPSULE_LENGTH
+        length_offset = key_offset + PUBLIC_KEY_LENGTH
+        ciphertext_offset = length_offset + VARIABLE_HEADER_LENGTH
+        if len(view) < ciphertext_offset:
+            raise BytestringSplittingError(f"A MessageKit is at least {ciphertext_offset} bytes; got {len(view)}.")
+
+        ciphertext_length = int.from_bytes(view[length_offset:ciphertext_offset], "big")
+        if len(view) != ciphertext_offset + ciphertext_length:
+            raise BytestringSplittingError(f"Expected a ciphertext of {ciphertext_length} bytes; "
+                                           f"got {len(view) - ciphertext_offset}.")
+
+        capsule = Capsule.from_bytes(view[:key_offset].tobytes(), params=default_params())
+        sender_verifying_key = UmbralPublicKey.from_bytes(view[key_offset:length_offset].tobytes())
+        return cls(capsule=capsule,
+                   sender_verifying_key=sender_verifying_key,
+                   ciphertext=view[ciphertext_offset:])
 
     @classmethod
     def splitter(cls, *args, **kwargs):
@@ -79,7 +126,7 @@ class MessageKit(CryptoKit):
         return self._signature
 
     def __bytes__(self):
-        return bytes(self.capsule) + VariableLengthBytestring(self.ciphertext)
+        return self.to_bytes(include_alice_pubkey=False)
 
 
 class PolicyMessageKit(MessageKit):
@@ -0,0 +1,182 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import RLock
+from typing import List, Optional, Tuple
+
+from twisted.logger import Logger
+from umbral.keys import UmbralPublicKey
+
+
+class KFragPool:
+    """
+    A bounded queue of KFrags generated ahead of time, so that predictable grants
+    (a known Bob and label, or a scheduled re-grant) don't pay for KFrag generation
+    while the policy is being created.
+
+    Each precomputed batch is keyed by (Bob's encrypting key, label, m, n) and is handed
+    out at most once.  Batches that are evicted, cancelled or never claimed are disposed of
+    by clearing every reference we hold to them.
+    """
+
+    DEFAULT_MAX_KFRAGS = 1000
+    DEFAULT_WORKERS = 2
+
+    class PoolFull(RuntimeError):
+        """Raised when scheduling a batch would exceed the configured KFrag limit"""
+
+    def __init__(self,
+                 delegating_power: 'DelegatingPower',
+                 signer: 'SignatureStamp',
+                 max_kfrags: int = DEFAULT_MAX_KFRAGS,
+                 workers: int = DEFAULT_WORKERS,
+                 evict: bool = True):
+        """
+        :param delegating_power: The DelegatingPower used to derive the label key and generate KFrags.
+        :param signer: Alice's stamp, used to sign the generated KFrags.
+        :param max_kfrags: Upper bound on the number of KFrags held (or being generated) at any moment.
+        :param workers: Number of background workers generating KFrags.
+        :param evict: If True, the oldest batches are disposed of to make room for new ones;
+                      otherwise scheduling beyond the limit raises PoolFull.
+        """
+        self.log = Logger(self.__class__.__name__)
+        self.__delegating_power = delegating_power
+        self.__signer = signer
+        self.max_kfrags = max_kfrags
+        self.evict = evict
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kfrag-pool')
+        self._batches = OrderedDict()  # type: OrderedDict[tuple, Future]
+        self._lock = RLock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._batches)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._batches
+
+    @property
+    def size(self) -> int:
+        """The number of KFrags held or in the process of being generated."""
+        return sum(key[-1] for key in self._batches)
+
+    @staticmethod
+    def batch_key(bob_encrypting_key: UmbralPublicKey, label: bytes, m: int, n: int) -> tuple:
+        return bytes(bob_encrypting_key), bytes(label), m, n
+
+    def _generate(self, bob_encrypting_key: UmbralPublicKey, label: bytes, m: int, n: int) -> Tuple[UmbralPublicKey, List]:
+        return self.__delegating_power.generate_kfrags(bob_pubkey_enc=bob_encrypting_key,
+                                                       signer=self.__signer,
+                                                       label=label,
+                                                       m=m,
+                                                       n=n)
+
+    def schedule(self, bob_encrypting_key: UmbralPublicKey, label: bytes, m: int, n: int) -> Future:
+        """
+        Queue the generation of a KFrag batch for a future grant.
+        Scheduling the same (Bob, label, m, n) twice returns the already pending batch.
+        """
+        if n > self.max_kfrags:
+            raise self.PoolFull(f"Cannot precompute {n} KFrags; the pool is limited to {self.max_kfrags}.")
+
+        key = self.batch_key(bob_encrypting_key, label, m, n)
+        with self._lock:
+            if key in self._batches:
+                return self._batches[key]
+
+            while self.size + n > self.max_kfrags:
+                if not self.evict:
+                    raise self.PoolFull(f"Precomputing {n} more KFrags would exceed the limit of {self.max_kfrags}.")
+                oldest_key = next(iter(self._batches))
+                self.log.debug(f"Evicting precomputed KFrags for label {oldest_key[1]} to make room.")
+                self._dispose(self._batches.pop(oldest_key))
+
+            batch = self._executor.submit(self._generate, bob_encrypting_key, label, m, n)
+            self._batches[key] = batch
+        return batch
+
+    def take(self,
+             bob_encrypting_key: UmbralPublicKey,
+             label: bytes,
+             m: int,
+             n: int,
+             timeout: float = None
+             ) -> Optional[Tuple[UmbralPublicKey, List]]:
+        """
+        Claim a precomputed batch matching these policy parameters, removing it from the pool.
+        Returns None if nothing matching was scheduled, or if generation failed.
+        """
+        key = self.batch_key(bob_encrypting_key, label, m, n)
+        with self._lock:
+            batch = self._batches.pop(key, None)
+        if batch is None:
+            self.misses += 1
+            return None
+
+        try:
+            public_key, kfrags = batch.result(timeout=timeout)
+        except Exception as e:
+            self.log.warn(f"Precomputed KFrag generation failed ({e}); falling back to generating on demand.")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return public_key, list(kfrags)
+
+    def discard(self, bob_encrypting_key: UmbralPublicKey, label: bytes, m: int, n: int) -> bool:
+        key = self.batch_key(bob_encrypting_key, label, m, n)
+        with self._lock:
+            batch = self._batches.pop(key, None)
+        if batch is None:
+            return False
+        self._dispose(batch)
+        return True
+
+    @staticmethod
+    def _dispose(batch: Future) -> None:
+        """
+        Drop unclaimed KFrags.  The batch list is emptied in-place so no lingering reference
+        (e.g. the Future's cached result) keeps the KFrags' secret bignums alive; Umbral
+        clears them from memory when they are freed.
+        """
+        if batch.cancel():
+            return
+
+        def clear(finished_batch: Future):
+            try:
+                _public_key, kfrags = finished_batch.result()
+            except Exception:
+                return
+            kfrags.clear()
+
+        batch.add_done_callback(clear)
+
+    def clear(self) -> None:
+        with self._lock:
+            while self._batches:
+                _key, batch = self._batches.popitem(last=False)
+                self._dispose(batch)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Disposes of every batch and stops the workers; nothing can be scheduled afterwards."""
+        self.clear()
+        self._executor.shutdown(wait=wait)
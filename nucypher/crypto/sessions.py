@@ -0,0 +1,172 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Encryption sessions: many messages under one capsule.
+
+Enrico encrypts and signs a fresh session key for the policy, like any other message, into the session
+header.  Each message of the session is then encrypted with the session key (ChaCha20-Poly1305, the
+message's index in the session as nonce and the session ID as associated data) and signed by Enrico.
+Activating the header's capsule once, with a single round of WorkOrders, lets Bob decrypt every message
+of the session.
+"""
+
+import itertools
+import os
+from typing import Iterable, List
+
+from bytestring_splitter import BytestringSplitter, VariableLengthBytestring
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from umbral.dem import DEM_KEYSIZE
+from umbral.keys import UmbralPublicKey
+from umbral.signing import Signature
+
+from nucypher.crypto.api import encrypt_and_sign, keccak_digest
+from nucypher.crypto.constants import KECCAK_DIGEST_LENGTH
+from nucypher.crypto.kits import UmbralMessageKit
+from nucypher.crypto.signing import InvalidSignature, SignatureStamp
+
+SESSION_INDEX_LENGTH = 8
+
+
+def _nonce(index: int) -> bytes:
+    return index.to_bytes(12, byteorder='big')
+
+
+class SessionMessageKit:
+    """A message encrypted under a session key; decrypting it takes the header of its session."""
+
+    _index_splitter = (int, SESSION_INDEX_LENGTH, {'byteorder': 'big'})
+    _splitter = BytestringSplitter((bytes, KECCAK_DIGEST_LENGTH), _index_splitter, VariableLengthBytestring, Signature)
+
+    def __init__(self, session_id: bytes, index: int, ciphertext: bytes, signature: Signature):
+        self.session_id = session_id
+        self.index = index
+        self.ciphertext = ciphertext
+        self.signature = signature
+
+    def signed_message(self) -> bytes:
+        return self.session_id + self.index.to_bytes(SESSION_INDEX_LENGTH, byteorder='big') + self.ciphertext
+
+    def to_bytes(self, include_session_id: bool = True) -> bytes:
+        as_bytes = self.session_id if include_session_id else bytes()
+        as_bytes += self.index.to_bytes(SESSION_INDEX_LENGTH, byteorder='big')
+        as_bytes += VariableLengthBytestring(self.ciphertext)
+        as_bytes += bytes(self.signature)
+        return as_bytes
+
+    def __bytes__(self):
+        return self.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, some_bytes: bytes) -> 'SessionMessageKit':
+        session_id, index, ciphertext, signature = cls._splitter(some_bytes)
+        return cls(session_id=session_id, index=index, ciphertext=ciphertext, signature=signature)
+
+
+class SessionEnvelope:
+    """
+    The header of a session, along with some (or all) of its messages.
+
+    Bob can `retrieve` an envelope just like a MessageKit: it has the header's capsule and sender.
+    """
+
+    _message_splitter = BytestringSplitter(SessionMessageKit._index_splitter, VariableLengthBytestring, Signature)
+
+    def __init__(self, header: UmbralMessageKit, messages: List[SessionMessageKit] = None):
+        self.header = header
+        self.messages = messages or list()
+
+    @property
+    def id(self) -> bytes:
+        return keccak_digest(self.header.to_bytes())
+
+    @property
+    def capsule(self):
+        return self.header.capsule
+
+    @property
+    def sender_verifying_key(self) -> UmbralPublicKey:
+        return self.header.sender_verifying_key
+
+    @property
+    def sender(self):
+        return self.header.sender
+
+    @sender.setter
+    def sender(self, enrico):
+        self.header.sender = enrico
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __bytes__(self):
+        messages = bytes().join(message.to_bytes(include_session_id=False) for message in self.messages)
+        return bytes(VariableLengthBytestring(self.header.to_bytes())) + messages
+
+    @classmethod
+    def from_bytes(cls, some_bytes: bytes) -> 'SessionEnvelope':
+        header, messages_bytes = BytestringSplitter((UmbralMessageKit, VariableLengthBytestring))(some_bytes,
+                                                                                                 return_remainder=True)
+        envelope = cls(header=header)
+        session_id = envelope.id
+        for index, ciphertext, signature in cls._message_splitter.repeat(messages_bytes):
+            envelope.messages.append(SessionMessageKit(session_id, index, ciphertext, signature))
+        return envelope
+
+    def decrypt(self, session_key: bytes) -> List[bytes]:
+        """Decrypts every message of the envelope, once the session key is out of the header."""
+        session_id = self.id
+        cipher = ChaCha20Poly1305(session_key)
+        cleartexts = list()
+        for message in self.messages:
+            if message.session_id != session_id:
+                raise ValueError(f"Message {message.index} is not from this session.")
+            if not message.signature.verify(message.signed_message(), self.sender_verifying_key):
+                raise InvalidSignature(f"Signature for message {message.index} of the session isn't valid.")
+            try:
+                cleartexts.append(cipher.decrypt(_nonce(message.index), message.ciphertext, session_id))
+            except InvalidTag:
+                raise InvalidSignature(f"Message {message.index} of the session failed authentication.")
+        return cleartexts
+
+
+class EncryptionSession:
+    """Enrico's side of a session: encrypts any number of messages under a single capsule."""
+
+    def __init__(self, recipient_pubkey_enc: UmbralPublicKey, signer: SignatureStamp):
+        session_key = os.urandom(DEM_KEYSIZE)
+        self.header, _signature = encrypt_and_sign(recipient_pubkey_enc, plaintext=session_key, signer=signer)
+        self.id = keccak_digest(self.header.to_bytes())
+        self.__cipher = ChaCha20Poly1305(session_key)
+        self.__signer = signer
+        self.__indices = itertools.count()  # Nonces must never repeat; next() on a count is atomic.
+
+    def encrypt_message(self, message: bytes) -> SessionMessageKit:
+        index = next(self.__indices)
+        ciphertext = self.__cipher.encrypt(_nonce(index), message, self.id)
+        message_kit = SessionMessageKit(session_id=self.id, index=index, ciphertext=ciphertext, signature=None)
+        message_kit.signature = self.__signer(message_kit.signed_message())
+        return message_kit
+
+    def encrypt_messages(self, messages: Iterable[bytes]) -> SessionEnvelope:
+        return self.envelope(self.encrypt_message(message) for message in messages)
+
+    def envelope(self, message_kits: Iterable[SessionMessageKit] = ()) -> SessionEnvelope:
+        """Packs messages of this session with its header, for Bob to retrieve them at once."""
+        return SessionEnvelope(header=self.header, messages=list(message_kits))
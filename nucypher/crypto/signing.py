@@ -16,7 +16,12 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+from collections import OrderedDict, defaultdict
+from threading import Lock
+from typing import Dict, Tuple
+
 from bytestring_splitter import BytestringSplitter
+from umbral.keys import UmbralPublicKey
 from umbral.signing import Signature, Signer
 
 from nucypher.crypto.api import keccak_digest
@@ -84,3 +89,71 @@ class StrangerStamp(SignatureStamp):
 
 class InvalidSignature(Exception):
     """Raised when a Signature is not valid."""
+
+
+class VerificationMemo:
+    """
+    Process-wide, bounded memo of (verifying key, message, signature) triples that have already verified.
+
+    The same signatures reach a node over and over (work order receipts on retries, TreasureMaps on
+    every publication, node metadata on every learning round); each hit here saves an ECDSA verification.
+    Only successful verifications are remembered, keyed by a digest of the whole triple, and the oldest
+    entries are dropped past `max_size`.  Hits and misses are counted per call site.
+    """
+
+    DEFAULT_MAX_SIZE = 100000
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.__verified = OrderedDict()  # type: OrderedDict[bytes, None]
+        self.__lock = Lock()
+        self.hits = defaultdict(int)  # type: Dict[str, int]
+        self.misses = defaultdict(int)  # type: Dict[str, int]
+
+    def __len__(self) -> int:
+        return len(self.__verified)
+
+    def verify(self,
+               signature: Signature,
+               message: bytes,
+               verifying_key: UmbralPublicKey,
+               call_site: str = 'unspecified'
+               ) -> bool:
+        key = keccak_digest(bytes(verifying_key), message, bytes(signature))
+        with self.__lock:
+            if key in self.__verified:
+                self.__verified.move_to_end(key)
+                self.hits[call_site] += 1
+                return True
+            self.misses[call_site] += 1
+
+        verified = signature.verify(message, verifying_key)
+        if verified:
+            with self.__lock:
+                self.__verified[key] = None
+                while len(self.__verified) > self.max_size:
+                    self.__verified.popitem(last=False)
+        return verified
+
+    def hit_rate(self, call_site: str) -> float:
+        hits, misses = self.hits[call_site], self.misses[call_site]
+        return hits / (hits + misses) if hits or misses else 0.0
+
+    def stats(self) -> Dict[str, Tuple[int, int]]:
+        """Returns (hits, misses) for every call site seen so far."""
+        call_sites = set(self.hits) | set(self.misses)
+        return {call_site: (self.hits[call_site], self.misses[call_site]) for call_site in call_sites}
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__verified.clear()
+            self.hits.clear()
+            self.misses.clear()
+
+
+verification_memo = VerificationMemo()
+
+
+def verify_signature(signature: Signature, message: bytes, verifying_key: UmbralPublicKey, call_site: str) -> bool:
+    """Signature.verify, remembering successful verifications in the process-wide memo."""
+    return verification_memo.verify(signature, message, verifying_key, call_site=call_site)
@@ -0,0 +1,258 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Streaming encryption of payloads too large to hold in memory.
+
+A fresh symmetric key is encrypted and signed for the policy, like any other message, into the header
+MessageKit; opening its capsule (with the CFrags from Ursulas, for Bob) yields the key.  The payload is
+then encrypted in fixed-size chunks, each authenticated on its own, so both encryption and decryption
+take constant memory, and any chunk can be decrypted without reading the others.  Enrico's signature
+over the header and every encrypted chunk closes the stream.
+
+    header length (4 bytes) | chunk size (4 bytes) | header MessageKit | chunk 0 | ... | chunk n | signature
+
+Each chunk is encrypted with ChaCha20-Poly1305, with the whole header as associated data and the
+chunk's index as nonce.  The last chunk (which may be short, or even empty) has a flag set in its
+nonce, so a truncated stream doesn't decrypt.
+"""
+
+import io
+import os
+import struct
+from typing import BinaryIO, Callable, Iterator, Tuple, Union
+
+import sha3
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from umbral.dem import DEM_KEYSIZE
+from umbral.keys import UmbralPublicKey
+from umbral.signing import Signature
+
+from nucypher.crypto.api import encrypt_and_sign
+from nucypher.crypto.kits import UmbralMessageKit
+from nucypher.crypto.signing import InvalidSignature, SignatureStamp
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # bytes
+TAG_LENGTH = 16  # Poly1305
+SIGNATURE_LENGTH = Signature.expected_bytes_length()
+
+_PREAMBLE = struct.Struct('>II')  # header MessageKit length, chunk size
+
+Source = Union[BinaryIO, bytes, bytearray, memoryview]
+
+
+class StreamCorrupted(ValueError):
+    """Raised when a stream is malformed, truncated, or fails authentication."""
+
+
+def _as_file(source: Source) -> BinaryIO:
+    """Accepts file-like objects (including memory maps) as they are, and wraps in-memory buffers."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def _read(source: BinaryIO, size: int) -> bytes:
+    """Reads `size` bytes, or whatever is left, even from sources that return short reads."""
+    data = source.read(size)
+    while data and len(data) < size:
+        more = source.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+
+class StreamHeader:
+
+    def __init__(self, message_kit: UmbralMessageKit, chunk_size: int):
+        self.message_kit = message_kit
+        self.chunk_size = chunk_size
+        self.__bytes = None
+
+    def __bytes__(self):
+        if self.__bytes is None:
+            message_kit_bytes = self.message_kit.to_bytes()
+            self.__bytes = _PREAMBLE.pack(len(message_kit_bytes), self.chunk_size) + message_kit_bytes
+        return self.__bytes
+
+    def __len__(self):
+        return len(bytes(self))
+
+    @classmethod
+    def from_file(cls, source: BinaryIO) -> 'StreamHeader':
+        preamble = _read(source, _PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise StreamCorrupted("The stream is too short to have a header.")
+        message_kit_length, chunk_size = _PREAMBLE.unpack(preamble)
+        message_kit_bytes = _read(source, message_kit_length)
+        if len(message_kit_bytes) != message_kit_length or not chunk_size:
+            raise StreamCorrupted("The stream header is malformed.")
+        header = cls(message_kit=UmbralMessageKit.from_bytes(message_kit_bytes), chunk_size=chunk_size)
+        header.__bytes = preamble + message_kit_bytes
+        return header
+
+    @property
+    def sender_verifying_key(self) -> UmbralPublicKey:
+        return self.message_kit.sender_verifying_key
+
+
+class StreamCipher:
+    """Encrypts and decrypts the chunks of one stream, given its key."""
+
+    def __init__(self, key: bytes, header: StreamHeader):
+        if len(key) != DEM_KEYSIZE:
+            raise ValueError(f"Invalid key size, must be {DEM_KEYSIZE} bytes")
+        self.__cipher = ChaCha20Poly1305(key)
+        self.header = header
+        self.__associated_data = bytes(header)
+
+    @staticmethod
+    def nonce(index: int, final: bool) -> bytes:
+        return index.to_bytes(11, byteorder='big') + (b'\x01' if final else b'\x00')
+
+    def encrypt_chunk(self, index: int, plaintext: bytes, final: bool) -> bytes:
+        return self.__cipher.encrypt(self.nonce(index, final), plaintext, self.__associated_data)
+
+    def decrypt_chunk(self, index: int, ciphertext: bytes, final: bool) -> bytes:
+        try:
+            return self.__cipher.decrypt(self.nonce(index, final), ciphertext, self.__associated_data)
+        except InvalidTag:
+            raise StreamCorrupted(f"Chunk {index} of the stream failed authentication.")
+
+
+def _plaintext_chunks(source: BinaryIO, chunk_size: int) -> Iterator[Tuple[bytes, bool]]:
+    chunk = _read(source, chunk_size)
+    while True:
+        next_chunk = _read(source, chunk_size)
+        final = not next_chunk
+        yield chunk, final
+        if final:
+            return
+        chunk = next_chunk
+
+
+def encrypt_stream(recipient_pubkey_enc: UmbralPublicKey,
+                   source: Source,
+                   sink: BinaryIO,
+                   signer: SignatureStamp,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE
+                   ) -> StreamHeader:
+    """
+    Encrypts everything read from `source` for the policy, writing the stream to `sink`.
+    Returns the stream's header, whose capsule is the one to activate to decrypt it.
+    """
+    key = os.urandom(DEM_KEYSIZE)
+    message_kit, _signature = encrypt_and_sign(recipient_pubkey_enc, plaintext=key, signer=signer)
+    header = StreamHeader(message_kit=message_kit, chunk_size=chunk_size)
+    cipher = StreamCipher(key=key, header=header)
+
+    digest = sha3.keccak_256(bytes(header))
+    sink.write(bytes(header))
+    for index, (chunk, final) in enumerate(_plaintext_chunks(_as_file(source), chunk_size)):
+        ciphertext = cipher.encrypt_chunk(index, chunk, final)
+        digest.update(ciphertext)
+        sink.write(ciphertext)
+    sink.write(bytes(signer(digest.digest())))
+    return header
+
+
+def decrypt_stream(source: Source,
+                   sink: BinaryIO,
+                   open_header: Callable[[UmbralMessageKit], bytes]
+                   ) -> StreamHeader:
+    """
+    Decrypts a stream from `source` to `sink`, using `open_header` to get the key out of the header MessageKit.
+
+    Each chunk is authenticated before it's written, but the sender's signature over the whole stream
+    can only be checked at the end: if it's invalid, InvalidSignature is raised after everything
+    has been written, and the caller must discard what was written.
+    """
+    source = _as_file(source)
+    header = StreamHeader.from_file(source)
+    cipher = StreamCipher(key=open_header(header.message_kit), header=header)
+    record_size = header.chunk_size + TAG_LENGTH
+
+    digest = sha3.keccak_256(bytes(header))
+    buffer = _read(source, record_size + SIGNATURE_LENGTH)
+    index = 0
+    while True:
+        next_record = _read(source, record_size)
+        final = not next_record
+        if final:
+            ciphertext, signature_bytes = buffer[:-SIGNATURE_LENGTH], buffer[-SIGNATURE_LENGTH:]
+            if len(ciphertext) < TAG_LENGTH:
+                raise StreamCorrupted("The stream is truncated.")
+        else:
+            ciphertext, buffer = buffer[:record_size], buffer[record_size:] + next_record
+        sink.write(cipher.decrypt_chunk(index, ciphertext, final))
+        digest.update(ciphertext)
+        if final:
+            break
+        index += 1
+
+    signature = Signature.from_bytes(signature_bytes)
+    if not signature.verify(digest.digest(), header.sender_verifying_key):
+        raise InvalidSignature("The stream's signature isn't valid.")
+    return header
+
+
+class StreamReader:
+    """
+    Random access to the chunks of a seekable stream (a file, a memory map or a buffer), once its key is known.
+
+    Chunks are authenticated one by one; the signature over the whole stream is not checked.
+    """
+
+    def __init__(self, source: Source, open_header: Callable[[UmbralMessageKit], bytes]):
+        self.source = _as_file(source)
+        self.source.seek(0)
+        self.header = StreamHeader.from_file(self.source)
+        self.__cipher = StreamCipher(key=open_header(self.header.message_kit), header=self.header)
+
+        self.source.seek(0, io.SEEK_END)
+        body_length = self.source.tell() - len(self.header) - SIGNATURE_LENGTH
+        if body_length < TAG_LENGTH:
+            raise StreamCorrupted("The stream is truncated.")
+        record_size = self.header.chunk_size + TAG_LENGTH
+        self.number_of_chunks = -(-body_length // record_size)
+        self.__body_length = body_length
+
+    def __len__(self):
+        return self.number_of_chunks
+
+    def chunk(self, index: int) -> bytes:
+        if not 0 <= index < self.number_of_chunks:
+            raise IndexError(f"The stream has {self.number_of_chunks} chunks; there's no chunk {index}.")
+        record_size = self.header.chunk_size + TAG_LENGTH
+        start = index * record_size
+        self.source.seek(len(self.header) + start)
+        ciphertext = _read(self.source, min(record_size, self.__body_length - start))
+        final = index == self.number_of_chunks - 1
+        return self.__cipher.decrypt_chunk(index, ciphertext, final)
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Reads `size` bytes of plaintext from `offset`, decrypting only the chunks they're in."""
+        if size <= 0:
+            return b''
+        chunk_size = self.header.chunk_size
+        first, last = offset // chunk_size, min((offset + size - 1) // chunk_size, self.number_of_chunks - 1)
+        plaintext = b''.join(self.chunk(index) for index in range(first, last + 1))
+        start = offset - first * chunk_size
+        return plaintext[start:start + size]
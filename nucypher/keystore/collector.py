@@ -0,0 +1,173 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from datetime import datetime
+
+from twisted.internet import task, threads
+from twisted.logger import Logger
+
+from nucypher.keystore.db import IN_MEMORY_FILEPATH
+from nucypher.keystore.threading import session_registry
+
+
+class ExpiredArrangementCollector:
+    """
+    Periodically deletes expired PolicyArrangements (and their KFrags), the Workorders made against them,
+    expired TreasureMaps and Keys that nothing references any longer, then returns the freed pages
+    to the filesystem.
+
+    Runs on a LoopingCall, doing the database work in the reactor's threadpool.  Deletion happens in
+    batches of `batch_size` rows, one transaction each, so request threads are never locked out for long.
+    """
+
+    DEFAULT_INTERVAL = 60 * 60  # seconds
+    DEFAULT_BATCH_SIZE = 500
+    DEFAULT_VACUUM_EVERY = 24   # collection runs between full VACUUMs, when incremental vacuum is unavailable
+    INCREMENTAL_VACUUM_PAGES = 1000
+
+    def __init__(self,
+                 datastore,
+                 interval: int = DEFAULT_INTERVAL,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 vacuum_every: int = DEFAULT_VACUUM_EVERY):
+        self.log = Logger(self.__class__.__name__)
+        self.datastore = datastore
+        self.interval = interval
+        self.batch_size = batch_size
+        self.vacuum_every = vacuum_every
+        self._task = task.LoopingCall(self._collect_in_thread)
+
+        # Totals since startup, reported as metrics
+        self.runs = 0
+        self.reclaimed_arrangements = 0
+        self.reclaimed_workorders = 0
+        self.reclaimed_keys = 0
+        self.reclaimed_treasure_maps = 0
+        self.reclaimed_bytes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task.running
+
+    def start(self, now: bool = False) -> None:
+        if not self._task.running:
+            self._task.start(interval=self.interval, now=now)
+
+    def stop(self) -> None:
+        if self._task.running:
+            self._task.stop()
+
+    def __handle_failure(self, failure) -> None:
+        # Swallow the failure so the LoopingCall keeps running; the next run will try again.
+        self.log.warn(f"Datastore garbage collection failed: {failure.getTraceback()}")
+
+    def _collect_in_thread(self):
+        d = threads.deferToThread(self.collect)
+        d.addErrback(self.__handle_failure)
+        return d
+
+    def collect(self, now: datetime = None) -> dict:
+        """Runs one full collection, returning what it reclaimed."""
+        now = now or datetime.utcnow()
+        engine = self.datastore.engine
+        size_before = self._database_size()
+
+        # Receipts still in the ledger may reference arrangements we're about to delete.
+        self.datastore.workorder_ledger.flush()
+
+        arrangements = workorders = keys = 0
+        while True:
+            session = session_registry(engine).session_factory()
+            try:
+                deleted_arrangements, deleted_workorders = self.datastore.del_expired_policy_arrangements(
+                    now=now, limit=self.batch_size, session=session)
+            finally:
+                session.close()
+            arrangements += deleted_arrangements
+            workorders += deleted_workorders
+            if deleted_arrangements < self.batch_size:
+                break
+
+        treasure_maps = 0
+        while True:
+            session = session_registry(engine).session_factory()
+            try:
+                deleted_maps = self.datastore.del_expired_treasure_maps(now=now, limit=self.batch_size, session=session)
+            finally:
+                session.close()
+            treasure_maps += deleted_maps
+            if deleted_maps < self.batch_size:
+                break
+
+        while True:
+            session = session_registry(engine).session_factory()
+            try:
+                deleted_keys = self.datastore.del_orphaned_keys(limit=self.batch_size, session=session)
+            finally:
+                session.close()
+            keys += deleted_keys
+            if deleted_keys < self.batch_size:
+                break
+
+        self.runs += 1
+        self._vacuum()
+        reclaimed_bytes = max(size_before - self._database_size(), 0)
+
+        self.reclaimed_arrangements += arrangements
+        self.reclaimed_workorders += workorders
+        self.reclaimed_keys += keys
+        self.reclaimed_treasure_maps += treasure_maps
+        self.reclaimed_bytes += reclaimed_bytes
+
+        self.log.info(f"Collected {arrangements} expired arrangements, {workorders} work orders, "
+                      f"{treasure_maps} expired treasure maps and {keys} orphaned keys; "
+                      f"reclaimed {reclaimed_bytes} bytes.")
+        return dict(arrangements=arrangements,
+                    workorders=workorders,
+                    treasure_maps=treasure_maps,
+                    keys=keys,
+                    bytes=reclaimed_bytes)
+
+    @property
+    def _file_backed(self) -> bool:
+        return self.datastore.engine.url.database not in (None, '', IN_MEMORY_FILEPATH)
+
+    def _pragma(self, name: str) -> int:
+        with self.datastore.engine.connect() as connection:
+            return connection.execute(f"PRAGMA {name}").scalar()
+
+    def _database_size(self) -> int:
+        if not self._file_backed:
+            return 0
+        return self._pragma('page_count') * self._pragma('page_size')
+
+    def _vacuum(self) -> None:
+        if not self._file_backed or not self._pragma('freelist_count'):
+            return
+        with self.datastore.engine.connect() as connection:
+            cursor = connection.connection.cursor()
+            try:
+                auto_vacuum = cursor.execute("PRAGMA auto_vacuum").fetchone()[0]
+                if auto_vacuum == 2:  # INCREMENTAL
+                    # Each step frees one page; fetch every step so the whole pragma runs.
+                    cursor.execute(f"PRAGMA incremental_vacuum({self.INCREMENTAL_VACUUM_PAGES})").fetchall()
+                elif self.runs % self.vacuum_every == 0:
+                    # Datastores created before incremental vacuum was enabled need a full rebuild.
+                    cursor.execute("VACUUM")
+            finally:
+                cursor.close()
@@ -14,15 +14,105 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
+from threading import RLock, local
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine, create_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import QueuePool, StaticPool
+from twisted.python.threadpool import ThreadPool
 
 Base = declarative_base()
 
+IN_MEMORY_FILEPATH = ':memory:'
+
+# Size the connection pool to the Twisted threadpool that serves WSGI requests,
+# so every request thread can hold a connection without waiting on another.
+DEFAULT_POOL_SIZE = ThreadPool.max
+DEFAULT_MAX_OVERFLOW = 5
+
 
 @event.listens_for(Engine, "connect")
 def set_secure_delete_pragma(dbapi_connection, connection_record):
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA secure_delete=on")
     cursor.close()
+
+
+def set_file_backed_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers proceed while a writer commits; NORMAL only fsyncs at checkpoints,
+    # which is durable against application crashes (but not power loss) in WAL mode.
+    # Incremental auto-vacuum only takes effect on new databases (before any table exists).
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+class SerializedTransactions:
+    """
+    Serializes the transactions on an engine whose threads share a single sqlite connection.
+
+    A transaction holds the database from the moment it begins (a session's first statement)
+    until it commits or rolls back (as it does when its session is closed), so it can neither
+    see another thread's uncommitted rows nor commit or roll them back.  Sessions on the thread
+    that holds the database may begin transactions of their own.  Since an open session holds
+    the database, sessions on these engines must be short lived (see ThreadedSession).
+    """
+
+    def __init__(self, engine: Engine):
+        self.__lock = RLock()
+        self.__held = local()
+        event.listen(engine, "begin", self.begin)
+        event.listen(engine, "commit", self.end)
+        event.listen(engine, "rollback", self.end)
+
+    def begin(self, connection) -> None:
+        self.__lock.acquire()
+        self.__held.transactions = getattr(self.__held, 'transactions', 0) + 1
+
+    def end(self, connection) -> None:
+        # Statements run outside a transaction commit without having begun one.
+        if getattr(self.__held, 'transactions', 0):
+            self.__held.transactions -= 1
+            self.__lock.release()
+
+
+def create_datastore_engine(db_filepath: str = None,
+                            pool_size: int = DEFAULT_POOL_SIZE,
+                            max_overflow: int = DEFAULT_MAX_OVERFLOW) -> Engine:
+    """
+    Creates a SQLAlchemy engine for an Ursula datastore that is safe to share between request threads.
+
+    In-memory databases are private to the connection that created them, so a single
+    connection is shared by all threads, with their transactions serialized (see `SerializedTransactions`).
+    File-backed databases use a pool of connections sized for the WSGI threadpool and run in WAL mode.
+    """
+    # See: https://docs.sqlalchemy.org/en/13/dialects/sqlite.html#threading-pooling-behavior
+    connect_args = {'check_same_thread': False}
+    if not db_filepath or db_filepath == IN_MEMORY_FILEPATH:
+        # TODO: Is in-memory storage a sane default? See #667
+        engine = create_engine('sqlite://', connect_args=connect_args, poolclass=StaticPool)
+        SerializedTransactions(engine)
+    else:
+        engine = create_engine(f'sqlite:///{db_filepath}',
+                               connect_args=connect_args,
+                               poolclass=QueuePool,
+                               pool_size=pool_size,
+                               max_overflow=max_overflow)
+        event.listen(engine, "connect", set_file_backed_pragmas)
+    return engine
+
+
+def create_missing_indexes(engine: Engine) -> None:
+    """
+    Adds indexes declared on the models to tables that were created before those indexes existed;
+    `create_all` only creates indexes along with new tables.
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
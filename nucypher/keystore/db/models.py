@@ -84,10 +84,10 @@ class Workorder(Base):
     __tablename__ = 'workorders'
 
     id = Column(Integer, primary_key=True)
-    bob_verifying_key_id = Column(Integer, ForeignKey('keys.id'))
+    bob_verifying_key_id = Column(Integer, ForeignKey('keys.id'), index=True)
     bob_signature = Column(LargeBinary, unique=True)
-    arrangement_id = Column(LargeBinary, unique=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    arrangement_id = Column(LargeBinary, unique=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     def __init__(self, bob_verifying_key_id, bob_signature, arrangement_id) -> None:
         self.bob_verifying_key_id = bob_verifying_key_id
@@ -96,3 +96,22 @@ class Workorder(Base):
 
     def __repr__(self):
         return f'{self.__class__.__name__}(id={self.id})'
+
+
+class TreasureMapRecord(Base):
+    __tablename__ = 'treasuremaps'
+
+    id = Column(LargeBinary, unique=True, primary_key=True)
+    payload = Column(LargeBinary)
+    digest = Column(LargeBinary)
+    expiration = Column(DateTime, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __init__(self, id, payload, digest, expiration) -> None:
+        self.id = id
+        self.payload = payload
+        self.digest = digest
+        self.expiration = expiration
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(id={self.id})'
@@ -99,7 +99,7 @@ class DecryptingKeypair(Keypair):
 
         :return: bytes
         """
-        cleartext = pre.decrypt(ciphertext=message_kit.ciphertext,
+        cleartext = pre.decrypt(ciphertext=bytes(message_kit.ciphertext),  # Umbral only takes bytes
                                 capsule=message_kit.capsule,
                                 decrypting_key=self._privkey,
                                 )
@@ -14,16 +14,19 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import Union, List
+from datetime import datetime
+from typing import Iterator, List, Tuple, Union
 
 from bytestring_splitter import BytestringSplitter
+from sqlalchemy import func
 from sqlalchemy.orm import sessionmaker
 from umbral.keys import UmbralPublicKey
 from umbral.kfrags import KFrag
 
 from nucypher.crypto.signing import Signature
 from nucypher.crypto.utils import fingerprint_from_key
-from nucypher.keystore.db.models import Key, PolicyArrangement, Workorder
+from nucypher.keystore.db.models import Key, PolicyArrangement, TreasureMapRecord, Workorder
+from nucypher.keystore.ledger import WorkOrderLedger
 from . import keypairs
 
 
@@ -53,6 +56,9 @@ class KeyStore(object):
         # Best to treat like hot lava.
         self._session_on_init_thread = Session()
 
+        # Work order receipts are buffered here and group-committed in the background.
+        self.workorder_ledger = WorkOrderLedger(datastore=self)
+
     def add_key(self, key, is_signing=True, session=None) -> Key:
         """
         :param key: Keypair object to store in the keystore.
@@ -145,6 +151,53 @@ class KeyStore(object):
         session.query(PolicyArrangement).filter_by(id=arrangement_id).delete()
         session.commit()
 
+    def del_expired_policy_arrangements(self, now: datetime = None, limit: int = 500, session=None) -> Tuple[int, int]:
+        """
+        Deletes up to `limit` PolicyArrangements that expired before `now`, along with their Workorders.
+
+        :return: The number of PolicyArrangements and Workorders deleted.
+        """
+        now = now or datetime.utcnow()
+        session = session or self._session_on_init_thread
+
+        expired = session.query(PolicyArrangement.id).filter(PolicyArrangement.expiration < now).limit(limit).all()
+        arrangement_ids = [arrangement_id for arrangement_id, in expired]
+        if not arrangement_ids:
+            return 0, 0
+
+        # Arrangements are stored by hex ID, while Workorders carry the raw ID.
+        workorder_arrangement_ids = list()
+        for arrangement_id in arrangement_ids:
+            try:
+                workorder_arrangement_ids.append(bytes.fromhex(arrangement_id.decode()))
+            except ValueError:  # Includes UnicodeDecodeError
+                workorder_arrangement_ids.append(arrangement_id)
+        deleted_workorders = session.query(Workorder).filter(
+            Workorder.arrangement_id.in_(workorder_arrangement_ids)).delete(synchronize_session=False)
+        deleted_arrangements = session.query(PolicyArrangement).filter(
+            PolicyArrangement.id.in_(arrangement_ids)).delete(synchronize_session=False)
+        session.commit()
+
+        return deleted_arrangements, deleted_workorders
+
+    def del_orphaned_keys(self, limit: int = 500, session=None) -> int:
+        """
+        Deletes up to `limit` Keys that are no longer referenced by any PolicyArrangement or Workorder.
+        """
+        session = session or self._session_on_init_thread
+
+        alice_keys = session.query(PolicyArrangement.alice_verifying_key_id).filter(
+            PolicyArrangement.alice_verifying_key_id.isnot(None))
+        bob_keys = session.query(Workorder.bob_verifying_key_id).filter(Workorder.bob_verifying_key_id.isnot(None))
+        orphans = session.query(Key.id).filter(~Key.id.in_(alice_keys), ~Key.id.in_(bob_keys)).limit(limit).all()
+        orphan_ids = [key_id for key_id, in orphans]
+        if not orphan_ids:
+            return 0
+
+        deleted = session.query(Key).filter(Key.id.in_(orphan_ids)).delete(synchronize_session=False)
+        session.commit()
+        return deleted
+
     def attach_kfrag_to_saved_arrangement(self, alice, id_as_hex, kfrag, session=None):
         session = session or self._session_on_init_thread
         
@@ -169,7 +222,7 @@ class KeyStore(object):
         fingerprint = fingerprint_from_key(bob_verifying_key)
         key = session.query(Key).filter_by(fingerprint=fingerprint).first()
         if not key:
-            key = self.add_key(key=bob_verifying_key)
+            key = self.add_key(key=bob_verifying_key, session=session)
 
         new_workorder = Workorder(bob_verifying_key_id=key.id,
                                   bob_signature=bob_signature,
@@ -179,6 +232,86 @@ class KeyStore(object):
         session.commit()
         return new_workorder
 
+    def reserve_workorder(self, bob_signature: bytes, session=None) -> bool:
+        """
+        Claims a Workorder's receipt signature before it's served.  Returns False for a replay:
+        a Workorder whose signature is being served, pending in the ledger or saved already.
+        """
+        if not self.workorder_ledger.reserve(bob_signature):
+            return False
+        session = session or self._session_on_init_thread
+        try:
+            saved = session.query(Workorder.id).filter_by(bob_signature=bob_signature).first() is not None
+        except Exception:
+            self.workorder_ledger.release(bob_signature)
+            raise
+        if saved:
+            self.workorder_ledger.release(bob_signature)
+            return False
+        return True
+
+    def release_workorder(self, bob_signature: bytes) -> None:
+        """Gives up the claim on a reserved Workorder that wasn't served."""
+        self.workorder_ledger.release(bob_signature)
+
+    def record_workorder(self, bob_verifying_key: bytes, bob_signature: bytes, arrangement_id: bytes) -> None:
+        """
+        Queues a Workorder receipt to be saved by the next group commit.
+        """
+        self.workorder_ledger.append(bob_verifying_key=bob_verifying_key,
+                                     bob_signature=bob_signature,
+                                     arrangement_id=arrangement_id)
+
+    def save_workorders(self, receipts, session=None) -> List[Workorder]:
+        """
+        Adds many Workorders to the keystore in a single transaction.
+
+        :param receipts: Iterable of (bob_verifying_key, bob_signature, arrangement_id, created_at)
+        """
+        session = session or self._session_on_init_thread
+
+        # Get or Create each distinct Bob Verifying Key, with one lookup for all of them.
+        fingerprints = {bytes(bob_verifying_key): fingerprint_from_key(bob_verifying_key)
+                        for bob_verifying_key, *_ in receipts}
+        keys = session.query(Key).filter(Key.fingerprint.in_(set(fingerprints.values()))).all()
+        keys_by_fingerprint = {key.fingerprint: key for key in keys}
+        for key_data, fingerprint in fingerprints.items():
+            if fingerprint not in keys_by_fingerprint:
+                key = Key(fingerprint, key_data, is_signing=True)
+                session.add(key)
+                keys_by_fingerprint[fingerprint] = key
+        session.flush()
+
+        new_workorders = list()
+        for bob_verifying_key, bob_signature, arrangement_id, created_at in receipts:
+            key = keys_by_fingerprint[fingerprints[bytes(bob_verifying_key)]]
+            new_workorder = Workorder(bob_verifying_key_id=key.id,
+                                      bob_signature=bob_signature,
+                                      arrangement_id=arrangement_id)
+            new_workorder.created_at = created_at
+            new_workorders.append(new_workorder)
+
+        session.add_all(new_workorders)
+        session.commit()
+        return new_workorders
+
+    def _workorders_query(self, session, arrangement_id: bytes = None, bob_verifying_key: bytes = None):
+        query = session.query(Workorder)
+
+        # Filter by arrangement
+        if arrangement_id:
+            query = query.filter_by(arrangement_id=arrangement_id)
+
+        # Filter by Bob
+        elif bob_verifying_key:
+            fingerprint = fingerprint_from_key(bob_verifying_key)
+            key = session.query(Key).filter_by(fingerprint=fingerprint).first()
+            if not key:
+                raise NotFound("No Workorders from Bob {} found.".format(fingerprint))
+            query = query.filter_by(bob_verifying_key_id=key.id)
+
+        return query
+
     def get_workorders(self,
                        arrangement_id: bytes = None,
                        bob_verifying_key: bytes = None,
@@ -186,38 +319,109 @@ class KeyStore(object):
                        ) -> List[Workorder]:
         """
         Returns a list of Workorders by HRAC.
+
+        This loads every matching record; prefer iter_workorders or count_workorders for large tables.
         """
+        self.workorder_ledger.flush()
         session = session or self._session_on_init_thread
-        query = session.query(Workorder)
+        query = self._workorders_query(session, arrangement_id=arrangement_id, bob_verifying_key=bob_verifying_key)
+        return query.all()
+
+    def iter_workorders(self,
+                        arrangement_id: bytes = None,
+                        bob_verifying_key: bytes = None,
+                        page_size: int = 1000,
+                        session=None
+                        ) -> Iterator[Workorder]:
+        """
+        Yields Workorders in insertion order, loading at most `page_size` records at a time.
+        """
+        self.workorder_ledger.flush()
+        session = session or self._session_on_init_thread
+        query = self._workorders_query(session, arrangement_id=arrangement_id, bob_verifying_key=bob_verifying_key)
+
+        # Keyset pagination: each page starts after the last id seen, so deep pages stay cheap.
+        last_id = 0
+        while True:
+            page = query.filter(Workorder.id > last_id).order_by(Workorder.id).limit(page_size).all()
+            yield from page
+            if len(page) < page_size:
+                return
+            last_id = page[-1].id
+
+    def count_workorders(self, arrangement_id: bytes = None, bob_verifying_key: bytes = None, session=None) -> int:
+        """
+        Returns the number of Workorders by HRAC, counted by the database.
+        """
+        self.workorder_ledger.flush()
+        session = session or self._session_on_init_thread
+        try:
+            query = self._workorders_query(session, arrangement_id=arrangement_id, bob_verifying_key=bob_verifying_key)
+        except NotFound:
+            return 0
+        return query.with_entities(func.count(Workorder.id)).scalar()
+
+    def del_workorders(self, arrangement_id: bytes, session=None):
+        """
+        Deletes a Workorder from the Keystore.
+        """
+        self.workorder_ledger.flush()
+        session = session or self._session_on_init_thread
+
+        workorders = session.query(Workorder).filter_by(arrangement_id=arrangement_id)
+        deleted = workorders.delete()
+        session.commit()
+
+        return deleted
 
-        if not arrangement_id and not bob_verifying_key:
-            workorders = query.all()  # Return all records
+    def save_treasure_map(self, map_id: bytes, payload: bytes, digest: bytes, expiration: datetime, session=None) -> None:
+        """
+        Adds a TreasureMap's payload to the Keystore, replacing any map previously stored under the same ID.
+        """
+        session = session or self._session_on_init_thread
 
-        else:
+        session.merge(TreasureMapRecord(id=map_id, payload=payload, digest=digest, expiration=expiration))
+        session.commit()
 
-            # Return arrangement records
-            if arrangement_id:
-                workorders = query.filter_by(arrangement_id=arrangement_id)
+    def get_treasure_map(self, map_id: bytes, session=None) -> TreasureMapRecord:
+        """
+        Returns the stored TreasureMap record by its ID.
+        """
+        session = session or self._session_on_init_thread
 
-            # Return records for Bob
-            else:
-                fingerprint = fingerprint_from_key(bob_verifying_key)
-                key = session.query(Key).filter_by(fingerprint=fingerprint).first()
-                workorders = query.filter_by(bob_verifying_key_id=key.id)
+        record = session.query(TreasureMapRecord).filter_by(id=map_id).first()
+        if not record:
+            raise NotFound("No TreasureMap {} found.".format(map_id.hex()))
+        return record
+
+    def get_treasure_map_digest(self, map_id: bytes, session=None) -> Tuple[bytes, datetime]:
+        """
+        Returns the payload digest and expiration of a stored TreasureMap, without loading its payload.
+        """
+        session = session or self._session_on_init_thread
 
-            if not workorders:
-                raise NotFound
+        row = session.query(TreasureMapRecord.digest, TreasureMapRecord.expiration).filter_by(id=map_id).first()
+        if not row:
+            raise NotFound("No TreasureMap {} found.".format(map_id.hex()))
+        return row
 
-        return list(workorders)
+    def count_treasure_maps(self, session=None) -> int:
+        session = session or self._session_on_init_thread
+        return session.query(func.count(TreasureMapRecord.id)).scalar()
 
-    def del_workorders(self, arrangement_id: bytes, session=None):
+    def del_expired_treasure_maps(self, now: datetime = None, limit: int = 500, session=None) -> int:
         """
-        Deletes a Workorder from the Keystore.
+        Deletes up to `limit` TreasureMaps that expired before `now`.
         """
+        now = now or datetime.utcnow()
         session = session or self._session_on_init_thread
 
-        workorders = session.query(Workorder).filter_by(arrangement_id=arrangement_id)
-        deleted = workorders.delete()
-        session.commit()
+        expired = session.query(TreasureMapRecord.id).filter(TreasureMapRecord.expiration < now).limit(limit).all()
+        map_ids = [map_id for map_id, in expired]
+        if not map_ids:
+            return 0
 
+        deleted = session.query(TreasureMapRecord).filter(
+            TreasureMapRecord.id.in_(map_ids)).delete(synchronize_session=False)
+        session.commit()
         return deleted
@@ -0,0 +1,179 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import atexit
+import time
+from datetime import datetime
+from threading import Condition, Lock, Thread
+from typing import List, Set, Tuple
+
+from twisted.logger import Logger
+
+from nucypher.keystore.threading import session_registry
+
+Receipt = Tuple[bytes, bytes, bytes, datetime]  # (bob_verifying_key, bob_signature, arrangement_id, created_at)
+
+
+class WorkOrderLedger:
+    """
+    Append-only buffer of work order receipts that are group-committed to the datastore
+    by a background thread, keeping SQLite commits off the re-encryption request path.
+
+    Receipts are written once `flush_size` of them are pending, or `flush_interval`
+    seconds after the first one arrives, whichever is sooner.  Readers call `flush`
+    first so they always see every receipt recorded so far; the flush runs on the reader's
+    own thread and may wait for a commit, so work orders shouldn't be read on the reactor thread.
+
+    Since receipts reach the database late, work orders being served (or whose receipts are
+    still pending) `reserve` their receipt signature here, so a replay is caught before it's committed.
+    """
+
+    DEFAULT_FLUSH_INTERVAL = 0.1  # seconds
+    DEFAULT_FLUSH_SIZE = 100
+
+    def __init__(self,
+                 datastore,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 flush_size: int = DEFAULT_FLUSH_SIZE):
+        self.log = Logger(self.__class__.__name__)
+        self.datastore = datastore
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self._pending = list()  # type: List[Receipt]
+        self._reserved = set()  # type: Set[bytes]
+        self._condition = Condition()
+        self._flush_lock = Lock()
+        self._flusher = None
+        self._stopped = False
+
+        self.flushes = 0
+        self.flushed = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._flusher is not None and self._flusher.is_alive()
+
+    def reserve(self, bob_signature: bytes) -> bool:
+        """
+        Claims a receipt signature for a work order about to be served.  Returns False if it's claimed
+        already, i.e. it's being served or its receipt isn't committed yet.  The claim is released
+        once its receipt is committed, or by `release` if the work order isn't served after all.
+        """
+        with self._condition:
+            if bob_signature in self._reserved:
+                return False
+            self._reserved.add(bob_signature)
+            return True
+
+    def release(self, bob_signature: bytes) -> None:
+        with self._condition:
+            self._reserved.discard(bob_signature)
+
+    def append(self, bob_verifying_key: bytes, bob_signature: bytes, arrangement_id: bytes) -> None:
+        receipt = (bob_verifying_key, bob_signature, arrangement_id, datetime.utcnow())
+        with self._condition:
+            if self._stopped:
+                stopped = True
+            else:
+                stopped = False
+                self._pending.append(receipt)
+                if self._flusher is None:
+                    self.start()
+                pending = len(self._pending)
+                if pending == 1 or pending >= self.flush_size:
+                    self._condition.notify()
+
+        if stopped:
+            # Late receipt after shutdown began; write it through.
+            self._write([receipt])
+            self.release(bob_signature)
+
+    def start(self) -> None:
+        with self._condition:
+            if self._flusher is not None:
+                return
+            self._flusher = Thread(target=self._run, name='workorder-ledger', daemon=True)
+            self._flusher.start()
+            atexit.register(self.stop)  # Once per ledger, since it's only started once
+
+    def stop(self) -> None:
+        """Stops the background flusher, writing every pending receipt first."""
+        atexit.unregister(self.stop)  # Don't keep a stopped ledger (and its datastore) alive until exit
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._flusher is not None and self._flusher.is_alive():
+            self._flusher.join()
+        self.flush()
+
+    def flush(self) -> int:
+        """Commits all pending receipts in a single transaction; returns how many were written."""
+        with self._flush_lock:
+            with self._condition:
+                receipts, self._pending = self._pending, list()
+            if not receipts:
+                return 0
+            self._write(receipts)
+            with self._condition:
+                # Committed (or dropped as duplicates): the database catches any replay from now on.
+                self._reserved.difference_update(bob_signature for _key, bob_signature, *_ in receipts)
+            self.flushes += 1
+            self.flushed += len(receipts)
+            return len(receipts)
+
+    def _write(self, receipts: List[Receipt]) -> None:
+        session = session_registry(self.datastore.engine).session_factory()
+        try:
+            try:
+                self.datastore.save_workorders(receipts, session=session)
+            except Exception as e:
+                # One bad receipt (e.g. a replayed signature) shouldn't cost the rest of the batch.
+                session.rollback()
+                self.log.warn(f"Failed to commit {len(receipts)} work order receipts together ({e}); "
+                              f"retrying individually.")
+                for receipt in receipts:
+                    try:
+                        self.datastore.save_workorders([receipt], session=session)
+                    except Exception as e:
+                        session.rollback()
+                        self.log.warn(f"Dropping work order receipt for arrangement {receipt[2]}: {e}")
+        finally:
+            session.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                deadline = time.monotonic() + self.flush_interval
+                while not self._stopped and len(self._pending) < self.flush_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(timeout=remaining)
+                stopping = self._stopped
+            try:
+                self.flush()
+            except Exception as e:
+                self.log.critical(f"Work order ledger failed to flush: {e}")
+            if stopping:
+                return
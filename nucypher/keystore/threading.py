@@ -14,8 +14,26 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
+from threading import Lock
+from weakref import WeakKeyDictionary
+
 from sqlalchemy.orm import sessionmaker, scoped_session
 
+# One thread-local session registry per engine, shared by every ThreadedSession.
+_session_registries = WeakKeyDictionary()
+_session_registries_lock = Lock()
+
+
+def session_registry(sqlalchemy_engine) -> scoped_session:
+    """Returns the thread-local session registry for this engine, creating it on first use."""
+    with _session_registries_lock:
+        try:
+            return _session_registries[sqlalchemy_engine]
+        except KeyError:
+            registry = scoped_session(sessionmaker(bind=sqlalchemy_engine))
+            _session_registries[sqlalchemy_engine] = registry
+            return registry
+
 
 class ThreadedSession:
 
@@ -23,9 +41,9 @@ class ThreadedSession:
         self.engine = sqlalchemy_engine
 
     def __enter__(self):
-        session_factory = sessionmaker(bind=self.engine)
-        self.session = scoped_session(session_factory)
+        self.session = session_registry(self.engine)
         return self.session
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.remove()
\ No newline at end of file
+        # Closes this thread's session, returning its connection to the engine's pool.
+        self.session.remove()
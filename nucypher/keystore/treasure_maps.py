@@ -0,0 +1,167 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from collections import OrderedDict
+from contextlib import closing
+from datetime import datetime, timedelta
+from threading import RLock
+from typing import Optional, Tuple
+
+from twisted.logger import Logger
+
+from nucypher.crypto.api import keccak_digest
+from nucypher.keystore.keystore import NotFound
+from nucypher.keystore.threading import session_registry
+
+
+class TreasureMapStore:
+    """
+    TreasureMaps published to this node, persisted in the node's datastore.
+
+    Maps are kept as the exact bytes Alice sent, so they can be served without re-serializing.
+    Recently used payloads are held in an in-memory LRU bounded by `cache_bytes`; everything
+    else stays on disk, so memory use doesn't grow with the number of maps stored.
+    Each map expires `ttl` after it was last published and is then removed by the datastore collector.
+    """
+
+    DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+    DEFAULT_TTL = timedelta(days=365)
+
+    def __init__(self, datastore, cache_bytes: int = DEFAULT_CACHE_BYTES, ttl: timedelta = DEFAULT_TTL):
+        self.log = Logger(self.__class__.__name__)
+        self.datastore = datastore
+        self.cache_bytes = cache_bytes
+        self.ttl = ttl
+
+        self.__cache = OrderedDict()  # map ID -> (payload, digest, expiration)
+        self.__cached_bytes = 0
+        self.__lock = RLock()
+
+        self.duplicates = 0
+
+    def __len__(self) -> int:
+        with self.__session() as session:
+            return self.datastore.count_treasure_maps(session=session)
+
+    def __contains__(self, map_id: bytes) -> bool:
+        try:
+            self.get_bytes(map_id)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, map_id: bytes) -> 'TreasureMap':
+        from nucypher.policy.collections import TreasureMap  # Avoid circular import
+        return TreasureMap.from_bytes(self.get_bytes(map_id), verify=False)
+
+    def __setitem__(self, map_id: bytes, treasure_map: 'TreasureMap') -> None:
+        self.store(map_id, bytes(treasure_map))
+
+    def __session(self):
+        return closing(session_registry(self.datastore.engine).session_factory())
+
+    def __remember(self, map_id: bytes, payload: bytes, digest: bytes, expiration: datetime) -> None:
+        with self.__lock:
+            previous = self.__cache.pop(map_id, None)
+            if previous:
+                self.__cached_bytes -= len(previous[0])
+            if len(payload) > self.cache_bytes:
+                return
+            self.__cache[map_id] = (payload, digest, expiration)
+            self.__cached_bytes += len(payload)
+            while self.__cached_bytes > self.cache_bytes:
+                _map_id, (evicted_payload, *_) = self.__cache.popitem(last=False)
+                self.__cached_bytes -= len(evicted_payload)
+
+    def __forget(self, map_id: bytes) -> None:
+        with self.__lock:
+            previous = self.__cache.pop(map_id, None)
+            if previous:
+                self.__cached_bytes -= len(previous[0])
+
+    def get_cached_bytes(self, map_id: bytes) -> Optional[bytes]:
+        """Returns the bytes of an unexpired map if they are in memory, without touching the datastore."""
+        now = datetime.utcnow()
+        with self.__lock:
+            cached = self.__cache.get(map_id)
+            if cached:
+                payload, _digest, expiration = cached
+                if expiration > now:
+                    self.__cache.move_to_end(map_id)
+                    return payload
+                self.__forget(map_id)
+        return None
+
+    def get_bytes(self, map_id: bytes) -> bytes:
+        """Returns the stored bytes of an unexpired map; raises KeyError otherwise."""
+        payload = self.get_cached_bytes(map_id)
+        if payload is not None:
+            return payload
+
+        now = datetime.utcnow()
+        with self.__session() as session:
+            try:
+                record = self.datastore.get_treasure_map(map_id, session=session)
+            except NotFound:
+                raise KeyError(map_id)
+            payload, digest, expiration = record.payload, record.digest, record.expiration
+
+        if expiration <= now:
+            raise KeyError(map_id)
+        self.__remember(map_id, payload, digest, expiration)
+        return payload
+
+    def __stored_digest(self, map_id: bytes) -> Tuple[bytes, datetime]:
+        with self.__lock:
+            cached = self.__cache.get(map_id)
+            if cached:
+                _payload, digest, expiration = cached
+                return digest, expiration
+        with self.__session() as session:
+            try:
+                return tuple(self.datastore.get_treasure_map_digest(map_id, session=session))
+            except NotFound:
+                return None, None
+
+    def store(self, map_id: bytes, payload: bytes) -> bool:
+        """
+        Stores a map's bytes under its ID.  Returns False, without writing, if the very same map
+        is already stored and unexpired (e.g. Alice republishing it); see #341.
+        """
+        digest = keccak_digest(payload)
+        now = datetime.utcnow()
+
+        stored_digest, stored_expiration = self.__stored_digest(map_id)
+        if stored_digest == digest and stored_expiration > now:
+            self.duplicates += 1
+            return False
+
+        if stored_digest is not None:
+            self.log.info(f"Replacing stored TreasureMap {map_id.hex()} with a newly published one.")
+
+        expiration = now + self.ttl
+        with self.__session() as session:
+            self.datastore.save_treasure_map(map_id, payload=payload, digest=digest, expiration=expiration, session=session)
+        self.__remember(map_id, payload, digest, expiration)
+        return True
+
+    def clear_cache(self) -> None:
+        with self.__lock:
+            self.__cache.clear()
+            self.__cached_bytes = 0
+
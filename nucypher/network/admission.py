@@ -0,0 +1,186 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import math
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Condition, Lock
+from typing import Hashable
+
+from twisted.logger import Logger
+
+# Request priorities; lower values are admitted first.
+REENCRYPTION = 0
+TREASURE_MAP = 1
+GOSSIP = 2
+
+PRIORITY_NAMES = {REENCRYPTION: 'reencryption', TREASURE_MAP: 'treasure_map', GOSSIP: 'gossip'}
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, and bursts of up to `burst` requests."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self, now: float) -> float:
+        """Takes a token if one is available and returns 0; otherwise returns the seconds until one will be."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Admission control for Ursula's expensive REST routes.
+
+    Each client (its remote address; nothing else about a request is known to be genuine before
+    it's admitted) is rate limited by a token bucket, unless `client_rate` is 0 or None.
+    At most `max_in_flight` admitted requests are served at once; beyond that, requests wait
+    up to `queue_timeout` seconds in a queue of at most `max_queued`, and a free slot always goes
+    to the waiting request with the best priority, so re-encryption is served ahead of gossip.
+    Requests that can't be admitted are refused with a suggested retry delay.
+
+    A waiting request holds the thread serving it (for the Flask app, a WSGI thread), so Ursula
+    only turns admission control on when it's configured.
+    """
+
+    DEFAULT_MAX_IN_FLIGHT = 8
+    DEFAULT_MAX_QUEUED = 64
+    DEFAULT_QUEUE_TIMEOUT = 2.0  # seconds
+    DEFAULT_CLIENT_RATE = 50  # requests per second
+    DEFAULT_CLIENT_BURST = 100
+    MAX_TRACKED_CLIENTS = 10000
+
+    class Rejected(Exception):
+        status = 503
+
+        def __init__(self, retry_after: float, *args):
+            super().__init__(*args)
+            self.retry_after = retry_after
+
+    class RateLimited(Rejected):
+        status = 429
+
+    class Overloaded(Rejected):
+        status = 503
+
+    def __init__(self,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 max_queued: int = DEFAULT_MAX_QUEUED,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+                 client_rate: float = DEFAULT_CLIENT_RATE,
+                 client_burst: int = DEFAULT_CLIENT_BURST):
+
+        self.log = Logger(self.__class__.__name__)
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+
+        self.__buckets = OrderedDict()  # client key -> TokenBucket, least recently seen first
+        self.__buckets_lock = Lock()
+        self.__condition = Condition()
+        self.__waiting = {priority: 0 for priority in PRIORITY_NAMES}
+        self.in_flight = 0
+
+        self.admitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.queued = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.rejected = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.rate_limited = {name: 0 for name in PRIORITY_NAMES.values()}
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(self.__waiting.values())
+
+    def __check_rate(self, client: Hashable, priority: int) -> None:
+        if not self.client_rate or client is None:
+            return
+        now = time.monotonic()
+        with self.__buckets_lock:
+            bucket = self.__buckets.pop(client, None) or TokenBucket(rate=self.client_rate, burst=self.client_burst)
+            self.__buckets[client] = bucket
+            while len(self.__buckets) > self.MAX_TRACKED_CLIENTS:
+                self.__buckets.popitem(last=False)
+            wait = bucket.take(now)
+        if wait:
+            self.rate_limited[PRIORITY_NAMES[priority]] += 1
+            raise self.RateLimited(wait, f"Client exceeded {self.client_rate} requests per second")
+
+    def __ahead_of(self, priority: int) -> int:
+        return sum(count for p, count in self.__waiting.items() if p < priority)
+
+    def acquire(self, client: Hashable, priority: int, timeout: float = None) -> None:
+        """
+        Blocks until the request may be served, for at most `timeout` seconds (`queue_timeout` by default).
+        Raises RateLimited or Overloaded if it may not; otherwise the caller must `release` when done.
+        """
+        name = PRIORITY_NAMES[priority]
+        self.__check_rate(client, priority)
+        timeout = self.queue_timeout if timeout is None else timeout
+
+        with self.__condition:
+            if self.in_flight < self.max_in_flight and not self.__ahead_of(priority + 1):
+                self.in_flight += 1
+                self.admitted[name] += 1
+                return
+
+            if timeout <= 0 or self.queue_depth >= self.max_queued:
+                self.rejected[name] += 1
+                raise self.Overloaded(self.retry_after, f"{self.in_flight} requests in flight")
+
+            self.queued[name] += 1
+            self.__waiting[priority] += 1
+            deadline = time.monotonic() + timeout
+            try:
+                while self.in_flight >= self.max_in_flight or self.__ahead_of(priority):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected[name] += 1
+                        raise self.Overloaded(self.retry_after, f"Timed out after queueing for {timeout} seconds")
+                    self.__condition.wait(remaining)
+            finally:
+                self.__waiting[priority] -= 1
+            self.in_flight += 1
+            self.admitted[name] += 1
+
+    def release(self) -> None:
+        with self.__condition:
+            self.in_flight -= 1
+            self.__condition.notify_all()
+
+    @contextmanager
+    def admit(self, client: Hashable, priority: int, timeout: float = None):
+        self.acquire(client=client, priority=priority, timeout=timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def retry_after(self) -> int:
+        """Whole seconds a refused client should wait, growing with the backlog."""
+        return max(1, math.ceil(self.queue_timeout * (1 + self.queue_depth / max(self.max_in_flight, 1))))
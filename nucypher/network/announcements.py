@@ -0,0 +1,208 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import atexit
+from collections import OrderedDict
+from threading import Condition, Thread
+from typing import List
+
+from hendrix.experience import crosstown_traffic
+from twisted.internet import reactor
+from twisted.logger import Logger
+
+from nucypher.config.storages import ForgetfulNodeStorage
+from nucypher.network.exceptions import NodeSeemsToBeDown
+
+
+class AnnouncementVerifier:
+    """
+    Verifies nodes announced to this node via REST, and remembers the ones that check out.
+
+    Verifying a stranger includes a blocking HTTPS call back to it, so once started, announcements
+    are pushed into a queue of at most `max_pending` nodes that is drained by `workers` threads.
+    Announcements are deduplicated by checksum address and timestamp: a node that's already known,
+    queued or being verified with the same or a newer timestamp is skipped, and a newer announcement
+    replaces a queued older one.  When the queue is full, further announcements are dropped; the
+    announcing nodes will present themselves again on their next round of learning.
+
+    Until `start` is called, each announcement is verified as a crosstown task of the request instead.
+    Once started, the workers are stopped when the reactor shuts down (or, failing that, at exit).
+    """
+
+    DEFAULT_WORKERS = 4
+    DEFAULT_MAX_PENDING = 1000
+
+    def __init__(self, node, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.log = Logger(self.__class__.__name__)
+        self.node = node
+        self.workers = workers
+        self.max_pending = max_pending
+
+        self.__pending = OrderedDict()  # checksum address -> sprout, oldest announcement first
+        self.__in_progress = dict()  # checksum address -> timestamp
+        self.__condition = Condition()
+        self.__threads = list()
+        self.__stopped = False
+        self.__scratch_storage = ForgetfulNodeStorage(federated_only=node.federated_only)
+
+        self.queued = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.verified = 0
+        self.failed = 0  # Including nodes that turned out to be known by the time they were verified
+
+    @property
+    def running(self) -> bool:
+        return bool(self.__threads) and not self.__stopped
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.__pending)
+
+    def start(self) -> None:
+        with self.__condition:
+            if self.__threads:
+                return
+            for index in range(self.workers):
+                thread = Thread(target=self._run, name=f'announcement-verifier-{index}', daemon=True)
+                self.__threads.append(thread)
+                thread.start()
+            reactor.addSystemEventTrigger('before', 'shutdown', self.stop)
+            atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Stops the workers once they finish the verifications in progress; queued announcements are discarded."""
+        with self.__condition:
+            self.__stopped = True
+            self.__pending.clear()
+            self.__condition.notify_all()
+        atexit.unregister(self.stop)
+        for thread in self.__threads:
+            if thread.is_alive():
+                thread.join()
+
+    def __is_news(self, node) -> bool:
+        """Whether this announcement is newer than anything known, queued or being verified for its address."""
+        address = node.checksum_address
+        if address in self.node.known_nodes:
+            if node.timestamp <= self.node.known_nodes[address].timestamp:
+                return False
+        for timestamp in (self.__in_progress.get(address), getattr(self.__pending.get(address), 'timestamp', None)):
+            if timestamp is not None and node.timestamp <= timestamp:
+                return False
+        return True
+
+    def announce(self, nodes: List) -> int:
+        """Schedules verification of announced nodes; returns how many were scheduled."""
+        if not self.running:
+            for node in nodes:
+                @crosstown_traffic()
+                def learn_about_announced_node(node=node):
+                    self.verify(node)
+            return len(nodes)
+
+        scheduled = dropped = 0
+        with self.__condition:
+            for node in nodes:
+                if not self.__is_news(node):
+                    self.duplicates += 1
+                    continue
+                if node.checksum_address in self.__pending:
+                    self.__pending[node.checksum_address] = node  # Keeps its place in line
+                    self.duplicates += 1
+                    continue
+                if len(self.__pending) >= self.max_pending:
+                    dropped += 1
+                    continue
+                self.__pending[node.checksum_address] = node
+                self.queued += 1
+                scheduled += 1
+            if scheduled:
+                self.__condition.notify(scheduled)
+            self.dropped += dropped
+        if dropped:
+            self.log.warn(f"Verification queue is full; dropped {dropped} announced nodes.")
+        return scheduled
+
+    def verify(self, node) -> bool:
+        """Verifies an announced node and remembers it if it checks out; returns whether it did."""
+        # TODO: This logic is basically repeated in learn_from_teacher_node and remember_node.
+        # Let's find a better way.  #555
+        if node in self.node.known_nodes:
+            if node.timestamp <= self.node.known_nodes[node.checksum_address].timestamp:
+                return False
+
+        node.mature()
+
+        try:
+            node.verify_node(self.node.network_middleware.client,
+                             registry=self.node.registry,
+                             )
+
+        # Suspicion
+        except node.SuspiciousActivity as e:
+            # TODO: Include data about caller?
+            # TODO: Account for possibility that stamp, rather than interface, was bad.
+            # TODO: Maybe also record the bytes representation separately to disk?
+            message = f"Suspicious Activity about {node}: {str(e)}.  Announced via REST."
+            self.log.warn(message)
+            self.node.suspicious_activities_witnessed['vladimirs'].append(node)
+            return False
+        except NodeSeemsToBeDown as e:
+            # This is a rather odd situation - this node *just* contacted us and asked to be verified.  Where'd it go?  Maybe a NAT problem?
+            self.log.info(f"Node announced itself to us just now, but seems to be down: {node}.  Response was {e}.")
+            self.log.debug(f"Phantom node certificate: {node.certificate}")
+            return False
+        # Async Sentinel
+        except Exception as e:
+            self.log.critical(f"This exception really needs to be handled differently: {e}")
+            raise
+
+        # Believable
+        else:
+            self.log.info("Learned about previously unknown node: {}".format(node))
+            self.node.remember_node(node)
+            # TODO: Record new fleet state
+            return True
+
+        # Cleanup
+        finally:
+            self.__scratch_storage.forget()
+
+    def _run(self) -> None:
+        while True:
+            with self.__condition:
+                while not self.__pending and not self.__stopped:
+                    self.__condition.wait()
+                if self.__stopped:
+                    return
+                address, node = self.__pending.popitem(last=False)
+                self.__in_progress[address] = node.timestamp
+
+            verified = False
+            try:
+                verified = self.verify(node)
+            except Exception:
+                pass  # Counted as a failure
+            finally:
+                with self.__condition:
+                    self.__in_progress.pop(address, None)
+                    if verified:
+                        self.verified += 1
+                    else:
+                        self.failed += 1
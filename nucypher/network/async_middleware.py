@@ -0,0 +1,229 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+from io import BytesIO
+from urllib.parse import urlencode
+
+from OpenSSL import SSL
+from constant_sorrow.constants import CERTIFICATE_NOT_SAVED, EXEMPT_FROM_VERIFICATION
+from twisted.internet import defer, reactor
+from twisted.internet.ssl import Certificate, optionsForClientTLS
+from twisted.web.client import (Agent,
+                                BrowserLikePolicyForHTTPS,
+                                FileBodyProducer,
+                                HTTPConnectionPool,
+                                ResponseNeverReceived,
+                                readBody)
+from twisted.web.http_headers import Headers
+from twisted.web.iweb import IPolicyForHTTPS
+from zope.interface import implementer
+
+from nucypher.network.middleware import NotFound, RestMiddleware, UnexpectedResponse
+
+
+@implementer(IPolicyForHTTPS)
+class PinnedCertificatePolicy:
+    """Trusts exactly one certificate: the one saved for the node being contacted."""
+
+    def __init__(self, certificate_filepath: str):
+        with open(certificate_filepath, 'rb') as certificate_file:
+            self.certificate = Certificate.loadPEM(certificate_file.read())
+
+    def creatorForNetloc(self, hostname: bytes, port: int):
+        return optionsForClientTLS(hostname.decode(), trustRoot=self.certificate)
+
+
+class AsyncResponse:
+    """The parts of a `requests.Response` that the middleware and its callers use."""
+
+    def __init__(self, status_code: int, content: bytes, headers: dict):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+
+class AsyncNucypherMiddlewareClient:
+    """
+    Non-blocking counterpart of NucypherMiddlewareClient: the same `get`, `post`, `delete` (etc.)
+    surface, but requests are made with a Twisted Agent and return Deferreds that fire with an
+    AsyncResponse, or fail with NotFound or UnexpectedResponse.
+
+    Nodes are verified with `verify_node_async` before they're contacted, and every connection is
+    pinned to the certificate saved for its node.  Connections are kept alive, with a separate
+    pool per certificate, so a connection is never reused with a certificate it wasn't verified against.
+    """
+
+    timeout = 1.2
+    MAX_PERSISTENT_PER_HOST = 4
+    CACHED_CONNECTION_TIMEOUT = 30  # seconds
+
+    def __init__(self, reactor=reactor):
+        self.reactor = reactor
+        self.__agents = dict()  # certificate filepath -> (Agent, HTTPConnectionPool)
+
+    def agent_for(self, certificate_filepath) -> Agent:
+        try:
+            agent, _pool = self.__agents[certificate_filepath]
+        except KeyError:
+            pool = HTTPConnectionPool(self.reactor, persistent=True)
+            pool.maxPersistentPerHost = self.MAX_PERSISTENT_PER_HOST
+            pool.cachedConnectionTimeout = self.CACHED_CONNECTION_TIMEOUT
+            if certificate_filepath is CERTIFICATE_NOT_SAVED:
+                policy = BrowserLikePolicyForHTTPS()
+            else:
+                policy = PinnedCertificatePolicy(certificate_filepath)
+            agent = Agent(self.reactor, contextFactory=policy, pool=pool)
+            self.__agents[certificate_filepath] = (agent, pool)
+        return agent
+
+    def close(self) -> defer.Deferred:
+        """Closes every kept-alive connection."""
+        agents, self.__agents = self.__agents, dict()
+        return defer.DeferredList([pool.closeCachedConnections() for _agent, pool in agents.values()])
+
+    @staticmethod
+    def response_cleaner(response):
+        return response
+
+    def verify_node(self, node_or_sprout) -> defer.Deferred:
+        if node_or_sprout and node_or_sprout is not EXEMPT_FROM_VERIFICATION:
+            node_or_sprout.mature()  # Morph into a node.
+            return node_or_sprout.verify_node_async(network_middleware_client=self)
+        return defer.succeed(True)
+
+    def parse_node_or_host_and_port(self, node, host, port):
+        if node:
+            if any((host, port)):
+                raise ValueError("Don't pass host and port if you are passing the node.")
+            host = node.rest_url()
+            certificate_filepath = node.certificate_filepath
+        elif all((host, port)):
+            host = f"{host}:{port}"
+            certificate_filepath = CERTIFICATE_NOT_SAVED
+        else:
+            raise ValueError("You need to pass either the node or a host and port.")
+
+        return host, certificate_filepath, None  # The agent depends on the certificate finally used
+
+    def invoke_method(self, method: str, url: str, http_client=None, verify=None, params=None, data=None, timeout=None):
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        body = FileBodyProducer(BytesIO(data)) if data is not None else None
+        d = self.agent_for(verify).request(method.upper().encode(), url.encode(), Headers(), body)
+
+        def read(response):
+            body_read = readBody(response)
+            headers = {name.decode(): values[-1].decode() for name, values in response.headers.getAllRawHeaders()}
+            body_read.addCallback(lambda content: AsyncResponse(response.code, content, headers))
+            return body_read
+
+        d.addCallback(read)
+        timeout = timeout or self.timeout
+        if timeout:
+            d.addTimeout(timeout, self.reactor)
+        return d
+
+    def node_information(self, host, port, certificate_filepath=None):
+        # The only time a node is exempt from verification - when we are first getting its info.
+        d = self.get(node_or_sprout=EXEMPT_FROM_VERIFICATION,
+                     host=host, port=port,
+                     path="public_information",
+                     timeout=2,
+                     certificate_filepath=certificate_filepath)
+        d.addCallback(lambda response: response.content)
+        return d
+
+    def __getattr__(self, method_name):
+        # Quick sanity check.
+        if method_name not in ("post", "get", "put", "patch", "delete"):
+            raise TypeError(
+                f"This client is for HTTP only - you need to use a real HTTP verb, not '{method_name}'.")
+
+        def method_wrapper(path,
+                           node_or_sprout=None,
+                           host=None,
+                           port=None,
+                           certificate_filepath=None,
+                           **kwargs):
+
+            def send(_verified):
+                parsed_host, node_certificate_filepath, http_client = self.parse_node_or_host_and_port(node_or_sprout,
+                                                                                                       host, port)
+                if certificate_filepath:
+                    filepaths_are_different = node_certificate_filepath != certificate_filepath
+                    node_has_a_cert = node_certificate_filepath is not CERTIFICATE_NOT_SAVED
+                    if node_has_a_cert and filepaths_are_different:
+                        raise ValueError("Don't try to pass a node with a certificate_filepath while also passing a"
+                                         " different certificate_filepath.  What do you even expect?")
+                    verify = certificate_filepath
+                else:
+                    verify = node_certificate_filepath
+
+                url = f"https://{parsed_host}/{path}"
+                return self.invoke_method(method_name, url, http_client, verify=verify, **kwargs)
+
+            def check(response):
+                cleaned_response = self.response_cleaner(response)
+                if cleaned_response.status_code >= 300:
+                    if cleaned_response.status_code == 404:
+                        m = f"While trying to {method_name} {path} ({kwargs}), server 404'd.  Response: {cleaned_response.content}"
+                        raise NotFound(m)
+                    else:
+                        m = f"Unexpected response while trying to {method_name} {path},{kwargs}: {cleaned_response.status_code} {cleaned_response.content}"
+                        raise UnexpectedResponse(m)
+                return cleaned_response
+
+            def tls_failed(failure):
+                if failure.check(ResponseNeverReceived) and any(reason.check(SSL.Error) for reason in failure.value.reasons):
+                    if node_or_sprout and node_or_sprout is not EXEMPT_FROM_VERIFICATION:
+                        # The node no longer presents the certificate it was verified with.
+                        node_or_sprout.forget_verification()
+                return failure
+
+            d = self.verify_node(node_or_sprout)
+            d.addCallback(send)
+            d.addCallbacks(check, tls_failed)
+            return d
+
+        return method_wrapper
+
+    def __len__(self):
+        return 0  # Workaround so debuggers can represent objects of this class despite the unusual __getattr__.
+
+
+class AsyncRestMiddleware(RestMiddleware):
+    """
+    RestMiddleware whose network methods return Deferreds instead of blocking, so that fan-out
+    operations (publishing a TreasureMap, sending work orders, learning from many teachers)
+    can all be in flight on the reactor at once.
+    """
+
+    _client_class = AsyncNucypherMiddlewareClient
+
+    def enact_policy(self, ursula, kfrag_id, payload):
+        d = self.client.post(node_or_sprout=ursula,
+                             path=f'kFrag/{kfrag_id.hex()}',
+                             data=payload,
+                             timeout=2)
+        d.addCallback(lambda _response: (True, ursula.stamp.as_umbral_pubkey()))
+        return d
+
+    def reencrypt(self, work_order):
+        d = self.send_work_order_payload_to_ursula(work_order)
+        d.addCallback(self.split_cfrags_and_signatures)
+        return d
@@ -0,0 +1,345 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import binascii
+import math
+import multiprocessing
+import re
+from multiprocessing.pool import Pool
+from typing import Callable, List, Tuple
+
+from bytestring_splitter import VariableLengthBytestring
+from constant_sorrow.constants import FLEET_STATES_MATCH, NO_KNOWN_NODES
+from OpenSSL.SSL import TLSv1_2_METHOD
+from OpenSSL.crypto import X509
+from hendrix.facilities.services import ExistingKeyTLSContextFactory
+from twisted.internet import defer, reactor
+from twisted.internet.threads import deferToThreadPool
+from twisted.logger import Logger
+from twisted.python.failure import Failure
+from twisted.web.resource import Resource
+from twisted.web.server import NOT_DONE_YET, Site
+from twisted.web.wsgi import WSGIResource
+from umbral import pre
+from umbral.config import default_params
+from umbral.keys import UmbralPublicKey
+from umbral.kfrags import KFrag
+from umbral.pre import Capsule
+
+from nucypher.crypto.utils import canonical_address_from_umbral_key
+from nucypher.keystore.keystore import NotFound
+from nucypher.keystore.threading import ThreadedSession
+from nucypher.network.admission import AdmissionController, REENCRYPTION
+
+OCTET_STREAM = {b'Content-Type': b'application/octet-stream'}
+
+HTTPResult = Tuple[int, dict, bytes]  # (status, headers, body)
+
+NOT_HANDLED = object()  # Returned by a route to hand the request to the Flask app instead
+
+
+class WorkOrderReplayed(Exception):
+    """Raised when a Work Order that was already served (or is being served) comes again."""
+
+
+def reencrypt_capsules(kfrag_bytes: bytes,
+                       alice_verifying_key_bytes: bytes,
+                       capsules_and_metadata: List[Tuple[bytes, bytes]]
+                       ) -> List[bytes]:
+    """
+    Re-encrypts each capsule with the KFrag, returning serialized CFrags.
+    Takes and returns only bytes, so it can run in a worker process.
+    """
+    kfrag = KFrag.from_bytes(kfrag_bytes)
+    alice_verifying_key = UmbralPublicKey.from_bytes(alice_verifying_key_bytes)
+
+    cfrags = list()
+    for capsule_bytes, metadata in capsules_and_metadata:
+        capsule = Capsule.from_bytes(capsule_bytes, default_params())
+        capsule.set_correctness_keys(verifying=alice_verifying_key)
+        cfrags.append(bytes(pre.reencrypt(kfrag, capsule, metadata=metadata)))
+    return cfrags
+
+
+# Worker processes are never forked from this one, which runs the (multithreaded) reactor and the ledger.
+REENCRYPTION_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def apply_in_pool(pool: Pool, f: Callable, *args) -> defer.Deferred:
+    """Runs `f` in a multiprocessing Pool, firing a Deferred on the reactor thread when it's done."""
+    d = defer.Deferred()
+    pool.apply_async(f, args,
+                     callback=lambda result: reactor.callFromThread(d.callback, result),
+                     error_callback=lambda error: reactor.callFromThread(d.errback, Failure(error)))
+    return d
+
+
+class UrsulaResource(Resource):
+    """
+    Twisted-native HTTP layer for Ursula, serving the same routes and wire formats as the Flask app
+    from `make_rest_app`.
+
+    Cheap endpoints (public information, node metadata and cached TreasureMaps) are answered directly
+    on the reactor.  Re-encryption does its database and signature work in the threadpool and runs the
+    re-encryption itself in a process pool.  Every other route is handed to the Flask app in the
+    threadpool, exactly as the WSGI server would.
+    """
+
+    isLeaf = True
+
+    def __init__(self, ursula, threadpool=None, reencryption_pool: Pool = None):
+        super().__init__()
+        self.log = Logger(self.__class__.__name__)
+        self.ursula = ursula
+        self.threadpool = threadpool or reactor.getThreadPool()
+        self.reencryption_pool = reencryption_pool
+        self.wsgi_resource = WSGIResource(reactor, self.threadpool, ursula.rest_app)
+
+        self.routes = (
+            (b'GET', re.compile(r'^/public_information$'), self.public_information),
+            (b'GET', re.compile(r'^/node_metadata$'), self.all_known_nodes),
+            (b'POST', re.compile(r'^/node_metadata$'), self.node_metadata_exchange),
+            (b'GET', re.compile(r'^/treasure_map/(?P<treasure_map_id>[0-9a-fA-F]+)$'), self.provide_treasure_map),
+            (b'POST', re.compile(r'^/kFrag/(?P<id_as_hex>[^/]+)/reencrypt$'), self.reencrypt),
+        )
+
+    def render(self, request):
+        path = request.path.decode()
+        for method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match and request.method == method:
+                break
+        else:
+            return self.wsgi_resource.render(request)
+
+        try:
+            result = handler(request, **match.groupdict())
+        except Exception:
+            result = Failure()
+
+        if result is NOT_HANDLED:
+            # Served by the Flask app, in the threadpool.
+            return self.wsgi_resource.render(request)
+
+        finished = dict(disconnected=False)
+        request.notifyFinish().addErrback(lambda _failure: finished.update(disconnected=True))
+
+        if isinstance(result, defer.Deferred):
+            d = result
+        elif isinstance(result, Failure):
+            d = defer.fail(result)
+        else:
+            d = defer.succeed(result)
+        d.addCallbacks(self.__write, self.__fail, callbackArgs=(request, finished), errbackArgs=(request, finished))
+        return NOT_DONE_YET
+
+    @staticmethod
+    def __write(result: HTTPResult, request, finished: dict) -> None:
+        if finished['disconnected']:
+            return
+        status, headers, body = result
+        request.setResponseCode(status)
+        for name, value in headers.items():
+            request.setHeader(name, value)
+        request.write(body)
+        request.finish()
+
+    def __fail(self, failure: Failure, request, finished: dict) -> None:
+        self.log.failure(f"Error serving {request.method.decode()} {request.path.decode()}", failure)
+        self.__write((500, {}, b''), request, finished)
+
+    def _defer_to_thread(self, f: Callable, *args, **kwargs) -> defer.Deferred:
+        return deferToThreadPool(reactor, self.threadpool, f, *args, **kwargs)
+
+    #
+    # Routes
+    #
+
+    def public_information(self, request) -> HTTPResult:
+        return 200, OCTET_STREAM, bytes(self.ursula)
+
+    def all_known_nodes(self, request) -> HTTPResult:
+        if self.ursula.known_nodes.checksum is NO_KNOWN_NODES:
+            return 204, OCTET_STREAM, b""
+
+        known_nodes_bytestring = self.ursula.bytestring_of_known_nodes()
+        signature = self.ursula.stamp(known_nodes_bytestring)
+        return 200, OCTET_STREAM, bytes(signature) + known_nodes_bytestring
+
+    def node_metadata_exchange(self, request):
+        learner_fleet_state = request.args.get(b'fleet', [b''])[0].decode()
+        if learner_fleet_state == self.ursula.known_nodes.checksum:
+            self.log.debug("Learner already knew fleet state {}; doing nothing.".format(learner_fleet_state))
+            payload = self.ursula.known_nodes.snapshot() + bytes(FLEET_STATES_MATCH)
+            signature = self.ursula.stamp(payload)
+            return 200, OCTET_STREAM, bytes(signature) + payload
+
+        # Learning about announced nodes is slower; leave it to the Flask app.
+        return NOT_HANDLED
+
+    def provide_treasure_map(self, request, treasure_map_id: str):
+        treasure_map_index = bytes.fromhex(treasure_map_id)
+
+        def lookup() -> HTTPResult:
+            try:
+                treasure_map_bytes = self.ursula.treasure_maps.get_bytes(treasure_map_index)
+            except KeyError:
+                self.log.info("{} doesn't have requested TreasureMap {}".format(self.ursula.stamp, treasure_map_id))
+                return 404, OCTET_STREAM, "No Treasure Map with ID {}".format(treasure_map_id).encode()
+            self.log.info("{} providing TreasureMap {}".format(self.ursula.nickname, treasure_map_id))
+            return 200, OCTET_STREAM, treasure_map_bytes
+
+        # Popular maps are answered from memory; anything else needs a trip to the datastore.
+        treasure_map_bytes = self.ursula.treasure_maps.get_cached_bytes(treasure_map_index)
+        if treasure_map_bytes is not None:
+            return 200, OCTET_STREAM, treasure_map_bytes
+        return self._defer_to_thread(lookup)
+
+    def reencrypt(self, request, id_as_hex: str):
+        try:
+            arrangement_id = binascii.unhexlify(id_as_hex)
+        except (binascii.Error, TypeError):
+            return 405, {}, b'Invalid arrangement ID'
+
+        def arrangement_not_found(failure: Failure) -> HTTPResult:
+            if failure.check(WorkOrderReplayed):
+                return 409, {}, b'This Work Order was already served'
+            failure.trap(NotFound)
+            return 404, {}, arrangement_id
+
+        work_order_payload = request.content.read()
+        admission = getattr(self.ursula, 'admission', None)
+        if admission is None:
+            d = self._defer_to_thread(self._prepare_reencryption, arrangement_id, id_as_hex, work_order_payload)
+            d.addCallbacks(self._reencrypt_prepared, arrangement_not_found)
+            return d
+
+        def refused(failure: Failure) -> HTTPResult:
+            failure.trap(AdmissionController.Rejected)
+            rejection = failure.value
+            return rejection.status, {b'Retry-After': str(math.ceil(rejection.retry_after)).encode()}, str(rejection).encode()
+
+        def admitted(_) -> defer.Deferred:
+            d = self._defer_to_thread(self._prepare_reencryption, arrangement_id, id_as_hex, work_order_payload)
+            d.addCallbacks(self._reencrypt_prepared, arrangement_not_found)
+
+            def release(result):
+                admission.release()
+                return result
+
+            d.addBoth(release)
+            return d
+
+        # Waiting for admission happens in the threadpool, like the rest of the request.
+        client = request.getClientAddress().host
+        d = self._defer_to_thread(admission.acquire, client=client, priority=REENCRYPTION)
+        d.addCallbacks(admitted, refused)
+        return d
+
+    def _prepare_reencryption(self, arrangement_id: bytes, id_as_hex: str, work_order_payload: bytes):
+        """Looks up the arrangement and validates Bob's work order; runs in the threadpool."""
+        from nucypher.policy.collections import WorkOrder  # Avoid circular import
+
+        with ThreadedSession(self.ursula.datastore.engine) as session:
+            arrangement = self.ursula.datastore.get_policy_arrangement(arrangement_id=id_as_hex.encode(),
+                                                                       session=session)
+
+        alice_verifying_key = UmbralPublicKey.from_bytes(arrangement.alice_verifying_key.key_data)
+        alice_address = canonical_address_from_umbral_key(alice_verifying_key)
+        work_order = WorkOrder.from_rest_payload(arrangement_id=arrangement_id,
+                                                 rest_payload=work_order_payload,
+                                                 ursula=self.ursula,
+                                                 alice_address=alice_address)
+        self.log.info(f"Work Order from {work_order.bob}, signed {work_order.receipt_signature}")
+
+        # Each Work Order is served once; its receipt may not be saved yet, so it's claimed first.
+        with ThreadedSession(self.ursula.datastore.engine) as session:
+            if not self.ursula.datastore.reserve_workorder(bob_signature=bytes(work_order.receipt_signature),
+                                                           session=session):
+                self.log.info(f"Refused a replayed Work Order from {work_order.bob}")
+                raise WorkOrderReplayed
+
+        # Ursula signs on top of Bob's signature of each task.  See #259.
+        capsules_and_metadata = [(bytes(task.capsule), bytes(self.ursula.stamp(bytes(task.signature))))
+                                 for task in work_order.tasks]
+        return work_order, arrangement.kfrag, bytes(alice_verifying_key), capsules_and_metadata
+
+    def _reencrypt_prepared(self, prepared: tuple) -> defer.Deferred:
+        work_order, kfrag_bytes, alice_verifying_key_bytes, capsules_and_metadata = prepared
+        args = (kfrag_bytes, alice_verifying_key_bytes, capsules_and_metadata)
+        if self.reencryption_pool is not None:
+            # Each arrangement has its own KFrag, so it's sent to the worker along with the capsules.
+            d = apply_in_pool(self.reencryption_pool, reencrypt_capsules, *args)
+        else:
+            d = self._defer_to_thread(reencrypt_capsules, *args)
+        d.addCallback(self._sign_cfrags, work_order)
+
+        def release(failure: Failure) -> Failure:
+            self.ursula.datastore.release_workorder(bytes(work_order.receipt_signature))
+            return failure
+
+        d.addErrback(release)
+        return d
+
+    def _sign_cfrags(self, cfrags: List[bytes], work_order) -> HTTPResult:
+        # Ursula signs to commit to her results.
+        cfrag_byte_stream = b''.join(bytes(VariableLengthBytestring(cfrag)) + bytes(self.ursula.stamp(cfrag))
+                                     for cfrag in cfrags)
+
+        # Ursula records this workorder; it's saved to her database by the next group commit.
+        self.ursula.datastore.record_workorder(bob_verifying_key=bytes(work_order.bob.stamp),
+                                               bob_signature=bytes(work_order.receipt_signature),
+                                               arrangement_id=work_order.arrangement_id)
+        return 200, OCTET_STREAM, cfrag_byte_stream
+
+
+class AsyncRESTServer:
+    """
+    Serves an UrsulaResource over TLS with Ursula's hosting keypair; an alternative to the Hendrix WSGI deployer.
+    """
+
+    def __init__(self, ursula, reencryption_processes: int = None):
+        self.ursula = ursula
+        # The workers start now, before the reactor runs; a process count of zero re-encrypts in the threadpool instead.
+        self.reencryption_pool = None
+        if reencryption_processes != 0:
+            context = multiprocessing.get_context(REENCRYPTION_START_METHOD)
+            self.reencryption_pool = context.Pool(processes=reencryption_processes)
+            reactor.addSystemEventTrigger('before', 'shutdown', self.shutdown_reencryption_pool)
+        self.resource = UrsulaResource(ursula=ursula, reencryption_pool=self.reencryption_pool)
+        self.port = None
+
+    def shutdown_reencryption_pool(self) -> None:
+        if self.reencryption_pool is not None:
+            self.reencryption_pool.close()
+            self.reencryption_pool.join()
+            self.reencryption_pool = None
+            self.resource.reencryption_pool = None
+
+    def tls_context_factory(self) -> ExistingKeyTLSContextFactory:
+        from nucypher.network.server import TLSHostingPower  # Avoid circular import
+        keypair = self.ursula._crypto_power.power_ups(TLSHostingPower).keypair
+        return ExistingKeyTLSContextFactory(private_key=keypair._privkey,
+                                            cert=X509.from_cryptography(keypair.certificate),
+                                            curve_name=keypair.curve.name,
+                                            sslmethod=TLSv1_2_METHOD)
+
+    def listen(self, port: int = None, interface: str = ''):
+        port = self.ursula.rest_interface.port if port is None else port
+        self.port = reactor.listenSSL(port, Site(self.resource), self.tls_context_factory(), interface=interface)
+        return self.port
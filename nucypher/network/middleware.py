@@ -18,10 +18,14 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import socket
 import ssl
+from collections import OrderedDict
+from threading import Lock
+from typing import Tuple
 
 import requests
 import time
 from constant_sorrow.constants import CERTIFICATE_NOT_SAVED, EXEMPT_FROM_VERIFICATION
+from requests.adapters import HTTPAdapter
 
 
 from cryptography import x509
@@ -44,10 +48,98 @@ class NotFound(UnexpectedResponse):
     pass
 
 
+class PeerSessionPool:
+    """
+    Keep-alive HTTPS sessions, one per peer, so repeated requests to a node reuse its TLS connections.
+
+    Sessions are keyed by (host:port, certificate filepath): a connection is only ever reused
+    with the certificate it was verified against, which keeps per-node certificate pinning strict.
+    Each session holds up to `connections_per_peer` connections.  Sessions idle for longer than
+    `idle_timeout` seconds are closed, as is the least recently used one beyond `max_peers`.
+    """
+
+    DEFAULT_MAX_PEERS = 256
+    DEFAULT_CONNECTIONS_PER_PEER = 4
+    DEFAULT_IDLE_TIMEOUT = 30  # seconds
+
+    def __init__(self,
+                 max_peers: int = DEFAULT_MAX_PEERS,
+                 connections_per_peer: int = DEFAULT_CONNECTIONS_PER_PEER,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.max_peers = max_peers
+        self.connections_per_peer = connections_per_peer
+        self.idle_timeout = idle_timeout
+        self.__sessions = OrderedDict()  # (host:port, certificate_filepath) -> (session, last used)
+        self.__lock = Lock()
+        self.__closed_connections = 0
+        self.__closed_requests = 0
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
+
+    def __close(self, session: requests.Session) -> None:
+        connections, requests_sent = self.__session_stats(session)
+        self.__closed_connections += connections
+        self.__closed_requests += requests_sent
+        session.close()
+
+    @staticmethod
+    def __session_stats(session: requests.Session) -> Tuple[int, int]:
+        connections = requests_sent = 0
+        for adapter in session.adapters.values():
+            for pool_key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools[pool_key]
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return connections, requests_sent
+
+    def session(self, host: str, certificate_filepath) -> requests.Session:
+        now = time.monotonic()
+        key = (host, certificate_filepath)
+        with self.__lock:
+            # Sessions are kept in order of last use, so the idle ones are at the front.
+            for idle_key, (idle_session, last_used) in list(self.__sessions.items()):
+                if now - last_used < self.idle_timeout:
+                    break
+                del self.__sessions[idle_key]
+                self.__close(idle_session)
+
+            try:
+                session, _last_used = self.__sessions.pop(key)
+            except KeyError:
+                session = requests.Session()
+                session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.connections_per_peer))
+            self.__sessions[key] = (session, now)
+
+            while len(self.__sessions) > self.max_peers:
+                _evicted_key, (evicted_session, _last_used) = self.__sessions.popitem(last=False)
+                self.__close(evicted_session)
+        return session
+
+    def close(self) -> None:
+        with self.__lock:
+            for session, _last_used in self.__sessions.values():
+                self.__close(session)
+            self.__sessions.clear()
+
+    def stats(self) -> Tuple[int, int]:
+        """Returns the number of connections (i.e. TLS handshakes) made and requests sent, so far."""
+        with self.__lock:
+            connections, requests_sent = self.__closed_connections, self.__closed_requests
+            for session, _last_used in self.__sessions.values():
+                session_connections, session_requests = self.__session_stats(session)
+                connections += session_connections
+                requests_sent += session_requests
+        return connections, requests_sent
+
+
 class NucypherMiddlewareClient:
     library = requests
     timeout = 1.2
 
+    def __init__(self, sessions: PeerSessionPool = None):
+        self.sessions = sessions or PeerSessionPool()
+
     @staticmethod
     def response_cleaner(response):
         return response
@@ -78,7 +170,7 @@ class NucypherMiddlewareClient:
         else:
             raise ValueError("You need to pass either the node or a host and port.")
 
-        return host, certificate_filepath, self.library
+        return host, certificate_filepath, None  # The session depends on the certificate finally used
 
     def invoke_method(self, method, url, *args, **kwargs):
         self.clean_params(kwargs)
@@ -125,10 +217,19 @@ class NucypherMiddlewareClient:
             else:
                 certificate_filepath = node_certificate_filepath
 
+            if http_client is None:
+                # Connections are only reused with the certificate they were verified against.
+                http_client = self.sessions.session(host, certificate_filepath)
             method = getattr(http_client, method_name)
 
             url = f"https://{host}/{path}"
-            response = self.invoke_method(method, url, verify=certificate_filepath, *args, **kwargs)
+            try:
+                response = self.invoke_method(method, url, verify=certificate_filepath, *args, **kwargs)
+            except requests.exceptions.SSLError:
+                if node_or_sprout and node_or_sprout is not EXEMPT_FROM_VERIFICATION:
+                    # The node no longer presents the certificate it was verified with.
+                    node_or_sprout.forget_verification()
+                raise
             cleaned_response = self.response_cleaner(response)
             if cleaned_response.status_code >= 300:
                 if cleaned_response.status_code == 404:
@@ -196,6 +297,10 @@ class RestMiddleware:
 
     def reencrypt(self, work_order):
         ursula_rest_response = self.send_work_order_payload_to_ursula(work_order)
+        return self.split_cfrags_and_signatures(ursula_rest_response)
+
+    @staticmethod
+    def split_cfrags_and_signatures(ursula_rest_response):
         splitter = BytestringSplitter((CapsuleFrag, VariableLengthBytestring), Signature)
         cfrags_and_signatures = splitter.repeat(ursula_rest_response.content)
         return cfrags_and_signatures
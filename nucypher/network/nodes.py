@@ -22,6 +22,7 @@ from collections import defaultdict, OrderedDict
 from collections import deque
 from collections import namedtuple
 from contextlib import suppress
+from threading import Lock
 from typing import Set, Tuple, Union
 
 import maya
@@ -59,7 +60,7 @@ from nucypher.config.storages import ForgetfulNodeStorage
 from nucypher.crypto.api import keccak_digest, verify_eip_191, recover_address_eip_191
 from nucypher.crypto.kits import UmbralMessageKit
 from nucypher.crypto.powers import TransactingPower, SigningPower, DecryptingPower, NoSigningPower
-from nucypher.crypto.signing import signature_splitter
+from nucypher.crypto.signing import signature_splitter, verify_signature
 from nucypher.network import LEARNING_LOOP_VERSION
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.middleware import RestMiddleware
@@ -775,7 +776,7 @@ class Learner:
         #
 
         if signature:
-            is_valid = signature.verify(message, sender_verifying_key)
+            is_valid = verify_signature(signature, message, sender_verifying_key, call_site='verify_from')
             if not is_valid:
                 raise self.InvalidSignature("Signature for message isn't valid: {}".format(signature))
         else:
@@ -939,6 +940,70 @@ class Learner:
         return sprouts
 
 
+class NodeVerificationCache:
+    """
+    Process-wide record of nodes that passed `verify_node`, so that fresh instances of the same node
+    (re-learned sprouts, nodes in a TreasureMap, etc.) don't each pay a `/public_information` round trip.
+
+    Entries are keyed by a digest of all of the node's metadata as it's sent over the wire, and expire
+    `ttl` seconds after the verification.  A cached node still has its signatures checked before it's
+    trusted.  Failures aren't remembered; a node that fails verification, or whose pinned certificate
+    stops matching, is forgotten and verified again the next time it's needed.
+    """
+
+    DEFAULT_TTL = 600  # seconds
+    DEFAULT_MAX_SIZE = 10000
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_size: int = DEFAULT_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__verified = OrderedDict()  # key -> expiry
+        self.__lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__verified)
+
+    def is_verified(self, node) -> bool:
+        key = node.verification_cache_key()
+        if key is None:
+            return False
+        now = time.monotonic()
+        with self.__lock:
+            expiry = self.__verified.get(key)
+            if expiry is not None and expiry > now:
+                self.hits += 1
+                return True
+            self.__verified.pop(key, None)
+            self.misses += 1
+            return False
+
+    def remember(self, node) -> None:
+        key = node.verification_cache_key()
+        if key is None:
+            return
+        with self.__lock:
+            self.__verified.pop(key, None)
+            self.__verified[key] = time.monotonic() + self.ttl
+            while len(self.__verified) > self.max_size:
+                self.__verified.popitem(last=False)
+
+    def forget(self, node) -> None:
+        key = node.verification_cache_key()
+        with self.__lock:
+            self.__verified.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__verified.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+node_verification_cache = NodeVerificationCache()
+
+
 class Teacher:
     TEACHER_VERSION = LEARNING_LOOP_VERSION
     _interface_info_splitter = (int, 4, {'byteorder': 'big'})
@@ -1206,6 +1271,77 @@ class Teacher:
         if self.verified_node:
             return True
 
+        if not force and node_verification_cache.is_verified(self):
+            self.__accept_cached_verification(registry=registry)
+            return True
+
+        try:
+            certificate_filepath = self.__validate_before_contact(registry=registry,
+                                                                  certificate_filepath=certificate_filepath)
+            response_data = network_middleware_client.node_information(host=self.rest_interface.host,
+                                                                       port=self.rest_interface.port,
+                                                                       certificate_filepath=certificate_filepath)
+            self.__check_node_information(response_data)
+        except Exception:
+            node_verification_cache.forget(self)
+            raise
+        node_verification_cache.remember(self)
+        return True
+
+    def verify_node_async(self,
+                          network_middleware_client,
+                          registry: BaseContractRegistry = None,
+                          certificate_filepath: str = None,
+                          force: bool = False
+                          ) -> defer.Deferred:
+        """
+        Like `verify_node`, for a client whose requests return Deferreds.
+        Fires with True, or fails with the same exceptions `verify_node` raises.
+        """
+        if force:
+            self.verified_interface = False
+            self.verified_node = False
+            self.verified_stamp = False
+            self.verified_worker = False
+
+        if self.verified_node:
+            return defer.succeed(True)
+
+        if not force and node_verification_cache.is_verified(self):
+            return defer.maybeDeferred(self.__accept_cached_verification, registry=registry).addCallback(lambda _: True)
+
+        def verified(response_data) -> bool:
+            self.__check_node_information(response_data)
+            node_verification_cache.remember(self)
+            return True
+
+        def failed(failure):
+            node_verification_cache.forget(self)
+            return failure
+
+        d = defer.maybeDeferred(self.__validate_before_contact, registry=registry, certificate_filepath=certificate_filepath)
+        d.addCallback(lambda certificate_filepath: network_middleware_client.node_information(
+            host=self.rest_interface.host,
+            port=self.rest_interface.port,
+            certificate_filepath=certificate_filepath))
+        d.addCallback(verified)
+        d.addErrback(failed)
+        return d
+
+    def __accept_cached_verification(self, registry: BaseContractRegistry) -> None:
+        """
+        Another instance of this node, with the very same metadata, was verified recently; this one still
+        has its own signatures checked (cheaply, they're memoized) before it's trusted without a round trip.
+        """
+        try:
+            self.validate_metadata(registry=registry)
+        except Exception:
+            node_verification_cache.forget(self)
+            raise
+        self.verified_node = True
+
+    def __validate_before_contact(self, registry: BaseContractRegistry, certificate_filepath: str) -> str:
+        """Checks the node's metadata, and returns the certificate to contact it with."""
         if not registry and not self.federated_only:  # TODO: # 466
             self.log.debug("No registry provided for decentralized stranger node verification - "
                            "on-chain Staking verification will not be performed.")
@@ -1219,11 +1355,10 @@ class Teacher:
                 raise TypeError("We haven't saved a certificate for this node yet.")
             else:
                 certificate_filepath = self.certificate_filepath
+        return certificate_filepath
 
-        response_data = network_middleware_client.node_information(host=self.rest_interface.host,
-                                                            port=self.rest_interface.port,
-                                                            certificate_filepath=certificate_filepath)
-
+    def __check_node_information(self, response_data: bytes) -> None:
+        """Makes sure the node is using the same signature and address we checked."""
         version, node_bytes = self.version_splitter(response_data, return_remainder=True)
 
         sprout = self.internal_splitter(node_bytes, partial=True)
@@ -1249,6 +1384,17 @@ class Teacher:
             # Success
             self.verified_node = True
 
+    def forget_verification(self) -> None:
+        """Marks this node as unverified, e.g. after its pinned certificate was rejected; it's verified again on next use."""
+        self.verified_node = False
+        node_verification_cache.forget(self)
+
+    def verification_cache_key(self) -> Union[bytes, None]:
+        if not isinstance(self.certificate, Certificate):
+            return None
+        # All of the node's metadata, including its certificate, interface, timestamp and their signature.
+        return keccak_digest(bytes(self))
+
     @property
     def decentralized_identity_evidence(self):
         return self.__decentralized_identity_evidence
@@ -1278,7 +1424,10 @@ class Teacher:
         """
         interface_info_message = self._signable_interface_info_message()  # Contains canonical address.
         message = self.timestamp_bytes() + interface_info_message
-        interface_is_valid = self._interface_signature.verify(message, self.public_keys(SigningPower))
+        interface_is_valid = verify_signature(self._interface_signature,
+                                              message,
+                                              self.public_keys(SigningPower),
+                                              call_site='node_interface')
         self.verified_interface = interface_is_valid
         if interface_is_valid:
             return True
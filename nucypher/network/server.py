@@ -16,19 +16,19 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import binascii
+import math
 import os
 from typing import Tuple
 
 from constant_sorrow import constants
 from constant_sorrow.constants import FLEET_STATES_MATCH, NO_KNOWN_NODES
-from flask import Flask, Response, jsonify
+from flask import Flask, Response, g, jsonify
 from flask import request
-from hendrix.experience import crosstown_traffic
 from jinja2 import Template, TemplateError
+from twisted.internet import reactor
 from twisted.logger import Logger
 
 import nucypher
-from nucypher.config.storages import ForgetfulNodeStorage
 from nucypher.crypto.kits import UmbralMessageKit
 from nucypher.crypto.powers import KeyPairBasedPower, PowerUpError
 from nucypher.crypto.signing import InvalidSignature
@@ -37,7 +37,7 @@ from nucypher.keystore.keypairs import HostingKeypair
 from nucypher.keystore.keystore import NotFound
 from nucypher.keystore.threading import ThreadedSession
 from nucypher.network import LEARNING_LOOP_VERSION
-from nucypher.network.exceptions import NodeSeemsToBeDown
+from nucypher.network.admission import AdmissionController, GOSSIP, REENCRYPTION, TREASURE_MAP
 from nucypher.network.protocols import InterfaceInfo
 from umbral.keys import UmbralPublicKey
 from umbral.kfrags import KFrag
@@ -79,27 +79,20 @@ def make_rest_app(
         db_filepath: str,
         this_node,
         serving_domains,
+        admission: AdmissionController = None,
         log=Logger("http-application-layer")
         ) -> Tuple:
 
-    forgetful_node_storage = ForgetfulNodeStorage(federated_only=this_node.federated_only)
-
     from nucypher.keystore import keystore
-    from nucypher.keystore.db import Base
-    from sqlalchemy.engine import create_engine
+    from nucypher.keystore.db import Base, create_datastore_engine, create_missing_indexes
 
     log.info("Starting datastore {}".format(db_filepath))
-
-    # See: https://docs.sqlalchemy.org/en/rel_0_9/dialects/sqlite.html#connect-strings
-    if db_filepath:
-        db_uri = f'sqlite:///{db_filepath}'
-    else:
-        db_uri = 'sqlite://'  # TODO: Is this a sane default? See #667
-
-    engine = create_engine(db_uri)
+    engine = create_datastore_engine(db_filepath=db_filepath)
 
     Base.metadata.create_all(engine)
+    create_missing_indexes(engine)
     datastore = keystore.KeyStore(engine)
+    reactor.addSystemEventTrigger('before', 'shutdown', datastore.workorder_ledger.stop)
     db_engine = engine
 
     from nucypher.characters.lawful import Alice, Ursula
@@ -108,6 +101,28 @@ def make_rest_app(
 
     rest_app = Flask("ursula-service")
 
+    # Expensive routes are admitted by priority; re-encryption is served ahead of gossip.
+    admission_priorities = {'reencrypt_via_rest': REENCRYPTION,
+                            'receive_treasure_map': TREASURE_MAP,
+                            'node_metadata_exchange': GOSSIP}
+
+    @rest_app.before_request
+    def admit_request():
+        priority = admission_priorities.get(request.endpoint)
+        if admission is None or priority is None:
+            return
+        try:
+            admission.acquire(client=request.remote_addr, priority=priority)
+        except AdmissionController.Rejected as e:
+            log.debug(f"Refused {request.method} {request.path} from {request.remote_addr}: {e}")
+            return Response(response=str(e), status=e.status, headers={'Retry-After': str(math.ceil(e.retry_after))})
+        g.admitted = True
+
+    @rest_app.teardown_request
+    def release_request(_exception):
+        if g.pop('admitted', False):
+            admission.release()
+
     @rest_app.route("/public_information")
     def public_information():
         """
@@ -145,48 +160,7 @@ def make_rest_app(
         sprouts = _node_class.batch_from_bytes(request.data,
                                              registry=this_node.registry)
 
-        # TODO: This logic is basically repeated in learn_from_teacher_node and remember_node.
-        # Let's find a better way.  #555
-        for node in sprouts:
-            @crosstown_traffic()
-            def learn_about_announced_nodes():
-                if node in this_node.known_nodes:
-                    if node.timestamp <= this_node.known_nodes[node.checksum_address].timestamp:
-                        return
-
-                node.mature()
-
-                try:
-                    node.verify_node(this_node.network_middleware.client,
-                                     registry=this_node.registry,
-                                     )
-
-                # Suspicion
-                except node.SuspiciousActivity as e:
-                    # TODO: Include data about caller?
-                    # TODO: Account for possibility that stamp, rather than interface, was bad.
-                    # TODO: Maybe also record the bytes representation separately to disk?
-                    message = f"Suspicious Activity about {node}: {str(e)}.  Announced via REST."
-                    log.warn(message)
-                    this_node.suspicious_activities_witnessed['vladimirs'].append(node)
-                except NodeSeemsToBeDown as e:
-                    # This is a rather odd situation - this node *just* contacted us and asked to be verified.  Where'd it go?  Maybe a NAT problem?
-                    log.info(f"Node announced itself to us just now, but seems to be down: {node}.  Response was {e}.")
-                    log.debug(f"Phantom node certificate: {node.certificate}")
-                # Async Sentinel
-                except Exception as e:
-                    log.critical(f"This exception really needs to be handled differently: {e}")
-                    raise
-
-                # Believable
-                else:
-                    log.info("Learned about previously unknown node: {}".format(node))
-                    this_node.remember_node(node)
-                    # TODO: Record new fleet state
-
-                # Cleanup
-                finally:
-                    forgetful_node_storage.forget()
+        this_node.announcement_verifier.announce(sprouts)
 
         # TODO: What's the right status code here?  202?  Different if we already knew about the node?
         return all_known_nodes()
@@ -219,7 +193,7 @@ def make_rest_app(
         TODO: Validate that the kfrag being saved is pursuant to an approved
             Policy (see #121).
         """
-        policy_message_kit = UmbralMessageKit.from_bytes(request.data)
+        policy_message_kit = UmbralMessageKit.from_buffer(request.data)
 
         alices_verifying_key = policy_message_kit.sender_verifying_key
         alice = _alice_class.from_public_keys(verifying_key=alices_verifying_key)
@@ -305,16 +279,26 @@ def make_rest_app(
                                                  alice_address=alice_address)
         log.info(f"Work Order from {work_order.bob}, signed {work_order.receipt_signature}")
 
-        # Re-encrypt
-        response = this_node._reencrypt(kfrag=kfrag,
-                                        work_order=work_order,
-                                        alice_verifying_key=alice_verifying_key)
+        # Each Work Order is served once; its receipt may not be saved yet, so it's claimed first.
+        bob_signature = bytes(work_order.receipt_signature)
+        with ThreadedSession(db_engine) as session:
+            if not datastore.reserve_workorder(bob_signature=bob_signature, session=session):
+                log.info(f"Refused a replayed Work Order from {work_order.bob}")
+                return Response(response=b'This Work Order was already served', status=409)
 
-        # Now, Ursula saves this workorder to her database...
-        with ThreadedSession(db_engine):
-            this_node.datastore.save_workorder(bob_verifying_key=bytes(work_order.bob.stamp),
-                                               bob_signature=bytes(work_order.receipt_signature),
-                                               arrangement_id=work_order.arrangement_id)
+        # Re-encrypt
+        try:
+            response = this_node._reencrypt(kfrag=kfrag,
+                                            work_order=work_order,
+                                            alice_verifying_key=alice_verifying_key)
+        except Exception:
+            datastore.release_workorder(bob_signature)
+            raise
+
+        # Now, Ursula records this workorder; it's saved to her database by the next group commit.
+        this_node.datastore.record_workorder(bob_verifying_key=bytes(work_order.bob.stamp),
+                                             bob_signature=bob_signature,
+                                             arrangement_id=work_order.arrangement_id)
 
         headers = {'Content-Type': 'application/octet-stream'}
         return Response(headers=headers, response=response)
@@ -327,8 +311,8 @@ def make_rest_app(
 
         try:
 
-            treasure_map = this_node.treasure_maps[treasure_map_index]
-            response = Response(bytes(treasure_map), headers=headers)
+            treasure_map_bytes = this_node.treasure_maps.get_bytes(treasure_map_index)
+            response = Response(treasure_map_bytes, headers=headers)
             log.info("{} providing TreasureMap {}".format(this_node.nickname, treasure_map_id))
 
         except KeyError:
@@ -352,10 +336,10 @@ def make_rest_app(
         if do_store:
             log.info("{} storing TreasureMap {}".format(this_node, treasure_map_id))
 
-            # TODO 341 - what if we already have this TreasureMap?
+            # If we already have this very TreasureMap, storing it again is a no-op.  See #341.
             treasure_map_index = bytes.fromhex(treasure_map_id)
-            this_node.treasure_maps[treasure_map_index] = treasure_map
-            return Response(bytes(treasure_map), status=202)
+            this_node.treasure_maps.store(treasure_map_index, request.data)
+            return Response(request.data, status=202)
         else:
             # TODO: Make this a proper 500 or whatever.
             log.info("Bad TreasureMap ID; not storing {}".format(treasure_map_id))
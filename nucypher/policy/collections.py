@@ -39,7 +39,7 @@ from nucypher.characters.lawful import Bob, Character
 from nucypher.crypto.api import keccak_digest, encrypt_and_sign
 from nucypher.crypto.constants import PUBLIC_ADDRESS_LENGTH, KECCAK_DIGEST_LENGTH
 from nucypher.crypto.kits import UmbralMessageKit
-from nucypher.crypto.signing import Signature, InvalidSignature, signature_splitter
+from nucypher.crypto.signing import Signature, InvalidSignature, signature_splitter, verify_signature
 from nucypher.crypto.splitters import key_splitter, capsule_splitter
 from nucypher.crypto.utils import (canonical_address_from_umbral_key,
                                    get_coordinates_as_bytes,
@@ -91,6 +91,7 @@ class TreasureMap:
         self._public_signature = public_signature
         self._hrac = hrac
         self._payload = None
+        self._public_id = None
 
     def prepare_for_publication(self,
                                 bob_encrypting_key,
@@ -119,6 +120,7 @@ class TreasureMap:
         """
         self._hrac = keccak_digest(bytes(alice_stamp) + bytes(bob_verifying_key) + label)
         self._public_signature = alice_stamp(bytes(alice_stamp) + self._hrac)
+        self._public_id = None
         self._set_payload()
 
     def _set_payload(self):
@@ -167,9 +169,9 @@ class TreasureMap:
         Ursula will refuse to propagate this if it she can't prove the payload is signed by Alice's public key,
         which is included in it,
         """
-        # TODO: No reason to keccak this over and over again.  Turn into set-once property pattern.
-        _id = keccak_digest(bytes(self._verifying_key) + bytes(self._hrac)).hex()
-        return _id
+        if self._public_id is None:
+            self._public_id = keccak_digest(bytes(self._verifying_key) + bytes(self._hrac)).hex()
+        return self._public_id
 
     @classmethod
     def from_bytes(cls, bytes_representation, verify=True):
@@ -181,6 +183,9 @@ class TreasureMap:
             hrac=hrac,
         )
 
+        # Keep the wire bytes; the splitter has already checked they are exactly this map.
+        treasure_map._payload = bytes(bytes_representation)
+
         if verify:
             treasure_map.public_verify()
 
@@ -188,7 +193,7 @@ class TreasureMap:
 
     def public_verify(self):
         message = bytes(self._verifying_key) + self._hrac
-        verified = self._public_signature.verify(message, self._verifying_key)
+        verified = verify_signature(self._public_signature, message, self._verifying_key, call_site='treasure_map')
 
         if verified:
             return True
@@ -411,12 +416,12 @@ class WorkOrder:
                                                    blockhash,
                                                    ursula_identity_evidence)
 
-            if not task.signature.verify(specification, bob_verifying_key):
+            if not verify_signature(task.signature, specification, bob_verifying_key, call_site='work_order_task'):
                 raise InvalidSignature()
 
         # Check receipt
         receipt_bytes = b"wo:" + bytes(ursula.stamp) + keccak_digest(*[bytes(task.capsule) for task in tasks])
-        if not signature.verify(receipt_bytes, bob_verifying_key):
+        if not verify_signature(signature, receipt_bytes, bob_verifying_key, call_site='work_order_receipt'):
             raise InvalidSignature()
 
         bob = Bob.from_public_keys(verifying_key=bob_verifying_key)
@@ -560,7 +565,8 @@ class Revocation:
         """
         Verifies the revocation was from the provided pubkey.
         """
-        if not self.signature.verify(self.prefix + self.arrangement_id, alice_pubkey):
+        message = self.prefix + self.arrangement_id
+        if not verify_signature(self.signature, message, alice_pubkey, call_site='revocation'):
             raise InvalidSignature(
                 "Revocation has an invalid signature: {}".format(self.signature))
         return True
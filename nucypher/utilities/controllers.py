@@ -1,10 +1,13 @@
 import json
-from io import StringIO
+from functools import partial
+from io import StringIO, SEEK_END
 
 from typing import Union
 
 from io import BytesIO
 
+import msgpack
+
 import nucypher
 
 
@@ -42,6 +45,24 @@ class TestRPCResponse:
         else:
             return self.data['error']
 
+    @classmethod
+    def from_response_data(cls, response_data: dict) -> 'TestRPCResponse':
+        # Check for Success or Error
+        error = False
+        response_id_value = response_data['id']
+        try:
+            response_id = int(response_id_value)
+        except TypeError:
+            if response_id_value is not None:
+                raise
+            error, response_id = True, None
+
+        instance = cls(payload=response_data,
+                       success=not error,
+                       error=error,
+                       id=response_id)
+        return instance
+
     @classmethod
     def from_string(cls, response_line: str):
         outgoing_responses = response_line.strip(cls.delimiter).split(cls.delimiter)
@@ -50,23 +71,7 @@ class TestRPCResponse:
         for response in outgoing_responses:
             # Deserialize
             response_data = json.loads(response)
-
-            # Check for Success or Error
-            error = False
-            response_id_value = response_data['id']
-            try:
-                response_id = int(response_id_value)
-            except TypeError:
-                if response_id_value is not None:
-                    raise
-                error, response_id = True, None
-
-            instance = cls(payload=response_data,
-                           success=not error,
-                           error=error,
-                           id=response_id)
-
-            responses.append(instance)
+            responses.append(cls.from_response_data(response_data))
 
         # handle one or many requests
         final_response = responses
@@ -81,6 +86,8 @@ class JSONRPCTestClient:
 
     MESSAGE_ID = 0
 
+    serialize = staticmethod(json.dumps)
+
     __preamble = json.dumps(dict(jsonrpc="2.0", version=str(nucypher.__version__)))
     __io = StringIO(initial_value=str(__preamble.encode()))
     response_sink = __io.write
@@ -116,7 +123,7 @@ class JSONRPCTestClient:
         if malformed:
             # Allow a malformed request for testing and
             # bypass all this business below
-            payload = json.dumps(request)
+            payload = self.serialize(request)
 
         else:
             # Handle single or bulk requests
@@ -132,10 +139,34 @@ class JSONRPCTestClient:
             if not len(payload) > 1:
                 payload = payload[0]
 
-            payload = json.dumps(payload)
+            payload = self.serialize(payload)
 
         # Request
         response_size = self._controller.handle_request(control_request=payload)
 
         # Respond
         return self.receive(size=response_size)
+
+
+class MessagePackRPCTestClient(JSONRPCTestClient):
+    """A test client for character RPC control over msgpack."""
+
+    serialize = staticmethod(partial(msgpack.packb, use_bin_type=True))
+
+    def __init__(self, rpc_controller):
+
+        # Divert the emitter flow to a buffer of this client's own
+        self.__io = BytesIO()
+        rpc_controller.emitter.sink = self.__io.write
+        self._controller = rpc_controller
+
+    def receive(self, size: int):
+        self.__io.seek(-size, SEEK_END)
+        packed = self.__io.read(size)
+        responses = [TestRPCResponse.from_response_data(response_data)
+                     for response_data in msgpack.Unpacker(BytesIO(packed), raw=False)]
+
+        # handle one or many requests
+        if not len(responses) > 1:
+            return responses[0]
+        return responses
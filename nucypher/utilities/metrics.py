@@ -1,11 +1,14 @@
 try:
-    from prometheus_client import Gauge, Enum, Counter, Info
+    from prometheus_client import (Gauge, Enum, Counter, Info,
+                                   CollectorRegistry, REGISTRY, CONTENT_TYPE_LATEST, generate_latest)
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
 except ImportError:
     raise ImportError('prometheus_client is not installed - Install it and try again.')
-from twisted.internet import reactor, task
+from twisted.internet import reactor, task, threads
 
 import nucypher
 from nucypher.blockchain.eth.agents import ContractAgency, StakingEscrowAgent
+from nucypher.crypto.signing import verification_memo
 
 # Metrics
 known_nodes_guage = Gauge('known_nodes', 'Number of currently known nodes')
@@ -14,6 +17,12 @@ missing_confirmation_guage = Gauge('missing_confirmations', 'Currently missed co
 learning_status = Enum('node_discovery', 'Learning loop status', states=['starting', 'running', 'stopped'])
 requests_counter = Counter('http_failures', 'HTTP Failures', ['method', 'endpoint'])
 host_info = Info('host_info', 'Description of info')
+reclaimed_rows_gauge = Gauge('datastore_reclaimed_rows', 'Rows deleted by the datastore garbage collector', ['table'])
+reclaimed_bytes_gauge = Gauge('datastore_reclaimed_bytes', 'Bytes returned to the filesystem by the datastore garbage collector')
+signature_memo_hits_gauge = Gauge('signature_memo_hits', 'Signature verifications answered from the memo', ['call_site'])
+signature_memo_misses_gauge = Gauge('signature_memo_misses', 'Signature verifications performed', ['call_site'])
+announcement_queue_depth_gauge = Gauge('announcement_queue_depth', 'Announced nodes waiting to be verified')
+announcements_gauge = Gauge('announcements', 'Announced nodes, by what became of them', ['outcome'])
 active_stake_gauge = Gauge('active_stake', 'Active stake')
 
 
@@ -28,7 +37,26 @@ def collect_prometheus_metrics(ursula):
 
     learning_status.state('running' if ursula._learning_task.running else 'stopped')
     known_nodes_guage.set(len(ursula.known_nodes))
-    work_orders_guage.set(len(ursula.work_orders()))
+
+    # Counting flushes the work order ledger, which commits to the datastore: that's kept off the reactor.
+    work_orders_counted = threads.deferToThread(ursula.work_order_count)
+    work_orders_counted.addCallback(work_orders_guage.set)
+
+    collector = ursula.arrangement_collector
+    reclaimed_rows_gauge.labels(table='policyarrangements').set(collector.reclaimed_arrangements)
+    reclaimed_rows_gauge.labels(table='workorders').set(collector.reclaimed_workorders)
+    reclaimed_rows_gauge.labels(table='keys').set(collector.reclaimed_keys)
+    reclaimed_rows_gauge.labels(table='treasuremaps').set(collector.reclaimed_treasure_maps)
+    reclaimed_bytes_gauge.set(collector.reclaimed_bytes)
+
+    for call_site, (hits, misses) in verification_memo.stats().items():
+        signature_memo_hits_gauge.labels(call_site=call_site).set(hits)
+        signature_memo_misses_gauge.labels(call_site=call_site).set(misses)
+
+    verifier = ursula.announcement_verifier
+    announcement_queue_depth_gauge.set(verifier.queue_depth)
+    for outcome in ('queued', 'duplicates', 'dropped', 'verified', 'failed'):
+        announcements_gauge.labels(outcome=outcome).set(getattr(verifier, outcome))
 
     if not ursula.federated_only:
 
@@ -46,6 +74,83 @@ def collect_prometheus_metrics(ursula):
         base_payload.update(decentralized_payload)
 
     host_info.info(base_payload)
+    return work_orders_counted  # The next collection waits for it
+
+
+class AdmissionMetricsCollector:
+    """Reads an Ursula's admission control counters (see AdmissionController) whenever they're scraped."""
+
+    def __init__(self, ursula):
+        self.ursula = ursula
+
+    def collect(self):
+        admission = self.ursula.admission
+        if admission is None:  # Admission control is off; there's nothing to report
+            return []
+
+        admitted = CounterMetricFamily('requests_admitted', 'Requests admitted by admission control', labels=['priority'])
+        queued = CounterMetricFamily('requests_queued', 'Requests that waited for admission', labels=['priority'])
+        rejected = CounterMetricFamily('requests_rejected', 'Requests refused by admission control', labels=['priority', 'reason'])
+        for priority in sorted(admission.admitted):
+            admitted.add_metric([priority], admission.admitted[priority])
+            queued.add_metric([priority], admission.queued[priority])
+            rejected.add_metric([priority, 'overloaded'], admission.rejected[priority])
+            rejected.add_metric([priority, 'rate_limited'], admission.rate_limited[priority])
+
+        in_flight = GaugeMetricFamily('requests_in_flight', 'Admitted requests currently being served', value=admission.in_flight)
+        queue_depth = GaugeMetricFamily('requests_queue_depth', 'Requests currently waiting for admission', value=admission.queue_depth)
+        return [admitted, queued, rejected, in_flight, queue_depth]
+
+
+class ControllerMetricsCollector:
+    """Reads the metrics of character controllers (see ControllerMetrics) whenever they're scraped."""
+
+    def __init__(self, *controllers):
+        self.controllers = list(controllers)
+
+    def collect(self):
+        labels = ['controller', 'method']
+        calls = CounterMetricFamily('controller_calls', 'Character control calls', labels=labels)
+        errors = CounterMetricFamily('controller_errors', 'Character control calls that failed', labels=labels)
+        request_bytes = CounterMetricFamily('controller_request_bytes', 'Bytes of character control requests', labels=labels)
+        response_bytes = CounterMetricFamily('controller_response_bytes', 'Bytes of character control responses', labels=labels)
+        latency = HistogramMetricFamily('controller_latency_seconds', 'Latency of character control calls', labels=labels)
+
+        for controller in self.controllers:
+            metrics = controller.metrics
+            if metrics is None:
+                continue
+            bounds = [str(bound) for bound in metrics.buckets] + ['+Inf']
+            for method_name, method in sorted(metrics.stats().items()):
+                method_labels = [controller.app_name, method_name]
+                calls.add_metric(method_labels, method.calls)
+                errors.add_metric(method_labels, method.errors)
+                request_bytes.add_metric(method_labels, method.request_bytes)
+                response_bytes.add_metric(method_labels, method.response_bytes)
+                latency.add_metric(method_labels,
+                                   buckets=list(zip(bounds, method.cumulative_latency_counts())),
+                                   sum_value=method.latency_sum)
+
+        return [calls, errors, request_bytes, response_bytes, latency]
+
+
+controller_metrics_collector = ControllerMetricsCollector()
+
+
+def register_controller_metrics(controller) -> None:
+    """Exports a character controller's metrics (enabling them) through the Prometheus exporter."""
+    if controller.metrics is None:
+        controller.enable_metrics()
+    if not controller_metrics_collector.controllers:
+        REGISTRY.register(controller_metrics_collector)
+    controller_metrics_collector.controllers.append(controller)
+
+
+def controller_metrics_exposition(controller):
+    """Renders a character controller's metrics for its /metrics route; returns the text and its content type."""
+    registry = CollectorRegistry(auto_describe=False)
+    registry.register(ControllerMetricsCollector(controller))
+    return generate_latest(registry), CONTENT_TYPE_LATEST
 
 
 def initialize_prometheus_exporter(ursula, port: int) -> None:
@@ -57,6 +162,7 @@ def initialize_prometheus_exporter(ursula, port: int) -> None:
     # Scheduling
     metrics_task = task.LoopingCall(collect_prometheus_metrics, ursula=ursula)
     metrics_task.start(interval=10, now=False)  # TODO: make configurable
+    REGISTRY.register(AdmissionMetricsCollector(ursula=ursula))
 
     # WSGI Service
     root = Resource()
@@ -20,7 +20,10 @@ import requests
 import socket
 
 from bytestring_splitter import VariableLengthBytestring
+from twisted.internet import defer
+
 from nucypher.characters.lawful import Ursula
+from nucypher.network.async_middleware import AsyncNucypherMiddlewareClient, AsyncRestMiddleware
 from nucypher.network.middleware import RestMiddleware, NucypherMiddlewareClient
 from nucypher.utilities.sandbox.constants import MOCK_KNOWN_URSULAS_CACHE
 from constant_sorrow.constants import CERTIFICATE_NOT_SAVED
@@ -96,6 +99,39 @@ class MockRestMiddleware(RestMiddleware):
         return ursula.certificate
 
 
+class _AsyncTestMiddlewareClient(AsyncNucypherMiddlewareClient):
+    """
+    Calls the Flask test client of the Ursula in question, but returns Deferreds like the real
+    async client does, so that code written against the async middleware can be tested in-process.
+    """
+    timeout = None
+
+    response_cleaner = _TestMiddlewareClient.response_cleaner
+    _get_mock_client_by_ursula = _TestMiddlewareClient._get_mock_client_by_ursula
+    _get_mock_client_by_url = _TestMiddlewareClient._get_mock_client_by_url
+    _get_mock_client_by_port = _TestMiddlewareClient._get_mock_client_by_port
+    _get_ursula_by_port = _TestMiddlewareClient._get_ursula_by_port
+    parse_node_or_host_and_port = _TestMiddlewareClient.parse_node_or_host_and_port
+
+    def invoke_method(self, method, url, http_client=None, verify=None, params=None, data=None, timeout=None):
+        # We don't use certs or timeouts with the test client.
+        try:
+            response = getattr(http_client, method)(url, query_string=params or {}, data=data)
+        except Exception:
+            return defer.fail()
+        return defer.succeed(response)
+
+
+class MockAsyncRestMiddleware(AsyncRestMiddleware):
+
+    _client_class = _AsyncTestMiddlewareClient
+
+    def get_certificate(self, host, port, timeout=3, retry_attempts: int = 3, retry_rate: int = 2,
+                        current_attempt: int = 0):
+        ursula = self.client._get_ursula_by_port(port)
+        return ursula.certificate
+
+
 class MockRestMiddlewareForLargeFleetTests(MockRestMiddleware):
     """
     A MockRestMiddleware with workaround necessary to test the conditions that arise with thousands of nodes.
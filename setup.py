@@ -72,6 +72,9 @@ class VerifyVersionCommand(install):
 with open(os.path.join(BASE_DIR, "requirements.txt")) as f:
     _PIP_FLAGS, *INSTALL_REQUIRES = f.read().split('\n')
 
+# Imported by the character controllers themselves, not only by other dependencies.
+INSTALL_REQUIRES.append('msgpack-python>=0.5.6')
+
 
 TESTS_REQUIRE = [
     'pytest',
@@ -17,9 +17,12 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import pytest
 from collections import Counter
+from unittest.mock import PropertyMock
+
+from twisted.logger import Logger
 
 from nucypher.blockchain.economics import StandardTokenEconomics, BaseEconomics
-from nucypher.blockchain.eth.agents import StakingEscrowAgent
+from nucypher.blockchain.eth.agents import StakingEscrowAgent, StakerDistribution
 from nucypher.blockchain.eth.interfaces import BlockchainInterface
 from nucypher.blockchain.eth.constants import STAKING_ESCROW_CONTRACT_NAME
 
@@ -48,6 +51,50 @@ def token(token_economics, deploy_contract):
     return contract
 
 
+def test_staker_distribution_lookup():
+    stakers = [('0xA', 10), ('0xB', 0), ('0xC', 5), ('0xD', 1)]
+    distribution = StakerDistribution(period=1, duration=1, stakers=stakers)
+
+    # Empty stakes are left out of the distribution
+    assert len(distribution) == 3
+    assert distribution.total_tokens == 16
+
+    assert distribution[0] == '0xA'
+    assert distribution[9] == '0xA'
+    assert distribution[10] == '0xC'
+    assert distribution[14] == '0xC'
+    assert distribution[15] == '0xD'
+
+    with pytest.raises(IndexError):
+        _staker = distribution[16]
+
+
+def test_staker_distribution_is_reused_within_a_period(mocker):
+    StakingEscrowAgent.clear_staker_distributions()
+    staking_agent = StakingEscrowAgent.__new__(StakingEscrowAgent)  # No chain needed; its calls are mocked below
+    staking_agent.log = Logger('test-staking-agent')
+    mocker.patch.object(StakingEscrowAgent, 'contract_address', new_callable=PropertyMock, return_value='0xEscrow')
+    current_period = mocker.patch.object(StakingEscrowAgent, 'get_current_period', return_value=100)
+    stakers = [('0xA', 10), ('0xB', 20), ('0xC', 30)]
+    get_all_active_stakers = mocker.patch.object(StakingEscrowAgent, 'get_all_active_stakers', return_value=(60, stakers))
+
+    # The first sample of a period downloads the distribution...
+    assert len(staking_agent.sample(quantity=2, duration=1)) == 2
+    assert get_all_active_stakers.call_count == 1
+
+    # ...and every other sample in that period reuses it.
+    assert len(staking_agent.sample(quantity=2, duration=1)) == 2
+    assert get_all_active_stakers.call_count == 1
+
+    # A new period rebuilds it.
+    current_period.return_value = 101
+    get_all_active_stakers.return_value = (100, stakers + [('0xD', 40)])
+    assert len(staking_agent.sample(quantity=4, duration=1, additional_ursulas=10, attempts=10)) == 4
+    assert get_all_active_stakers.call_count == 2
+    assert staking_agent.get_staker_distribution(duration=1).period == 101
+    StakingEscrowAgent.clear_staker_distributions()
+
+
 @pytest.mark.nightly
 def test_sampling_distribution(testerchain, token, deploy_contract):
 
@@ -144,6 +144,26 @@ def test_get_swarm(agency, blockchain_ursulas):
     assert is_address(staker_addr)
 
 
+@pytest.mark.slow()
+def test_batch_reader(agency, blockchain_ursulas):
+    _token_agent, staking_agent, _policy_agent = agency
+    reader = staking_agent.batch_reader()
+    assert reader.block_identifier == staking_agent.blockchain.client.block_number
+
+    num_stakers = staking_agent.get_staker_population()
+    stakers = reader.call_many(staking_agent.contract.functions.stakers(i) for i in range(num_stakers))
+    assert stakers == staking_agent.get_stakers() == list(staking_agent.swarm())
+
+    # Raw call output is decoded like a regular web3 call
+    function = staking_agent.contract.functions.getLastActivePeriod(stakers[0])
+    raw_output = staking_agent.blockchain.w3.eth.call({'to': function.address,
+                                                      'data': function._encode_transaction_data()})
+    assert reader.decode(function, raw_output) == staking_agent.get_last_active_period(stakers[0])
+
+    active, pending, missing = staking_agent.partition_stakers_by_activity()
+    assert sorted(active + pending + missing) == sorted(stakers)
+
+
 @pytest.mark.slow()
 @pytest.mark.usefixtures("blockchain_ursulas")
 def test_sample_stakers(agency):
@@ -169,6 +189,27 @@ def test_sample_stakers(agency):
     staking_agent.blockchain.is_light = light
 
 
+@pytest.mark.slow()
+@pytest.mark.usefixtures("blockchain_ursulas")
+def test_paginated_active_stakers(agency):
+    _token_agent, staking_agent, _policy_agent = agency
+    n_tokens, stakers = staking_agent.get_all_active_stakers(periods=1, pagination_size=0)
+    assert n_tokens > 0
+
+    # Fixed page sizes read the same (pinned) staker set
+    for pagination_size in (1, 2, len(stakers) + 1):
+        assert (n_tokens, stakers) == staking_agent.get_all_active_stakers(periods=1, pagination_size=pagination_size)
+
+    # Adaptive page size on light clients
+    light = staking_agent.blockchain.is_light
+    staking_agent.blockchain.is_light = True
+    try:
+        assert (n_tokens, stakers) == staking_agent.get_all_active_stakers(periods=1)
+        assert staking_agent._pagination_size > StakingEscrowAgent.DEFAULT_PAGINATION_SIZE
+    finally:
+        staking_agent.blockchain.is_light = light
+
+
 def test_get_current_period(agency, testerchain):
     _token_agent, staking_agent, _policy_agent = agency
     start_period = staking_agent.get_current_period()
@@ -177,6 +218,38 @@ def test_get_current_period(agency, testerchain):
     assert end_period > start_period
 
 
+def test_contract_call_cache(agency, testerchain):
+    _token_agent, staking_agent, _policy_agent = agency
+    call_cache = staking_agent.call_cache
+    assert call_cache is not None
+
+    # Staking parameters are read once a period, since an upgrade of the contract can change them
+    parameters = staking_agent.staking_parameters()
+    hits = call_cache.hits
+    assert staking_agent.staking_parameters() == parameters
+    assert call_cache.hits == hits + 1
+
+    # Per-block values are reused until a new block is mined
+    period = staking_agent.get_current_period()
+    hits = call_cache.hits
+    assert staking_agent.get_current_period() == period
+    assert call_cache.hits == hits + 1
+
+    testerchain.time_travel(periods=1)
+    assert staking_agent.get_current_period() == period + 1
+
+    misses = call_cache.misses
+    assert staking_agent.staking_parameters() == parameters
+    assert call_cache.misses == misses + 2  # secondsPerPeriod, then the parameters for the new period
+
+    # Caching can be turned off per agent
+    uncached_agent = StakingEscrowAgent(registry=staking_agent.registry,
+                                        contract=staking_agent.contract,
+                                        call_cache_size=0)
+    assert uncached_agent.call_cache is None
+    assert uncached_agent.get_current_period() == period + 1
+
+
 @pytest.mark.slow()
 def test_confirm_activity(agency, testerchain, mock_transacting_power_activation):
     _token_agent, staking_agent, _policy_agent = agency
@@ -0,0 +1,126 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import types
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+import pytest
+from web3 import HTTPProvider, Web3
+
+from nucypher.blockchain.eth.batch import BatchContractReader
+
+DOUBLER_ADDRESS = Web3.toChecksumAddress('0x' + '11' * 20)
+DOUBLER_ABI = [{'constant': True,
+                'inputs': [{'name': 'value', 'type': 'uint256'}],
+                'name': 'double',
+                'outputs': [{'name': '', 'type': 'uint256'}],
+                'payable': False,
+                'stateMutability': 'view',
+                'type': 'function'}]
+
+
+class StubNodeRequestHandler(BaseHTTPRequestHandler):
+    """A JSON-RPC endpoint whose only contract doubles its argument; it answers batches in reverse."""
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append(request)
+        if not isinstance(request, list):
+            reply = self.answer(request)
+        elif self.server.refuse_batches:
+            reply = {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'Batch too large'}}
+        else:
+            reply = [self.answer(item) for item in reversed(request)]
+
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def answer(self, request: dict) -> dict:
+        result = None
+        if request['method'] == 'eth_chainId':
+            result = '0x1'
+        elif request['method'] == 'eth_call':
+            value = int(request['params'][0]['data'][10:], 16)  # After the function selector
+            if value in self.server.failing_values:
+                return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32000, 'message': 'execution reverted'}}
+            result = '0x' + (value * 2).to_bytes(32, 'big').hex()
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def stub_node():
+    server = HTTPServer(('127.0.0.1', 0), StubNodeRequestHandler)
+    server.requests = list()
+    server.refuse_batches = False
+    server.failing_values = set()
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_reader(node: HTTPServer):
+    w3 = Web3(HTTPProvider(f'http://127.0.0.1:{node.server_port}'))
+    reader = BatchContractReader(blockchain=types.SimpleNamespace(w3=w3), block_identifier=7)
+    doubler = w3.eth.contract(address=DOUBLER_ADDRESS, abi=DOUBLER_ABI)
+    return reader, doubler
+
+
+def eth_calls(node: HTTPServer) -> list:
+    return [request for request in node.requests if isinstance(request, dict) and request['method'] == 'eth_call']
+
+
+def test_batch_reader_keeps_call_order(stub_node, mocker):
+    reader, doubler = make_reader(stub_node)
+    assert reader.supports_batching
+
+    # The node answers in reverse; results still come back in the order they were asked for.
+    assert reader.call_many(doubler.functions.double(value) for value in range(10)) == [value * 2 for value in range(10)]
+    assert reader.round_trips == 1
+    assert len(stub_node.requests) == 1
+    assert all(item['params'][1] == hex(7) for item in stub_node.requests[0])  # Pinned to the reader's block
+
+    # Long lists are split into several batches.
+    mocker.patch.object(BatchContractReader, 'MAX_BATCH_SIZE', 4)
+    assert reader.call_many(doubler.functions.double(value) for value in range(10)) == [value * 2 for value in range(10)]
+    assert reader.round_trips == 1 + 3
+    assert [len(batch) for batch in stub_node.requests[1:]] == [4, 4, 2]
+
+
+def test_batch_reader_reports_the_failed_call(stub_node):
+    reader, doubler = make_reader(stub_node)
+    stub_node.failing_values.add(3)
+    with pytest.raises(BatchContractReader.BatchCallFailed, match=r'double\(3,\).*execution reverted'):
+        reader.call_many(doubler.functions.double(value) for value in range(5))
+
+
+def test_batch_reader_falls_back_when_a_batch_is_refused(stub_node):
+    reader, doubler = make_reader(stub_node)
+    stub_node.refuse_batches = True
+
+    assert reader.call_many(doubler.functions.double(value) for value in range(5)) == [0, 2, 4, 6, 8]
+    assert isinstance(stub_node.requests[0], list)  # The batch was tried first...
+    assert len(eth_calls(stub_node)) == 5           # ...then each call was made on its own.
+    assert reader.round_trips == 1 + 5
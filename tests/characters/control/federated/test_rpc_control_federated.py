@@ -1,4 +1,16 @@
+import json
+import os
+import socket
+import stat
+import threading
+from io import BytesIO
+
+import msgpack
 import pytest
+import pytest_twisted
+from twisted.internet import threads
+
+from nucypher.crypto.kits import UmbralMessageKit
 
 
 def test_alice_rpc_character_control_create_policy(alice_rpc_test_client, create_policy_control_request):
@@ -76,3 +88,140 @@ def test_bob_rpc_character_control_retrieve(bob_rpc_controller, retrieve_control
     response = bob_rpc_controller.send(request_data)
     assert 'jsonrpc' in response.data
 
+
+def test_enrico_msgpack_rpc_character_control_encrypt_message(capsule_side_channel, encrypt_control_request):
+    rpc_controller = capsule_side_channel.enrico.make_rpc_controller(crash_on_error=True, binary=True)
+    responses = BytesIO()
+    rpc_controller.emitter.sink = responses.write
+
+    method_name, params = encrypt_control_request
+    request_data = {'jsonrpc': '2.0', 'id': 1, 'method': method_name, 'params': params}
+    size = rpc_controller.handle_request(control_request=msgpack.packb(request_data, use_bin_type=True))
+    assert size == len(responses.getvalue())
+
+    response = msgpack.unpackb(responses.getvalue(), raw=False)
+    assert response['id'] == '1'
+    assert UmbralMessageKit.from_bytes(response['result']['message_kit'])  # bytes, not base64
+
+    # Send bad data to assert error returns
+    responses.seek(0)
+    responses.truncate()
+    rpc_controller.handle_request(control_request=b'\xc1 is never valid msgpack')
+    response = msgpack.unpackb(responses.getvalue(), raw=False)
+    assert response['error']['code'] == '-32700'
+
+
+def test_enrico_msgpack_rpc_test_client(capsule_side_channel, encrypt_control_request):
+    rpc_controller = capsule_side_channel.enrico.make_rpc_controller(crash_on_error=True, binary=True)
+    test_client = rpc_controller.test_client()
+
+    method_name, params = encrypt_control_request
+    rpc_response = test_client.send(request={'method': method_name, 'params': params})
+    assert rpc_response.success is True
+    assert UmbralMessageKit.from_bytes(rpc_response.content['message_kit'])
+
+    # A batch gets a response per request.
+    rpc_responses = test_client.send(request=[{'method': method_name, 'params': params}] * 2)
+    assert len(rpc_responses) == 2
+    assert all(rpc_response.success for rpc_response in rpc_responses)
+
+
+@pytest_twisted.inlineCallbacks
+def test_alice_rpc_controller_responds_out_of_order(federated_alice, monkeypatch):
+    rpc_controller = federated_alice.make_rpc_controller(crash_on_error=True, workers=2)
+    responses = list()
+
+    def sink(response: str) -> int:
+        responses.append(json.loads(response))
+        return len(response)
+    emitter = rpc_controller.make_emitter(sink=sink)
+
+    # Hold up the first call until the second one has responded.
+    released = threading.Event()
+    public_keys = federated_alice.public_keys
+
+    def slow_public_keys(*args, **kwargs):
+        assert released.wait(timeout=10)
+        return public_keys(*args, **kwargs)
+    monkeypatch.setattr(federated_alice, 'public_keys', slow_public_keys)
+
+    slow_request = {'jsonrpc': '2.0', 'id': 1, 'method': 'public_keys'}
+    slow_call = rpc_controller.dispatch_request(control_request=json.dumps(slow_request), emitter=emitter)
+
+    batch = [{'jsonrpc': '2.0', 'id': request_id, 'method': 'derive_policy_encrypting_key', 'params': {'label': 'test'}}
+             for request_id in (2, 3, 4)]
+    batch_size = yield rpc_controller.dispatch_request(control_request=json.dumps(batch), emitter=emitter)
+    assert batch_size > 0
+    assert sorted(response['id'] for response in responses) == ['2', '3', '4']
+
+    released.set()
+    yield slow_call
+    assert responses[-1]['id'] == '1'
+    assert 'alice_verifying_key' in responses[-1]['result']
+
+
+@pytest_twisted.inlineCallbacks
+def test_alice_rpc_controller_errors_carry_request_ids(federated_alice):
+    rpc_controller = federated_alice.make_rpc_controller(crash_on_error=False)
+    responses = list()
+
+    def sink(response: str) -> int:
+        responses.append(json.loads(response))
+        return len(response)
+    emitter = rpc_controller.make_emitter(sink=sink)
+
+    batch = [{'jsonrpc': '2.0', 'id': 1, 'method': 'derive_policy_encrypting_key', 'params': {'label': 'test'}},
+             {'jsonrpc': '2.0', 'id': 2, 'method': 'derive_policy_encrypting_key', 'params': {}},
+             {'jsonrpc': '2.0', 'id': 3, 'method': 'no_such_method'},
+             {'jsonrpc': '2.0', 'id': 4, 'method': 'derive_policy_encrypting_key', 'params': {'label': 'test'}}]
+    yield rpc_controller.dispatch_request(control_request=json.dumps(batch), emitter=emitter)
+
+    # One failed call doesn't take the batch down with it, and the client can tell which one it was.
+    responses_by_id = {response['id']: response for response in responses}
+    assert set(responses_by_id) == {'1', '2', '3', '4'}
+    assert 'policy_encrypting_key' in responses_by_id['1']['result']
+    assert 'policy_encrypting_key' in responses_by_id['4']['result']
+    assert responses_by_id['2']['error']['code'] == '-32602'
+    assert responses_by_id['3']['error']['code'] == '-32601'
+
+    # A request whose ID can't be read gets an error without one.
+    responses.clear()
+    yield rpc_controller.dispatch_request(control_request=json.dumps({'jsonrpc': '2.0', 'method': 'public_keys'}),
+                                          emitter=emitter)
+    assert responses[0]['id'] is None
+    assert responses[0]['error']['code'] == '-32600'
+
+
+@pytest_twisted.inlineCallbacks
+def test_alice_rpc_controller_unix_socket(federated_alice, tmpdir):
+    rpc_controller = federated_alice.make_rpc_controller(crash_on_error=True)
+    socket_path = str(tmpdir.join('alice-rpc.sock'))
+
+    # A socket left behind by a controller that's gone is replaced.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(socket_path)
+    port = rpc_controller.make_socket_transport(socket_path=socket_path)
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+    def call(request: dict) -> dict:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(10)
+            client.connect(socket_path)
+            client.sendall(json.dumps(request).encode() + b'\n')
+            response = b''
+            while True:
+                received = client.recv(4096)
+                assert received, "The connection was closed before the response"
+                response += received
+                try:
+                    return json.loads(response)
+                except ValueError:
+                    continue
+
+    try:
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': 'derive_policy_encrypting_key', 'params': {'label': 'test'}}
+        response = yield threads.deferToThread(call, request)
+        assert response['id'] == '1'
+        assert bytes.fromhex(response['result']['policy_encrypting_key'])
+    finally:
+        yield port.stopListening()
@@ -3,8 +3,11 @@ import json
 from base64 import b64encode, b64decode
 
 import maya
+import msgpack
 import pytest
+from bytestring_splitter import BytestringSplitter, VariableLengthBytestring
 from click.testing import CliRunner
+from umbral.signing import Signature
 
 import nucypher
 from nucypher.crypto.kits import UmbralMessageKit
@@ -233,6 +236,31 @@ def test_enrico_web_character_control_encrypt_message(enrico_web_controller_test
     assert response.status_code == 400
 
 
+def test_enrico_web_character_control_encrypt_messages(enrico_web_controller_test_client):
+    messages = ['Welcome to flippering number %d.' % i for i in range(5)]
+
+    response = enrico_web_controller_test_client.post('/encrypt_messages', data=json.dumps({'messages': messages}))
+    assert response.status_code == 200
+
+    result = json.loads(response.data)['result']
+    assert len(result['message_kits']) == len(result['signatures']) == len(messages)
+    for message_kit in result['message_kits']:
+        assert UmbralMessageKit.from_bytes(b64decode(message_kit))
+
+    # Binary requests are answered with a stream of length-prefixed messagekits and their signatures.
+    payload = bytes().join(bytes(VariableLengthBytestring(bytes(m, encoding='utf-8'))) for m in messages)
+    response = enrico_web_controller_test_client.post('/encrypt_messages',
+                                                      data=payload,
+                                                      content_type='application/octet-stream')
+    assert response.status_code == 200
+    splitter = BytestringSplitter((UmbralMessageKit, VariableLengthBytestring), Signature)
+    assert len(splitter.repeat(response.data)) == len(messages)
+
+    # Send bad data to assert error return
+    response = enrico_web_controller_test_client.post('/encrypt_messages', data=json.dumps({'bad': 'input'}))
+    assert response.status_code == 400
+
+
 def test_web_character_control_lifecycle(alice_web_controller_test_client,
                                          bob_web_controller_test_client,
                                          enrico_web_controller_from_alice,
@@ -322,3 +350,77 @@ def test_web_character_control_lifecycle(alice_web_controller_test_client,
 
     for cleartext in bob_response_data['result']['cleartexts']:
         assert b64decode(cleartext.encode()).decode() == plaintext
+
+
+def test_web_character_control_msgpack(alice_web_controller_test_client,
+                                       enrico_web_controller_test_client,
+                                       federated_alice,
+                                       enacted_federated_policy):
+
+    # A JSON request can Accept a msgpack response, which carries keys as bytes.
+    response = alice_web_controller_test_client.get('/public_keys', headers={'Accept': 'application/msgpack'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    result = msgpack.unpackb(response.data, raw=False)['result']
+    assert result['alice_verifying_key'] == bytes(federated_alice.stamp)
+
+    # msgpack requests are answered in msgpack, with MessageKits and signatures as bytes rather than base64.
+    message = 'Welcome to flippering, without base64.'
+    request_data = msgpack.packb({'message': message}, use_bin_type=True)
+    response = enrico_web_controller_test_client.post('/encrypt_message',
+                                                      data=request_data,
+                                                      content_type='application/msgpack')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/msgpack'
+    result = msgpack.unpackb(response.data, raw=False)['result']
+    assert UmbralMessageKit.from_bytes(result['message_kit'])
+    assert Signature.from_bytes(result['signature'])
+
+    request_data = msgpack.packb({'label': enacted_federated_policy.label, 'message_kit': result['message_kit']},
+                                 use_bin_type=True)
+    response = alice_web_controller_test_client.post('/decrypt', data=request_data, content_type='application/msgpack')
+    assert response.status_code == 200
+    cleartexts = msgpack.unpackb(response.data, raw=False)['result']['cleartexts']
+    assert cleartexts == [b64encode(message.encode())]  # The same cleartexts as JSON, but as bytes
+
+    # Unless it only Accepts JSON
+    response = alice_web_controller_test_client.post('/decrypt',
+                                                     data=request_data,
+                                                     content_type='application/msgpack',
+                                                     headers={'Accept': 'application/json'})
+    assert response.status_code == 200
+    assert json.loads(response.data)['result']['cleartexts'] == [b64encode(message.encode()).decode()]
+
+    # Send bad data to assert error returns
+    response = alice_web_controller_test_client.post('/decrypt',
+                                                     data=b'\xc1 is never valid msgpack',
+                                                     content_type='application/msgpack')
+    assert response.status_code == 400
+
+
+def test_web_character_control_metrics(federated_alice):
+    controller = federated_alice.make_web_controller(crash_on_error=True)
+    test_client = controller.test_client()
+
+    # Disabled by default
+    response = test_client.get('/metrics')
+    assert response.status_code == 404
+
+    metrics = controller.enable_metrics()
+    public_keys_responses = [test_client.get('/public_keys') for _ in range(2)]
+    response = test_client.post('/decrypt', data=json.dumps({'bad': 'input'}))
+    assert response.status_code == 400
+
+    stats = metrics.stats()
+    assert stats['public_keys'].calls == 2
+    assert stats['public_keys'].errors == 0
+    assert stats['public_keys'].response_bytes == sum(len(response.data) for response in public_keys_responses)
+    assert sum(stats['public_keys'].latency_counts) == 2
+    assert stats['public_keys'].latency_sum > 0
+    assert stats['decrypt'].calls == stats['decrypt'].errors == 1
+
+    pytest.importorskip('prometheus_client')
+    response = test_client.get('/metrics')
+    assert response.status_code == 200
+    assert b'controller_latency_seconds_bucket' in response.data
+    assert b'method="public_keys"' in response.data
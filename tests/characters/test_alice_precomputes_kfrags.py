@@ -0,0 +1,94 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import datetime
+
+import maya
+import pytest
+from umbral.kfrags import KFrag
+
+from nucypher.crypto.pools import KFragPool
+from nucypher.crypto.powers import DecryptingPower, DelegatingPower
+
+
+def test_alice_uses_precomputed_kfrags(federated_alice, federated_bob):
+    label = b'a-grant-alice-saw-coming'
+
+    batch = federated_alice.precompute_kfrags(bob=federated_bob, label=label, m=2, n=3)
+    precomputed_public_key, precomputed_kfrags = batch.result(timeout=10)
+
+    policy = federated_alice.create_policy(bob=federated_bob,
+                                           label=label,
+                                           m=2,
+                                           n=3,
+                                           expiration=maya.now() + datetime.timedelta(days=5))
+
+    assert policy.public_key == precomputed_public_key
+    assert policy.kfrags == precomputed_kfrags
+    assert all(isinstance(kfrag, KFrag) for kfrag in policy.kfrags)
+
+    # The batch was claimed and can't be used for a second grant.
+    assert len(federated_alice.kfrag_pool) == 0
+    second_policy = federated_alice.create_policy(bob=federated_bob,
+                                                  label=label,
+                                                  m=2,
+                                                  n=3,
+                                                  expiration=maya.now() + datetime.timedelta(days=5))
+    assert second_policy.kfrags != precomputed_kfrags
+
+
+def test_kfrag_pool_limit(federated_alice, federated_bob):
+    pool = KFragPool(delegating_power=federated_alice._crypto_power.power_ups(DelegatingPower),
+                     signer=federated_alice.stamp,
+                     max_kfrags=5,
+                     evict=False)
+    bob_encrypting_key = federated_bob.public_keys(DecryptingPower)
+
+    pool.schedule(bob_encrypting_key, label=b'first', m=2, n=3)
+    with pytest.raises(KFragPool.PoolFull):
+        pool.schedule(bob_encrypting_key, label=b'second', m=2, n=3)
+
+    # With eviction, the oldest batch makes room for the new one.
+    pool.evict = True
+    pool.schedule(bob_encrypting_key, label=b'second', m=2, n=3)
+    assert pool.size == 3
+    assert pool.take(bob_encrypting_key, label=b'first', m=2, n=3) is None
+
+    public_key, kfrags = pool.take(bob_encrypting_key, label=b'second', m=2, n=3, timeout=10)
+    assert len(kfrags) == 3
+    assert pool.size == 0
+
+    pool.shutdown()
+
+
+def test_alice_shuts_down_kfrag_pool(federated_alice, federated_bob):
+    label = b'a-grant-alice-called-off'
+    batch = federated_alice.precompute_kfrags(bob=federated_bob, label=label, m=2, n=3)
+    pool = federated_alice.kfrag_pool
+    batch.result(timeout=10)
+
+    federated_alice.shutdown_kfrag_pool()
+    assert len(pool) == 0
+    _public_key, kfrags = batch.result()
+    assert kfrags == []  # The unclaimed KFrags were disposed of
+    with pytest.raises(RuntimeError):
+        pool.schedule(federated_bob.public_keys(DecryptingPower), label=label, m=2, n=3)
+
+    # A new pool is started for the next precomputed grant.
+    federated_alice.precompute_kfrags(bob=federated_bob, label=label, m=2, n=3).result(timeout=10)
+    assert federated_alice.kfrag_pool is not pool
+    federated_alice.shutdown_kfrag_pool()
@@ -217,6 +217,21 @@ def test_bob_can_issue_a_work_order_to_a_specific_ursula(enacted_federated_polic
     assert work_orders_from_bob[0].bob_signature == work_order.receipt_signature
 
 
+def test_ursula_refuses_a_replayed_work_order(federated_bob, federated_ursulas):
+    # In our last episode, Bob's single WorkOrder was served...
+    address, work_orders_by_capsule = list(federated_bob._completed_work_orders.by_ursula.items())[0]
+    work_order = list(work_orders_by_capsule.values())[0]
+    ursula = next(u for u in federated_ursulas if u.checksum_address == address)
+    path = f"/kFrag/{work_order.arrangement_id.hex()}/reencrypt"
+
+    # ...so sending the very same WorkOrder again gets nothing re-encrypted.
+    response = ursula.rest_app.test_client().post(path, data=work_order.payload())
+    assert response.status_code == 409
+
+    # Ursula still has just the one receipt.
+    assert len(ursula.work_orders(bob=federated_bob)) == 1
+
+
 def test_bob_can_use_cfrag_attached_to_completed_workorder(enacted_federated_policy,
                                                            federated_alice,
                                                            federated_bob,
@@ -1,4 +1,5 @@
 import datetime
+import io
 import os
 
 import maya
@@ -43,6 +44,54 @@ def test_federated_bob_full_retrieve_flow(federated_ursulas,
     assert b"Welcome to flippering number 1." == delivered_cleartexts[0]
 
 
+def test_federated_bob_retrieves_a_stream(federated_ursulas,
+                                          federated_bob,
+                                          federated_alice,
+                                          capsule_side_channel,
+                                          enacted_federated_policy):
+    treasure_map = enacted_federated_policy.treasure_map
+    federated_bob.treasure_maps[treasure_map.public_id()] = treasure_map
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+
+    enrico = capsule_side_channel.enrico
+    plaintext = os.urandom(100 * 1024 + 1)
+    stream = io.BytesIO()
+    enrico.encrypt_stream(io.BytesIO(plaintext), stream, chunk_size=16 * 1024)
+
+    retrieved = io.BytesIO()
+    federated_bob.retrieve_stream(stream.getvalue(),
+                                  retrieved,
+                                  enrico=enrico,
+                                  alice_verifying_key=federated_alice.stamp.as_umbral_pubkey(),
+                                  label=enacted_federated_policy.label)
+    assert retrieved.getvalue() == plaintext
+
+
+def test_federated_bob_retrieves_a_session_with_one_capsule_activation(federated_ursulas,
+                                                                       federated_bob,
+                                                                       federated_alice,
+                                                                       capsule_side_channel,
+                                                                       enacted_federated_policy,
+                                                                       mocker):
+    treasure_map = enacted_federated_policy.treasure_map
+    federated_bob.treasure_maps[treasure_map.public_id()] = treasure_map
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+
+    enrico = capsule_side_channel.enrico
+    messages = [b"heartbeat %d" % i for i in range(100)]
+    envelope = enrico.start_session().encrypt_messages(messages)
+
+    reencrypt = mocker.spy(federated_bob.network_middleware, 'reencrypt')
+    cleartexts = federated_bob.retrieve(envelope,
+                                        enrico=enrico,
+                                        alice_verifying_key=federated_alice.stamp.as_umbral_pubkey(),
+                                        label=enacted_federated_policy.label)
+    assert cleartexts == messages
+    assert reencrypt.call_count == treasure_map.m  # Not m for each message
+
+
 def test_bob_joins_policy_and_retrieves(federated_alice,
                                         federated_ursulas,
                                         certificates_tempdir,
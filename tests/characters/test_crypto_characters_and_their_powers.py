@@ -284,3 +284,28 @@ def test_alice_can_decrypt(federated_alice):
                                             decrypt=True,
                                             label=label)
     assert cleartext == message
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_alice_can_decrypt_messages_encrypted_in_a_batch(federated_alice, workers):
+    label = b"boring test label"
+    policy_pubkey = federated_alice.get_policy_encrypting_key_from_label(label)
+    enrico = Enrico(policy_encrypting_key=policy_pubkey)
+
+    messages = [b"boring test message #%d" % i for i in range(10)]
+    encrypted = list(enrico.encrypt_messages(messages, workers=workers, chunk_size=3))
+    assert len(encrypted) == len(messages)
+
+    # The worker processes are stopped when asked to, and started again as needed.
+    enrico.shutdown_encryption_pool()
+    encrypted = list(enrico.encrypt_messages(messages, workers=workers, chunk_size=3))
+    enrico.shutdown_encryption_pool()
+
+    # Results come back in the order of the messages.
+    for message, (message_kit, signature) in zip(messages, encrypted):
+        cleartext = federated_alice.verify_from(stranger=enrico,
+                                                message_kit=message_kit,
+                                                signature=signature,
+                                                decrypt=True,
+                                                label=label)
+        assert cleartext == message
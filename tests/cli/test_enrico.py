@@ -1,6 +1,12 @@
-from nucypher.cli.main import nucypher_cli
+import json
+from base64 import b64encode
+
+import pytest
 from umbral.keys import UmbralPrivateKey
 
+from nucypher.cli import actions
+from nucypher.cli.main import nucypher_cli
+
 
 def test_enrico_encrypt(click_runner):
     policy_encrypting_key = UmbralPrivateKey.gen_key().get_pubkey().to_bytes().hex()
@@ -24,3 +30,26 @@ def test_enrico_control_starts(click_runner):
     result = click_runner.invoke(nucypher_cli, run_args, catch_exceptions=False)
     assert result.exit_code == 0
     assert policy_encrypting_key in result.output
+
+
+def test_enrico_control_exports_metrics(click_runner, mocker):
+    pytest.importorskip('prometheus_client')
+    export_controller_metrics = mocker.spy(actions, 'export_controller_metrics')
+
+    policy_encrypting_key = UmbralPrivateKey.gen_key().get_pubkey().to_bytes().hex()
+    run_args = ('enrico', 'run',
+                '--policy-encrypting-key', policy_encrypting_key,
+                '--controller-metrics',
+                '--dry-run')
+    result = click_runner.invoke(nucypher_cli, run_args, catch_exceptions=False)
+    assert result.exit_code == 0
+
+    # The controller that was started measures its calls, and serves them at /metrics.
+    controller = export_controller_metrics.call_args[0][0]
+    test_client = controller.test_client()
+    request_data = {'message': b64encode(b"I'm bereaved, not a sap!").decode()}
+    assert test_client.post('/encrypt_message', data=json.dumps(request_data)).status_code == 200
+
+    response = test_client.get('/metrics')
+    assert response.status_code == 200
+    assert b'method="encrypt_message"' in response.data
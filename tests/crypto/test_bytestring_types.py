@@ -76,3 +76,30 @@ def test_message_kit_serialization_via_enrico(enacted_federated_policy, federate
     # Confirm
     assert message_kit_bytes == the_same_message_kit.to_bytes()
 
+
+
+def test_message_kit_zero_copy_serialization(enacted_federated_policy, federated_alice):
+    enrico = Enrico.from_alice(federated_alice, label=enacted_federated_policy.label)
+    plaintext_bytes = secure_random(10 * 1024)
+    message_kit, signature = enrico.encrypt_message(message=plaintext_bytes)
+
+    # The scatter list is the serialized kit, and it doesn't copy the ciphertext.
+    buffers = message_kit.to_buffers()
+    assert bytes().join(buffers) == message_kit.to_bytes()
+    assert buffers[-1] is message_kit.ciphertext
+
+    # Parsing from a buffer doesn't copy the ciphertext either.
+    received = bytearray(message_kit.to_bytes())
+    the_same_message_kit = UmbralMessageKit.from_buffer(received)
+    assert isinstance(the_same_message_kit.ciphertext, memoryview)
+    assert the_same_message_kit.ciphertext.obj is received
+    assert the_same_message_kit.to_bytes() == message_kit.to_bytes()
+
+    # ...and it can still be decrypted.
+    cleartext = federated_alice.verify_from(enrico, the_same_message_kit,
+                                            decrypt=True,
+                                            label=enacted_federated_policy.label)
+    assert cleartext == plaintext_bytes
+
+    with pytest.raises(BytestringSplittingError):
+        UmbralMessageKit.from_buffer(received[:-1])
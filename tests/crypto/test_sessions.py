@@ -0,0 +1,48 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from nucypher.characters.lawful import Enrico
+from nucypher.crypto.sessions import SessionEnvelope, SessionMessageKit
+from nucypher.crypto.signing import InvalidSignature
+
+LABEL = b"session test label"
+
+
+def test_session_envelope_serialization_and_decryption(federated_alice):
+    enrico = Enrico(policy_encrypting_key=federated_alice.get_policy_encrypting_key_from_label(LABEL))
+    session = enrico.start_session()
+    messages = [b"heartbeat %d" % i for i in range(20)]
+    envelope = session.encrypt_messages(messages)
+
+    # Every message of the session is under the same capsule.
+    assert envelope.id == session.id
+    assert len(envelope) == len(messages)
+
+    envelope = SessionEnvelope.from_bytes(bytes(envelope))
+    session_key = federated_alice.verify_from(enrico, envelope.header, decrypt=True, label=LABEL)
+    assert envelope.decrypt(session_key) == messages
+
+    # Messages can travel on their own, and be packed with the header later.
+    late_message = SessionMessageKit.from_bytes(bytes(session.encrypt_message(b"late heartbeat")))
+    assert late_message.index == len(messages)
+    assert session.envelope([late_message]).decrypt(session_key) == [b"late heartbeat"]
+
+    # Messages are signed by Enrico.
+    late_message.ciphertext = bytes(session.encrypt_message(b"forged heartbeat").ciphertext)
+    with pytest.raises(InvalidSignature):
+        session.envelope([late_message]).decrypt(session_key)
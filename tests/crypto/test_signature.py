@@ -20,7 +20,7 @@ from cryptography.hazmat.primitives import hashes
 from umbral.keys import UmbralPrivateKey
 
 from nucypher.crypto.api import ecdsa_sign, verify_ecdsa
-from nucypher.crypto.signing import Signature, Signer
+from nucypher.crypto.signing import Signature, Signer, VerificationMemo
 from nucypher.crypto.utils import recover_pubkey_from_signature, get_signature_recovery_value
 
 
@@ -92,3 +92,34 @@ def test_ecdsa_signature_recovery(execution_number):
                                                                  signature,
                                                                  pubkey,
                                                                  is_prehashed=True)
+
+
+def test_verification_memo():
+    privkey = UmbralPrivateKey.gen_key()
+    pubkey = privkey.get_pubkey()
+    signer = Signer(private_key=privkey)
+    message = b"peace at dawn"
+    signature = signer(message=message)
+
+    memo = VerificationMemo(max_size=2)
+    assert memo.verify(signature, message, pubkey, call_site='test')
+    assert memo.verify(signature, message, pubkey, call_site='test')
+    assert memo.hits['test'] == 1
+    assert memo.misses['test'] == 1
+    assert memo.hit_rate('test') == 0.5
+
+    # Failures are never remembered.
+    wrong_message = b"war at dusk"
+    assert not memo.verify(signature, wrong_message, pubkey, call_site='test')
+    assert not memo.verify(signature, wrong_message, pubkey, call_site='test')
+    assert len(memo) == 1
+
+    # Nor is a valid signature accepted for a different key.
+    other_pubkey = UmbralPrivateKey.gen_key().get_pubkey()
+    assert not memo.verify(signature, message, other_pubkey, call_site='elsewhere')
+    assert memo.stats() == {'test': (1, 3), 'elsewhere': (0, 1)}
+
+    # The memo is bounded.
+    for other_message in (b"one", b"two", b"three"):
+        assert memo.verify(signer(message=other_message), other_message, pubkey, call_site='test')
+    assert len(memo) == 2
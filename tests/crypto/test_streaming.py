@@ -0,0 +1,94 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import io
+import mmap
+import os
+
+import pytest
+
+from nucypher.characters.lawful import Enrico
+from nucypher.crypto.signing import InvalidSignature
+from nucypher.crypto.streaming import SIGNATURE_LENGTH, StreamCorrupted, StreamReader, decrypt_stream
+
+LABEL = b"streaming test label"
+CHUNK_SIZE = 1024
+
+
+@pytest.fixture(scope='module')
+def enrico(federated_alice):
+    return Enrico(policy_encrypting_key=federated_alice.get_policy_encrypting_key_from_label(LABEL))
+
+
+@pytest.fixture(scope='module')
+def open_as_alice(federated_alice, enrico):
+    def open_header(message_kit):
+        return federated_alice.verify_from(enrico, message_kit, decrypt=True, label=LABEL)
+    return open_header
+
+
+@pytest.mark.parametrize('size', (0, 1, CHUNK_SIZE, CHUNK_SIZE * 3 + 17))
+def test_stream_round_trip(enrico, open_as_alice, size):
+    plaintext = os.urandom(size)
+    stream = io.BytesIO()
+    enrico.encrypt_stream(io.BytesIO(plaintext), stream, chunk_size=CHUNK_SIZE)
+
+    decrypted = io.BytesIO()
+    decrypt_stream(stream.getvalue(), decrypted, open_header=open_as_alice)
+    assert decrypted.getvalue() == plaintext
+
+
+def test_stream_from_memory_mapped_file_with_random_access(enrico, open_as_alice, tmpdir):
+    plaintext = os.urandom(CHUNK_SIZE * 5 + 100)
+    plaintext_path, stream_path = str(tmpdir.join('plaintext')), str(tmpdir.join('stream'))
+    with open(plaintext_path, 'wb') as f:
+        f.write(plaintext)
+
+    with open(plaintext_path, 'rb') as f, open(stream_path, 'wb') as stream:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            enrico.encrypt_stream(mapped, stream, chunk_size=CHUNK_SIZE)
+
+    with open(stream_path, 'rb') as stream:
+        reader = StreamReader(stream, open_header=open_as_alice)
+        assert len(reader) == 6
+        assert reader.chunk(5) == plaintext[CHUNK_SIZE * 5:]
+        assert reader.chunk(2) == plaintext[CHUNK_SIZE * 2:CHUNK_SIZE * 3]
+        assert reader.read(CHUNK_SIZE - 10, 30) == plaintext[CHUNK_SIZE - 10:CHUNK_SIZE + 20]
+        with pytest.raises(IndexError):
+            reader.chunk(6)
+
+
+def test_tampered_streams_do_not_decrypt(enrico, open_as_alice):
+    plaintext = os.urandom(CHUNK_SIZE * 3)
+    stream = io.BytesIO()
+    enrico.encrypt_stream(io.BytesIO(plaintext), stream, chunk_size=CHUNK_SIZE)
+    stream_bytes = stream.getvalue()
+
+    # Flipping a bit of a chunk
+    tampered = bytearray(stream_bytes)
+    tampered[-SIGNATURE_LENGTH - 1] ^= 1
+    with pytest.raises(StreamCorrupted):
+        decrypt_stream(bytes(tampered), io.BytesIO(), open_header=open_as_alice)
+
+    # Dropping the last chunk (and keeping the signature)
+    truncated = stream_bytes[:-SIGNATURE_LENGTH - CHUNK_SIZE - 16] + stream_bytes[-SIGNATURE_LENGTH:]
+    with pytest.raises(StreamCorrupted):
+        decrypt_stream(truncated, io.BytesIO(), open_header=open_as_alice)
+
+    # A bad signature over an otherwise intact stream
+    forged = stream_bytes[:-SIGNATURE_LENGTH] + bytes(enrico.stamp(b"something else"))
+    with pytest.raises(InvalidSignature):
+        decrypt_stream(forged, io.BytesIO(), open_header=open_as_alice)
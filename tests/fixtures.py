@@ -35,7 +35,7 @@ from web3 import Web3
 
 from nucypher.blockchain.economics import StandardTokenEconomics
 from nucypher.blockchain.eth.actors import Staker, StakeHolder
-from nucypher.blockchain.eth.agents import NucypherTokenAgent
+from nucypher.blockchain.eth.agents import ContractAgency, NucypherTokenAgent, StakingEscrowAgent
 from nucypher.blockchain.eth.clients import NuCypherGethDevProcess
 from nucypher.blockchain.eth.constants import PREALLOCATION_ESCROW_CONTRACT_NAME
 from nucypher.blockchain.eth.deployers import (NucypherTokenDeployer,
@@ -474,6 +474,10 @@ def testerchain(_testerchain):
     snapshot = pyevm_backend.chain.get_canonical_block_by_number(0).hash
     pyevm_backend.revert_to_snapshot(snapshot)
 
+    # Contract addresses are reused after reverting; forget any cached stake distributions and call results.
+    StakingEscrowAgent.clear_staker_distributions()
+    ContractAgency.clear_call_caches()
+
     coinbase, *addresses = testerchain.client.accounts
 
     for address in addresses:
@@ -14,10 +14,19 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
+import os
 import pytest
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from threading import Thread
+
+from sqlalchemy.orm import sessionmaker
 
 from nucypher.keystore import keystore, keypairs
+from nucypher.keystore.collector import ExpiredArrangementCollector
+from nucypher.keystore.db import Base, create_datastore_engine
+from nucypher.keystore.db.models import Workorder
+from nucypher.keystore.threading import ThreadedSession
 
 
 @pytest.mark.usefixtures('testerchain')
@@ -75,3 +84,218 @@ def test_workorder_sqlite_keystore(test_keystore):
     deleted = test_keystore.del_workorders(arrangement_id)
     assert deleted > 0
     assert len(test_keystore.get_workorders(arrangement_id)) == 0
+
+
+def test_file_backed_datastore_engine(tmpdir):
+    db_filepath = str(tmpdir.join('ursula.db'))
+    engine = create_datastore_engine(db_filepath=db_filepath, pool_size=4)
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute("PRAGMA journal_mode").scalar() == 'wal'
+        assert connection.execute("PRAGMA synchronous").scalar() == 1  # NORMAL
+    assert engine.pool.size() == 4
+
+    # Every ThreadedSession on an engine shares one session factory.
+    with ThreadedSession(engine) as session:
+        first_registry = session
+    with ThreadedSession(engine) as session:
+        assert session is first_registry
+
+    # Sessions opened on different threads see the same in-memory database.
+    in_memory_engine = create_datastore_engine(db_filepath=':memory:')
+    Base.metadata.create_all(in_memory_engine)
+    in_memory_keystore = keystore.KeyStore(in_memory_engine)
+
+    bob_keypair_sig = keypairs.SigningKeypair(generate_keys_if_needed=True)
+
+    def save_on_another_thread():
+        with ThreadedSession(in_memory_engine) as thread_session:
+            in_memory_keystore.save_workorder(bob_keypair_sig.pubkey, b'test', b'arrangement', session=thread_session)
+
+    worker = Thread(target=save_on_another_thread)
+    worker.start()
+    worker.join()
+
+    with ThreadedSession(in_memory_engine) as session:
+        assert len(in_memory_keystore.get_workorders(b'arrangement', session=session)) == 1
+
+
+def test_in_memory_datastore_serializes_transactions():
+    engine = create_datastore_engine(db_filepath=':memory:')
+    with engine.begin() as connection:
+        connection.execute("CREATE TABLE entries (entry TEXT)")
+    Session = sessionmaker(bind=engine)
+
+    # However a statement is written, it's part of this session's transaction, which is now open...
+    mine = Session()
+    mine.execute("-- Mine\nWITH new(entry) AS (SELECT 'mine') INSERT INTO entries SELECT entry FROM new")
+
+    seen = list()
+
+    def read_write_and_roll_back():
+        theirs = Session()
+        seen.extend(tuple(row) for row in theirs.execute("SELECT entry FROM entries"))
+        theirs.execute("INSERT INTO entries VALUES ('theirs')")
+        theirs.rollback()
+        theirs.close()
+
+    # ...so another thread's session waits for it to end, even just to read,
+    another_thread = Thread(target=read_write_and_roll_back)
+    another_thread.start()
+    another_thread.join(timeout=0.2)
+    assert another_thread.is_alive()
+    mine.commit()
+    another_thread.join()
+    assert seen == [('mine',)]
+
+    # and rolling its own transaction back doesn't undo this one.
+    assert [tuple(row) for row in mine.execute("SELECT entry FROM entries")] == [('mine',)]
+    mine.close()
+
+
+def test_workorder_ledger_group_commits(tmpdir):
+    engine = create_datastore_engine(db_filepath=str(tmpdir.join('ledger.db')))
+    Base.metadata.create_all(engine)
+    ledger_keystore = keystore.KeyStore(engine)
+    ledger = ledger_keystore.workorder_ledger
+    ledger.flush_interval = 60  # Only flush when the batch fills up, or when asked to.
+    ledger.flush_size = 3
+
+    bob_keypair_sig = keypairs.SigningKeypair(generate_keys_if_needed=True)
+    bob_verifying_key = bytes(bob_keypair_sig.pubkey)
+
+    ledger_keystore.record_workorder(bob_verifying_key, b'receipt-0', b'arrangement')
+    assert len(ledger) == 1
+
+    # Readers see pending receipts, because reading flushes the ledger first.
+    assert len(ledger_keystore.get_workorders(b'arrangement')) == 1
+    assert len(ledger) == 0
+    assert ledger.flushes == 1
+
+    # Filling a batch wakes the background flusher, which commits it in one transaction.
+    for receipt in (b'receipt-1', b'receipt-2', b'receipt-3'):
+        ledger_keystore.record_workorder(bob_verifying_key, receipt, b'arrangement')
+    for _ in range(100):
+        if ledger.flushed == 4:
+            break
+        time.sleep(0.05)
+    assert ledger.flushes == 2
+    assert len(ledger) == 0
+
+    # A replayed receipt is dropped without losing the rest of its batch.
+    ledger_keystore.record_workorder(bob_verifying_key, b'receipt-3', b'arrangement')
+    ledger_keystore.record_workorder(bob_verifying_key, b'receipt-4', b'arrangement')
+
+    # Stopping writes whatever is still pending.
+    ledger.stop()
+    assert not ledger.running
+    assert len(ledger) == 0
+    assert len(ledger_keystore.get_workorders(b'arrangement')) == 5
+
+
+def test_workorder_ledger_exit_hook(tmpdir, mocker):
+    register = mocker.patch('nucypher.keystore.ledger.atexit.register')
+    unregister = mocker.patch('nucypher.keystore.ledger.atexit.unregister')
+    engine = create_datastore_engine(db_filepath=str(tmpdir.join('exit.db')))
+    Base.metadata.create_all(engine)
+    ledger = keystore.KeyStore(engine).workorder_ledger
+    bob_verifying_key = bytes(keypairs.SigningKeypair(generate_keys_if_needed=True).pubkey)
+
+    # The ledger is stopped at exit if it's still running then...
+    for receipt in (b'receipt-0', b'receipt-1'):
+        ledger.append(bob_verifying_key, receipt, b'arrangement')
+    register.assert_called_once_with(ledger.stop)
+
+    # ...but once it's stopped, nothing holds on to it (nor its datastore) until then.
+    ledger.stop()
+    unregister.assert_called_once_with(ledger.stop)
+
+
+def test_workorder_reservations_catch_replays(tmpdir):
+    engine = create_datastore_engine(db_filepath=str(tmpdir.join('replays.db')))
+    Base.metadata.create_all(engine)
+    replay_keystore = keystore.KeyStore(engine)
+    replay_keystore.workorder_ledger.flush_interval = 60
+    bob_verifying_key = bytes(keypairs.SigningKeypair(generate_keys_if_needed=True).pubkey)
+
+    # A work order being served can't be served again...
+    assert replay_keystore.reserve_workorder(b'receipt-0')
+    assert not replay_keystore.reserve_workorder(b'receipt-0')
+
+    # ...nor while its receipt is pending, nor once it's committed.
+    replay_keystore.record_workorder(bob_verifying_key, b'receipt-0', b'arrangement')
+    assert not replay_keystore.reserve_workorder(b'receipt-0')
+    assert replay_keystore.count_workorders() == 1
+    assert not replay_keystore.reserve_workorder(b'receipt-0')
+
+    # One that wasn't served after all can be tried again.
+    assert replay_keystore.reserve_workorder(b'receipt-1')
+    replay_keystore.release_workorder(b'receipt-1')
+    assert replay_keystore.reserve_workorder(b'receipt-1')
+    replay_keystore.workorder_ledger.stop()
+
+
+def test_workorder_counting_and_paging(tmpdir):
+    engine = create_datastore_engine(db_filepath=str(tmpdir.join('paging.db')))
+    Base.metadata.create_all(engine)
+    paging_keystore = keystore.KeyStore(engine)
+
+    bob_keypair_sig1 = keypairs.SigningKeypair(generate_keys_if_needed=True)
+    bob_keypair_sig2 = keypairs.SigningKeypair(generate_keys_if_needed=True)
+
+    for index in range(7):
+        paging_keystore.record_workorder(bytes(bob_keypair_sig1.pubkey), f'bob1-{index}'.encode(), b'arrangement1')
+    for index in range(3):
+        paging_keystore.record_workorder(bytes(bob_keypair_sig2.pubkey), f'bob2-{index}'.encode(), b'arrangement2')
+
+    assert paging_keystore.count_workorders() == 10
+    assert paging_keystore.count_workorders(arrangement_id=b'arrangement2') == 3
+    assert paging_keystore.count_workorders(bob_verifying_key=bytes(bob_keypair_sig1.pubkey)) == 7
+    unknown_bob = keypairs.SigningKeypair(generate_keys_if_needed=True)
+    assert paging_keystore.count_workorders(bob_verifying_key=bytes(unknown_bob.pubkey)) == 0
+
+    paged = list(paging_keystore.iter_workorders(page_size=3))
+    assert [workorder.id for workorder in paged] == sorted(w.id for w in paging_keystore.get_workorders())
+    paged_for_bob = list(paging_keystore.iter_workorders(bob_verifying_key=bytes(bob_keypair_sig2.pubkey), page_size=2))
+    assert {workorder.bob_signature for workorder in paged_for_bob} == {b'bob2-0', b'bob2-1', b'bob2-2'}
+
+    # Every lookup column is indexed.
+    indexed_columns = {column.name for index in Workorder.__table__.indexes for column in index.columns}
+    assert {'arrangement_id', 'bob_verifying_key_id', 'created_at'} <= indexed_columns
+    paging_keystore.workorder_ledger.stop()
+
+
+def test_expired_arrangement_collector(tmpdir):
+    engine = create_datastore_engine(db_filepath=str(tmpdir.join('collector.db')))
+    Base.metadata.create_all(engine)
+    collecting_keystore = keystore.KeyStore(engine)
+    collector = ExpiredArrangementCollector(datastore=collecting_keystore, batch_size=2)
+
+    now = datetime.utcnow()
+    alices = [keypairs.SigningKeypair(generate_keys_if_needed=True) for _ in range(2)]
+    bob_keypair_sig = keypairs.SigningKeypair(generate_keys_if_needed=True)
+
+    # The first Alice's arrangements have all expired; the second's have not.
+    for index in range(5):
+        for alice, expiration in ((alices[0], now - timedelta(days=1)), (alices[1], now + timedelta(days=1))):
+            arrangement_id = os.urandom(16)
+            collecting_keystore.add_policy_arrangement(expiration,
+                                                       id=arrangement_id.hex().encode(),
+                                                       kfrag=os.urandom(64),
+                                                       alice_verifying_key=alice.pubkey)
+            collecting_keystore.record_workorder(bytes(bob_keypair_sig.pubkey), os.urandom(32), arrangement_id)
+
+    assert collecting_keystore.count_workorders() == 10
+
+    reclaimed = collector.collect(now=now)
+    assert reclaimed['arrangements'] == 5
+    assert reclaimed['workorders'] == 5
+    assert reclaimed['keys'] == 1  # Only the first Alice's key is no longer referenced
+    assert collecting_keystore.count_workorders() == 5
+
+    # Nothing left to collect
+    assert collector.collect(now=now)['arrangements'] == 0
+    assert collector.reclaimed_arrangements == 5
+    assert collector.runs == 2
+    collecting_keystore.workorder_ledger.stop()
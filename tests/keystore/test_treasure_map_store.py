@@ -0,0 +1,88 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from nucypher.keystore import keystore
+from nucypher.keystore.collector import ExpiredArrangementCollector
+from nucypher.keystore.db import Base, create_datastore_engine
+from nucypher.keystore.treasure_maps import TreasureMapStore
+
+
+@pytest.fixture(scope='function')
+def map_keystore(tmpdir):
+    engine = create_datastore_engine(db_filepath=str(tmpdir.join('maps.db')))
+    Base.metadata.create_all(engine)
+    yield keystore.KeyStore(engine)
+
+
+def test_treasure_map_store_serves_stored_bytes(map_keystore):
+    store = TreasureMapStore(datastore=map_keystore, cache_bytes=1000)
+    map_id, payload = os.urandom(32), os.urandom(600)
+
+    assert map_id not in store
+    assert store.store(map_id, payload) is True
+    assert store.get_bytes(map_id) == payload
+    assert len(store) == 1
+
+    # Publishing the very same map again doesn't write anything.
+    assert store.store(map_id, payload) is False
+    assert store.duplicates == 1
+
+    # A different map under the same ID replaces the stored one.
+    new_payload = os.urandom(600)
+    assert store.store(map_id, new_payload) is True
+    assert store.get_bytes(map_id) == new_payload
+
+    # The cache only holds what fits in its byte budget; the rest is read back from disk.
+    other_map_id, other_payload = os.urandom(32), os.urandom(600)
+    store.store(other_map_id, other_payload)
+    store.clear_cache()
+    assert store.get_bytes(map_id) == new_payload
+    assert store.get_bytes(other_map_id) == other_payload
+    assert len(store) == 2
+
+    # Nothing is lost across restarts.
+    restarted_store = TreasureMapStore(datastore=map_keystore)
+    assert restarted_store.get_bytes(other_map_id) == other_payload
+
+
+def test_treasure_maps_expire(map_keystore):
+    store = TreasureMapStore(datastore=map_keystore, ttl=timedelta(days=1))
+    map_id, payload = os.urandom(32), os.urandom(100)
+    store.store(map_id, payload)
+
+    collector = ExpiredArrangementCollector(datastore=map_keystore)
+    assert collector.collect(now=datetime.utcnow())['treasure_maps'] == 0
+    assert collector.collect(now=datetime.utcnow() + timedelta(days=2))['treasure_maps'] == 1
+
+    store.clear_cache()
+    with pytest.raises(KeyError):
+        store.get_bytes(map_id)
+    assert len(store) == 0
+
+
+def test_ursula_stores_published_treasure_maps(enacted_federated_policy, federated_ursulas):
+    treasure_map = enacted_federated_policy.treasure_map
+    treasure_map_index = bytes.fromhex(treasure_map.public_id())
+
+    for ursula in federated_ursulas:
+        assert isinstance(ursula.treasure_maps, TreasureMapStore)
+        assert ursula.treasure_maps.get_bytes(treasure_map_index) == bytes(treasure_map)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares the JSON (with base64) and msgpack transports of the web character controllers:
+requests per second, latency and bytes on the wire of Enrico's encrypt_message and Alice's decrypt.
+
+Usage: python3 tests/metrics/controller_transport_benchmark.py [REQUESTS] [MESSAGE_SIZE]
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from base64 import b64encode
+
+import msgpack
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from reencryption_benchmark import make_policy, make_ursulas  # noqa: E402
+
+from nucypher.characters.lawful import Enrico  # noqa: E402
+
+DEFAULT_REQUESTS = 500
+DEFAULT_MESSAGE_SIZE = 16 * 1024  # bytes
+
+TRANSPORTS = {
+    'JSON': ('application/json', json.dumps, json.loads),
+    'msgpack': ('application/msgpack', lambda data: msgpack.packb(data, use_bin_type=True),
+                lambda data: msgpack.unpackb(data, raw=False)),
+}
+
+
+def measure(test_client, endpoint: str, request_data: dict, transport: str, requests: int):
+    content_type, serialize, deserialize = TRANSPORTS[transport]
+    latencies, wire_bytes = list(), 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        request_start = time.perf_counter()
+        body = serialize(request_data)
+        response = test_client.post(endpoint, data=body, content_type=content_type)
+        assert response.status_code == 200, response.data
+        deserialize(response.data)
+        latencies.append(time.perf_counter() - request_start)
+        wire_bytes += len(body) + len(response.data)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return requests / elapsed, latencies, wire_bytes / requests
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    message_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MESSAGE_SIZE
+
+    alice, _bob, policy = make_policy(make_ursulas(), label=b'controller-transport-benchmark')
+    enrico = Enrico(policy_encrypting_key=policy.public_key)
+    alice_client = alice.make_web_controller(crash_on_error=True).test_client()
+    enrico_client = enrico.make_web_controller(crash_on_error=True).test_client()
+
+    message = os.urandom(message_size // 2).hex()
+    message_kit, _signature = enrico.encrypt_message(message.encode())
+    cases = (
+        ('Enrico /encrypt_message', enrico_client, '/encrypt_message', {
+            'JSON': {'message': message},
+            'msgpack': {'message': message},
+        }),
+        ('Alice /decrypt', alice_client, '/decrypt', {
+            'JSON': {'label': policy.label.decode(), 'message_kit': b64encode(message_kit.to_bytes()).decode()},
+            'msgpack': {'label': policy.label, 'message_kit': message_kit.to_bytes()},
+        }),
+    )
+
+    print(f"{requests} requests of {message_size} byte messages, per endpoint and transport ...")
+    print(f"{'':<26} {'':<8} {'req/s':>8} {'median ms':>10} {'p99 ms':>8} {'bytes/req':>10}")
+    for name, test_client, endpoint, request_data in cases:
+        for transport in TRANSPORTS:
+            rate, latencies, wire_bytes = measure(test_client, endpoint, request_data[transport], transport, requests)
+            print(f"{name:<26} {transport:<8} {rate:>8.1f} {statistics.median(latencies) * 1000:>10.2f} "
+                  f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>8.2f} {wire_bytes:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
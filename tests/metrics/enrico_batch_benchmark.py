@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures messages encrypted per second by Enrico, one message per call to `encrypt_message`
+and in batches through `encrypt_messages`, by batch size and number of worker processes.
+
+Usage: python3 tests/metrics/enrico_batch_benchmark.py [MESSAGES] [MESSAGE_SIZE]
+"""
+
+import os
+import sys
+import time
+
+from umbral.keys import UmbralPrivateKey
+
+from nucypher.characters.lawful import Enrico
+
+DEFAULT_MESSAGES = 2000
+DEFAULT_MESSAGE_SIZE = 256  # bytes
+BATCH_SIZES = (10, 100, 1000)
+
+
+def worker_counts():
+    counts, workers = list(), 1
+    while workers < os.cpu_count():
+        counts.append(workers)
+        workers *= 2
+    counts.append(os.cpu_count())
+    return counts
+
+
+def main():
+    number_of_messages = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MESSAGES
+    message_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_MESSAGE_SIZE
+
+    enrico = Enrico(policy_encrypting_key=UmbralPrivateKey.gen_key().get_pubkey(), controller=False)
+    messages = [os.urandom(message_size) for _ in range(number_of_messages)]
+
+    start = time.perf_counter()
+    for message in messages:
+        enrico.encrypt_message(message)
+    baseline = number_of_messages / (time.perf_counter() - start)
+    print(f"encrypt_message, one at a time: {baseline:10.1f} messages/s")
+
+    print(f"{'batch size':>10} {'workers':>8} {'messages/s':>12} {'speedup':>8}")
+    for batch_size in BATCH_SIZES:
+        for workers in worker_counts():
+            list(enrico.encrypt_messages_to_bytes(messages[:batch_size], workers=workers))  # Warm up the pool
+
+            start = time.perf_counter()
+            for offset in range(0, number_of_messages, batch_size):
+                for _encrypted in enrico.encrypt_messages_to_bytes(messages[offset:offset + batch_size], workers=workers):
+                    pass
+            rate = number_of_messages / (time.perf_counter() - start)
+            print(f"{batch_size:>10} {workers:>8} {rate:>12.1f} {rate / baseline:>7.2f}x")
+    enrico.shutdown_encryption_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures time and peak memory of serializing and parsing MessageKits of 1 KB to 100 MB: by
+concatenation and with BytestringKwargifier (as before), and with `to_bytes` / `to_buffers`
+and `from_buffer`.
+
+Usage: python3 tests/metrics/messagekit_serialization_benchmark.py [REPETITIONS]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+from bytestring_splitter import VariableLengthBytestring
+from umbral import pre
+from umbral.keys import UmbralPrivateKey
+
+from nucypher.crypto.kits import UmbralMessageKit
+
+SIZES = (1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2)
+DEFAULT_REPETITIONS = 3
+
+
+def concatenated(message_kit):
+    as_bytes = bytes(message_kit.capsule)
+    as_bytes += bytes(message_kit.sender_verifying_key)
+    as_bytes += VariableLengthBytestring(message_kit.ciphertext)
+    return as_bytes
+
+
+def kwargified(message_kit_bytes):
+    return UmbralMessageKit.splitter()(message_kit_bytes)
+
+
+def measure(f, argument, repetitions: int):
+    """Returns the best time and the peak memory allocated beyond the argument, in MB."""
+    best = float('inf')
+    for _ in range(repetitions):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = f(argument)
+        best = min(best, time.perf_counter() - start)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+    return best, peak / 1024 ** 2
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REPETITIONS
+    signing_key = UmbralPrivateKey.gen_key()
+    public_key = UmbralPrivateKey.gen_key().get_pubkey()
+
+    print(f"{'size':>8} {'operation':<34} {'ms':>10} {'peak MB':>9}")
+    for size in SIZES:
+        ciphertext, capsule = pre.encrypt(public_key, os.urandom(size))
+        message_kit = UmbralMessageKit(capsule=capsule,
+                                       sender_verifying_key=signing_key.get_pubkey(),
+                                       ciphertext=ciphertext)
+        message_kit_bytes = message_kit.to_bytes()
+
+        operations = (('serialize: concatenation (before)', concatenated, message_kit),
+                      ('serialize: to_bytes', UmbralMessageKit.to_bytes, message_kit),
+                      ('serialize: to_buffers', UmbralMessageKit.to_buffers, message_kit),
+                      ('parse: BytestringKwargifier (before)', kwargified, message_kit_bytes),
+                      ('parse: from_buffer', UmbralMessageKit.from_buffer, message_kit_bytes))
+        for name, f, argument in operations:
+            seconds, peak = measure(f, argument, repetitions)
+            print(f"{size // 1024:>6}KB {name:<34} {seconds * 1000:>10.3f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures TLS handshakes and round trip times of NucypherMiddlewareClient requests against a
+local fleet of Ursulas, with a fresh connection per request (as before connection pooling)
+and with pooled keep-alive connections.
+
+Usage: python3 tests/metrics/middleware_connection_benchmark.py [REQUESTS_PER_NODE]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+from cryptography.hazmat.primitives import serialization
+from twisted.internet import reactor
+from twisted.internet.defer import maybeDeferred
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from reencryption_benchmark import make_ursulas  # noqa: E402
+
+from nucypher.network.async_server import AsyncRESTServer  # noqa: E402
+from nucypher.network.middleware import NucypherMiddlewareClient  # noqa: E402
+
+DEFAULT_REQUESTS_PER_NODE = 100
+
+
+class UnpooledMiddlewareClient(NucypherMiddlewareClient):
+    """Connects afresh for every request, like the client did before connection pooling."""
+
+    def parse_node_or_host_and_port(self, node, host, port):
+        host, certificate_filepath, _session = super().parse_node_or_host_and_port(node, host, port)
+        return host, certificate_filepath, requests
+
+
+def on_reactor(f, *args):
+    done, result = threading.Event(), list()
+
+    def call():
+        d = maybeDeferred(f, *args)
+        d.addBoth(result.append)
+        d.addBoth(lambda _: done.set())
+
+    reactor.callFromThread(call)
+    done.wait()
+    return result[0]
+
+
+def measure(client: NucypherMiddlewareClient, fleet, requests_per_node: int):
+    round_trips = list()
+    for _ in range(requests_per_node):
+        for ursula, certificate_filepath in fleet:
+            start = time.perf_counter()
+            client.node_information(ursula.rest_interface.host,
+                                    ursula.rest_interface.port,
+                                    certificate_filepath=certificate_filepath)
+            round_trips.append(time.perf_counter() - start)
+    return round_trips
+
+
+def main():
+    requests_per_node = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS_PER_NODE
+    threading.Thread(target=reactor.run, kwargs=dict(installSignalHandlers=False), daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        fleet, ports = list(), list()
+        for ursula in make_ursulas(db_dir=temp_dir):
+            certificate_filepath = os.path.join(temp_dir, f'{ursula.checksum_address}.pem')
+            with open(certificate_filepath, 'wb') as f:
+                f.write(ursula.certificate.public_bytes(serialization.Encoding.PEM))
+            fleet.append((ursula, certificate_filepath))
+            server = AsyncRESTServer(ursula=ursula, reencryption_processes=0)
+            ports.append(on_reactor(server.listen))
+
+        total = requests_per_node * len(fleet)
+        print(f"Sending {total} requests to {len(fleet)} local Ursulas ...")
+        for name, client in (('Unpooled', UnpooledMiddlewareClient()), ('Pooled', NucypherMiddlewareClient())):
+            round_trips = measure(client, fleet, requests_per_node)
+            if isinstance(client, UnpooledMiddlewareClient):
+                handshakes = total
+            else:
+                handshakes, _requests_sent = client.sessions.stats()
+            round_trips.sort()
+            print(f"{name:<10} handshakes {handshakes:6}    "
+                  f"median RTT {statistics.median(round_trips) * 1000:7.2f} ms    "
+                  f"p99 RTT {round_trips[int(len(round_trips) * 0.99) - 1] * 1000:7.2f} ms")
+            client.sessions.close()
+
+        for port in ports:
+            on_reactor(port.stopListening)
+    reactor.callFromThread(reactor.stop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures re-encryption requests per second served by a single federated Ursula.
+
+Work orders are prepared ahead of time and then posted concurrently to
+`/kFrag/<id>/reencrypt` through the Flask test client, so the numbers reflect the
+server side of the request (verification, re-encryption and datastore writes) only.
+
+Usage: python3 tests/metrics/reencryption_benchmark.py [REQUESTS] [THREADS] [--in-memory]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import maya
+
+from nucypher.characters.lawful import Enrico
+from nucypher.config.characters import AliceConfiguration, BobConfiguration, UrsulaConfiguration
+from nucypher.crypto.powers import DecryptingPower
+from nucypher.utilities.sandbox.constants import (MOCK_KNOWN_URSULAS_CACHE,
+                                                  MOCK_URSULA_DB_FILEPATH,
+                                                  MOCK_URSULA_STARTING_PORT,
+                                                  TEMPORARY_DOMAIN)
+from nucypher.utilities.sandbox.middleware import MockRestMiddleware
+
+DEFAULT_REQUESTS = 500
+DEFAULT_THREADS = 10  # Twisted's default WSGI threadpool size
+NUMBER_OF_URSULAS = 3
+M, N = 2, 3
+
+
+def make_ursulas(db_dir: str = None):
+    config = UrsulaConfiguration(dev_mode=True,
+                                 domains={TEMPORARY_DOMAIN},
+                                 start_learning_now=False,
+                                 abort_on_learning_error=True,
+                                 federated_only=True,
+                                 network_middleware=MockRestMiddleware(),
+                                 save_metadata=False,
+                                 reload_metadata=False)
+    ursulas = set()
+    for index in range(NUMBER_OF_URSULAS):
+        port = MOCK_URSULA_STARTING_PORT + 100 + index
+        if db_dir:
+            db_filepath = os.path.join(db_dir, f'ursula-{port}.db')
+        else:
+            db_filepath = MOCK_URSULA_DB_FILEPATH
+        ursula = config.produce(rest_port=port, db_filepath=db_filepath)
+        MOCK_KNOWN_URSULAS_CACHE[port] = ursula
+        ursulas.add(ursula)
+    return ursulas
+
+
+def make_policy(ursulas, label: bytes):
+    alice = AliceConfiguration(dev_mode=True,
+                               domains={TEMPORARY_DOMAIN},
+                               network_middleware=MockRestMiddleware(),
+                               known_nodes=ursulas,
+                               federated_only=True,
+                               abort_on_learning_error=True,
+                               save_metadata=False,
+                               reload_metadata=False).produce()
+
+    bob = BobConfiguration(dev_mode=True,
+                           domains={TEMPORARY_DOMAIN},
+                           network_middleware=MockRestMiddleware(),
+                           known_nodes=ursulas,
+                           start_learning_now=False,
+                           abort_on_learning_error=True,
+                           federated_only=True,
+                           save_metadata=False,
+                           reload_metadata=False).produce()
+
+    policy = alice.grant(bob,
+                         label=label,
+                         m=M,
+                         n=N,
+                         expiration=maya.now().add(days=1),
+                         handpicked_ursulas=ursulas)
+    return alice, bob, policy
+
+
+def prepare_work_orders(ursulas, quantity: int):
+    alice, bob, policy = make_policy(ursulas, label=b'reencryption-benchmark')
+    enrico = Enrico(policy_encrypting_key=policy.public_key)
+    alice_verifying_key = alice.stamp.as_umbral_pubkey()
+
+    work_orders = list()
+    while len(work_orders) < quantity:
+        message_kit, _signature = enrico.encrypt_message(b'Welcome to flippering.')
+        capsule = message_kit.capsule
+        capsule.set_correctness_keys(delegating=policy.public_key,
+                                     receiving=bob.public_keys(DecryptingPower),
+                                     verifying=alice_verifying_key)
+        new_work_orders, _complete = bob.work_orders_for_capsules(capsule,
+                                                                  treasure_map=policy.treasure_map,
+                                                                  alice_verifying_key=alice_verifying_key)
+        work_orders.extend(new_work_orders.values())
+    return work_orders[:quantity]
+
+
+def benchmark(work_orders, threads: int) -> float:
+    """Posts every work order to its Ursula from `threads` concurrent clients; returns requests per second."""
+
+    def reencrypt(work_order):
+        client = work_order.ursula.rest_app.test_client()
+        response = client.post(f'/kFrag/{work_order.arrangement_id.hex()}/reencrypt', data=work_order.payload())
+        assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(reencrypt, work_orders))
+    elapsed = time.perf_counter() - start
+    return len(work_orders) / elapsed
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    in_memory = '--in-memory' in sys.argv
+    requests = int(args[0]) if args else DEFAULT_REQUESTS
+    threads = int(args[1]) if len(args) > 1 else DEFAULT_THREADS
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        ursulas = make_ursulas(db_dir=None if in_memory else db_dir)
+        print(f"Preparing {requests} work orders ...")
+        work_orders = prepare_work_orders(ursulas, quantity=requests)
+
+        print(f"Sending {requests} re-encryption requests from {threads} threads "
+              f"({'in-memory' if in_memory else 'file-backed'} datastore) ...")
+        requests_per_second = benchmark(work_orders, threads=threads)
+        print(f"{requests_per_second:.1f} requests/second")
+
+
+if __name__ == "__main__":
+    main()
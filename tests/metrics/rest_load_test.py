@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares Ursula's REST throughput and latency under the WSGI server (the Flask app in
+Twisted's threadpool, as Hendrix serves it) and the Twisted-native AsyncRESTServer.
+
+Both servers listen over TLS on localhost and are driven by concurrent HTTPS clients
+with a mix of public information, node metadata, TreasureMap and re-encryption requests.
+
+Usage: python3 tests/metrics/rest_load_test.py [REQUESTS] [CLIENTS]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from itertools import cycle
+
+import requests
+import urllib3
+from twisted.internet import reactor
+from twisted.internet.defer import maybeDeferred
+from twisted.web.server import Site
+from twisted.web.wsgi import WSGIResource
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from reencryption_benchmark import make_ursulas, prepare_work_orders  # noqa: E402
+
+from nucypher.keystore.db.models import TreasureMapRecord  # noqa: E402
+from nucypher.keystore.threading import session_registry  # noqa: E402
+from nucypher.network.async_server import AsyncRESTServer  # noqa: E402
+
+DEFAULT_REQUESTS = 1000
+DEFAULT_CLIENTS = 50
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+
+def listen_wsgi(ursula, port: int):
+    server = AsyncRESTServer(ursula=ursula, reencryption_processes=0)
+    resource = WSGIResource(reactor, reactor.getThreadPool(), ursula.rest_app)
+    return reactor.listenSSL(port, Site(resource), server.tls_context_factory(), interface='127.0.0.1')
+
+
+def listen_async(ursula, port: int):
+    return AsyncRESTServer(ursula=ursula).listen(port=port, interface='127.0.0.1')
+
+
+def published_treasure_map_id(ursula) -> str:
+    with closing(session_registry(ursula.datastore.engine).session_factory()) as session:
+        map_id, = session.query(TreasureMapRecord.id).first()
+    return map_id.hex()
+
+
+def make_requests(treasure_map_id: str, work_orders, quantity: int):
+    """An even mix of the four request kinds, as (kind, method, path, body)."""
+    kinds = [('public_information', 'GET', '/public_information', None),
+             ('node_metadata', 'GET', '/node_metadata', None),
+             ('treasure_map', 'GET', f'/treasure_map/{treasure_map_id}', None)]
+    mix = list()
+    work_orders = cycle(work_orders)
+    while len(mix) < quantity:
+        mix.extend(kinds)
+        work_order = next(work_orders)
+        path = f'/kFrag/{work_order.arrangement_id.hex()}/reencrypt'
+        mix.append(('reencrypt', 'POST', path, work_order.payload()))
+    return mix[:quantity]
+
+
+def on_reactor(f, *args):
+    """Calls f on the reactor thread and waits for its (possibly deferred) result."""
+    done, result = threading.Event(), list()
+
+    def call():
+        d = maybeDeferred(f, *args)
+        d.addBoth(result.append)
+        d.addBoth(lambda _: done.set())
+
+    reactor.callFromThread(call)
+    done.wait()
+    return result[0]
+
+
+def run_load(port: int, mix, clients: int):
+    latencies = {kind: list() for kind, *_ in mix}
+    session = threading.local()
+
+    def send(request):
+        kind, method, path, body = request
+        if not hasattr(session, 'http'):
+            session.http = requests.Session()
+        start = time.perf_counter()
+        response = session.http.request(method, f'https://127.0.0.1:{port}{path}', data=body, verify=False)
+        latency = time.perf_counter() - start
+        assert response.status_code == 200, (kind, response.status_code)
+        return kind, latency
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for kind, latency in executor.map(send, mix):
+            latencies[kind].append(latency)
+    elapsed = time.perf_counter() - start
+    return len(mix) / elapsed, latencies
+
+
+def report(name: str, requests_per_second: float, latencies: dict) -> None:
+    print(f"\n{name}: {requests_per_second:.1f} requests/second")
+    for kind, samples in latencies.items():
+        samples.sort()
+        p99 = samples[int(len(samples) * 0.99) - 1]
+        print(f"    {kind:<20} median {statistics.median(samples) * 1000:8.1f} ms    p99 {p99 * 1000:8.1f} ms")
+
+
+def main():
+    requests_total = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CLIENTS
+
+    threading.Thread(target=reactor.run, kwargs=dict(installSignalHandlers=False), daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        ursulas = make_ursulas(db_dir=db_dir)
+        print("Preparing work orders ...")
+        work_orders = prepare_work_orders(ursulas, quantity=max(requests_total // 4, 1) * len(ursulas))
+        ursula = work_orders[0].ursula
+        work_orders = [work_order for work_order in work_orders if work_order.ursula is ursula]
+        mix = make_requests(published_treasure_map_id(ursula), work_orders, requests_total)
+        port = ursula.rest_interface.port
+
+        print(f"Sending {requests_total} requests from {clients} clients to each server ...")
+        for name, listen in (('WSGI (threadpool)', listen_wsgi), ('Twisted-native', listen_async)):
+            listening_port = on_reactor(listen, ursula, port)
+            requests_per_second, latencies = run_load(port, mix, clients)
+            report(name, requests_per_second, latencies)
+            on_reactor(listening_port.stopListening)
+
+    reactor.callFromThread(reactor.stop)
+
+
+if __name__ == "__main__":
+    main()
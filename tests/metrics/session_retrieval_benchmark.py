@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Compares the load on Ursulas of Bob retrieving small messages encrypted one MessageKit (and capsule)
+each, with retrieving the same messages encrypted in a session, under a single capsule.
+
+Usage: python3 tests/metrics/session_retrieval_benchmark.py [MESSAGES]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from reencryption_benchmark import make_policy, make_ursulas  # noqa: E402
+
+from nucypher.characters.lawful import Enrico  # noqa: E402
+
+DEFAULT_MESSAGES = 200
+
+
+class ReencryptionCounter:
+
+    def __init__(self, middleware):
+        self.requests = 0
+        self.capsules = 0
+        self.__reencrypt = middleware.reencrypt
+        middleware.reencrypt = self
+
+    def __call__(self, work_order):
+        self.requests += 1
+        self.capsules += len(work_order.tasks)
+        return self.__reencrypt(work_order)
+
+
+def main():
+    number_of_messages = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MESSAGES
+
+    ursulas = make_ursulas()
+    alice, bob, policy = make_policy(ursulas, label=b'session-retrieval-benchmark')
+    enrico = Enrico(policy_encrypting_key=policy.public_key)
+    retrieval = dict(enrico=enrico,
+                     alice_verifying_key=alice.stamp.as_umbral_pubkey(),
+                     label=policy.label,
+                     treasure_map=policy.treasure_map)
+    messages = [b'heartbeat %d' % i for i in range(number_of_messages)]
+    per_thousand = 1000 / number_of_messages
+
+    print(f"Retrieving {number_of_messages} messages from {len(ursulas)} Ursulas (m={policy.treasure_map.m}) ...")
+    print(f"{'':<22} {'requests':>10} {'re-encryptions':>15} {'seconds':>9}   (per 1000 messages)")
+    for name in ('One capsule each', 'One session'):
+        counter = ReencryptionCounter(bob.network_middleware)
+        start = time.perf_counter()
+        if name == 'One session':
+            envelope = enrico.start_session().encrypt_messages(messages)
+            cleartexts = bob.retrieve(envelope, **retrieval)
+        else:
+            cleartexts = list()
+            for message in messages:
+                message_kit, _signature = enrico.encrypt_message(message)
+                cleartexts.extend(bob.retrieve(message_kit, **retrieval))
+        elapsed = time.perf_counter() - start
+        assert cleartexts == messages
+        print(f"{name:<22} {counter.requests * per_thousand:>10.0f} {counter.capsules * per_thousand:>15.0f} "
+              f"{elapsed * per_thousand:>9.2f}")
+        del bob.network_middleware.reencrypt
+
+
+if __name__ == "__main__":
+    main()
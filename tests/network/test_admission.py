@@ -0,0 +1,113 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+import time
+
+import pytest
+
+from nucypher.network.admission import AdmissionController, GOSSIP, REENCRYPTION
+from nucypher.utilities.sandbox.ursula import make_federated_ursulas
+
+
+def test_client_rate_limit():
+    admission = AdmissionController(client_rate=1, client_burst=2)
+    for _ in range(2):
+        admission.acquire(client=b'bob', priority=REENCRYPTION)
+        admission.release()
+
+    with pytest.raises(AdmissionController.RateLimited) as e:
+        admission.acquire(client=b'bob', priority=REENCRYPTION)
+    assert 0 < e.value.retry_after <= 1
+    assert admission.rate_limited['reencryption'] == 1
+
+    # Other clients have their own budget.
+    with admission.admit(client=b'another bob', priority=REENCRYPTION):
+        assert admission.in_flight == 1
+    assert admission.in_flight == 0
+
+
+def test_in_flight_limit_and_priority():
+    admission = AdmissionController(max_in_flight=1, max_queued=2, queue_timeout=5, client_rate=None)
+    admission.acquire(client=None, priority=GOSSIP)
+
+    # Nothing may queue without a timeout.
+    with pytest.raises(AdmissionController.Overloaded) as e:
+        admission.acquire(client=None, priority=GOSSIP, timeout=0)
+    assert e.value.status == 503
+    assert e.value.retry_after >= 1
+
+    served = list()
+
+    def wait_for_slot(name, priority):
+        with admission.admit(client=None, priority=priority):
+            served.append(name)
+
+    gossip = threading.Thread(target=wait_for_slot, args=('gossip', GOSSIP))
+    gossip.start()
+    while admission.queue_depth < 1:
+        time.sleep(0.01)
+    reencryption = threading.Thread(target=wait_for_slot, args=('reencryption', REENCRYPTION))
+    reencryption.start()
+    while admission.queue_depth < 2:
+        time.sleep(0.01)
+
+    # The queue is full.
+    with pytest.raises(AdmissionController.Overloaded):
+        admission.acquire(client=None, priority=REENCRYPTION)
+
+    # Re-encryption queued last, but is served first.
+    admission.release()
+    gossip.join()
+    reencryption.join()
+    assert served == ['reencryption', 'gossip']
+    assert admission.queued == {'reencryption': 1, 'treasure_map': 0, 'gossip': 1}
+    assert admission.rejected == {'reencryption': 1, 'treasure_map': 0, 'gossip': 1}
+
+
+def test_ursula_refuses_requests_over_client_rate(ursula_federated_test_config):
+    ursula = make_federated_ursulas(ursula_config=ursula_federated_test_config,
+                                    quantity=1,
+                                    know_each_other=False,
+                                    max_in_flight_requests=AdmissionController.DEFAULT_MAX_IN_FLIGHT,
+                                    client_request_rate=1,
+                                    client_request_burst=1).pop()
+    client = ursula.rest_app.test_client()
+    fleet = ursula.known_nodes.checksum
+
+    response = client.post(f'/node_metadata?fleet={fleet}', data=b'')
+    assert response.status_code == 200
+
+    response = client.post(f'/node_metadata?fleet={fleet}', data=b'')
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert ursula.admission.rate_limited['gossip'] == 1
+
+    # Cheap routes aren't subject to admission control.
+    assert client.get('/public_information').status_code == 200
+    assert ursula.admission.in_flight == 0
+
+
+def test_ursula_without_admission_control(ursula_federated_test_config):
+    ursula = make_federated_ursulas(ursula_config=ursula_federated_test_config,
+                                    quantity=1,
+                                    know_each_other=False).pop()
+    assert ursula.admission is None  # Off unless it's configured
+
+    client = ursula.rest_app.test_client()
+    fleet = ursula.known_nodes.checksum
+    for _ in range(3):
+        assert client.post(f'/node_metadata?fleet={fleet}', data=b'').status_code == 200
@@ -0,0 +1,58 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import time
+
+from bytestring_splitter import VariableLengthBytestring
+
+from nucypher.characters.lawful import Ursula
+from nucypher.utilities.sandbox.ursula import make_federated_ursulas
+
+
+def announcement(*nodes):
+    return Ursula.batch_from_bytes(b''.join(bytes(VariableLengthBytestring(bytes(node))) for node in nodes))
+
+
+def test_announcements_are_verified_from_a_bounded_queue(ursula_federated_test_config):
+    teacher, newcomer, latecomer = make_federated_ursulas(ursula_config=ursula_federated_test_config,
+                                                          quantity=3,
+                                                          know_each_other=False)
+    verifier = teacher.announcement_verifier
+    verifier.start()
+    try:
+        # The same announcement, twice in a row, is verified once.
+        sprouts = announcement(newcomer, newcomer)
+        assert verifier.announce(sprouts) == 1
+        assert verifier.duplicates == 1
+
+        deadline = time.monotonic() + 10
+        while verifier.verified < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert newcomer in teacher.known_nodes
+        assert verifier.verified == 1
+
+        # Once known, re-announcing it with the same timestamp is a no-op.
+        assert verifier.announce(announcement(newcomer)) == 0
+
+        # Under overload, announcements are dropped rather than piling up.
+        verifier.max_pending = 0
+        assert verifier.announce(announcement(latecomer)) == 0
+        assert verifier.dropped == 1
+        assert verifier.queue_depth == 0
+        assert latecomer not in teacher.known_nodes
+    finally:
+        verifier.stop()
+    assert not verifier.running
@@ -0,0 +1,63 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+
+import pytest
+import pytest_twisted
+from twisted.internet import defer
+
+from nucypher.characters.lawful import Ursula
+from nucypher.crypto.signing import signature_splitter
+from nucypher.network.middleware import NotFound
+from nucypher.network.nodes import node_verification_cache
+from nucypher.utilities.sandbox.middleware import MockAsyncRestMiddleware
+
+
+@pytest_twisted.inlineCallbacks
+def test_async_middleware_fans_out_to_many_nodes(federated_ursulas):
+    middleware = MockAsyncRestMiddleware()
+    ursulas = list(federated_ursulas)
+
+    responses = yield defer.gatherResults([middleware.get_nodes_via_rest(node=ursula) for ursula in ursulas])
+    assert len(responses) == len(ursulas)
+    for ursula, response in zip(ursulas, responses):
+        assert response.status_code == 200
+        signature, node_payload = signature_splitter(response.content, return_remainder=True)
+        assert signature.verify(node_payload, ursula.stamp.as_umbral_pubkey())
+
+    # Errors surface as failures, as the blocking middleware raises them.
+    with pytest.raises(NotFound):
+        yield middleware.get_treasure_map_from_node(node=ursulas[0], map_id=os.urandom(32).hex())
+
+
+@pytest_twisted.inlineCallbacks
+def test_async_node_verification(federated_ursulas, mocker):
+    ursula = list(federated_ursulas)[0]
+    middleware = MockAsyncRestMiddleware()
+    node_information = mocker.spy(middleware.client, 'node_information')
+    node_verification_cache.clear()
+
+    stranger = Ursula.from_bytes(bytes(ursula))
+    verified = yield stranger.verify_node_async(middleware.client, certificate_filepath="doesn't matter")
+    assert verified
+    assert stranger.verified_node
+    assert node_information.call_count == 1
+
+    # The cache is shared with blocking verification.
+    another = Ursula.from_bytes(bytes(ursula))
+    assert another.verify_node(middleware.client, certificate_filepath="doesn't matter")
+    assert node_information.call_count == 1
@@ -0,0 +1,147 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest_twisted
+import requests
+from cryptography.hazmat.primitives import serialization
+from twisted.internet import threads
+from umbral.cfrags import CapsuleFrag
+from umbral.signing import Signature
+
+from nucypher.crypto.powers import DecryptingPower
+from nucypher.network.async_server import AsyncRESTServer
+from nucypher.network.middleware import RestMiddleware
+from nucypher.utilities.sandbox.ursula import make_federated_ursulas
+
+
+@pytest_twisted.inlineCallbacks
+def test_async_server_serves_same_bytes_as_flask_app(ursula_federated_test_config, tmpdir):
+    node = make_federated_ursulas(ursula_config=ursula_federated_test_config, quantity=1).pop()
+    server = AsyncRESTServer(ursula=node, reencryption_processes=0)
+    port = server.listen()
+
+    cert_filepath = str(tmpdir.join('async-test-cert'))
+    with open(cert_filepath, 'wb') as f:
+        f.write(node.certificate.public_bytes(serialization.Encoding.PEM))
+
+    def compare_with_flask_app():
+        flask_client = node.rest_app.test_client()
+        for path in ('/public_information', '/treasure_map/' + 'ab' * 32):
+            response = requests.get(f"https://{node.rest_url()}{path}", verify=cert_filepath)
+            expected = flask_client.get(path)
+            assert response.status_code == expected.status_code
+            assert response.content == expected.data
+
+        # Routes without a native handler are served by the Flask app.
+        response = requests.get(f"https://{node.rest_url()}/status/", verify=cert_filepath)
+        assert response.status_code == flask_client.get('/status/').status_code
+
+    try:
+        yield threads.deferToThread(compare_with_flask_app)
+    finally:
+        yield port.stopListening()
+
+
+@pytest_twisted.inlineCallbacks
+def test_async_server_reencrypts_in_worker_processes(enacted_federated_policy, federated_ursulas,
+                                                     federated_alice, federated_bob, capsule_side_channel, tmpdir):
+    treasure_map = enacted_federated_policy.treasure_map
+    map_id = treasure_map.public_id()
+    federated_bob.treasure_maps[map_id] = treasure_map
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+
+    capsule = capsule_side_channel().capsule
+    capsule.set_correctness_keys(delegating=enacted_federated_policy.public_key,
+                                 receiving=federated_bob.public_keys(DecryptingPower),
+                                 verifying=federated_alice.stamp.as_umbral_pubkey())
+
+    # Two Work Orders for the same capsule, one for each server, since neither will serve one twice.
+    work_orders, _ = federated_bob.work_orders_for_capsules(capsule,
+                                                            map_id=map_id,
+                                                            alice_verifying_key=federated_alice.stamp.as_umbral_pubkey(),
+                                                            num_ursulas=1)
+    address, async_work_order = list(work_orders.items())[0]
+    node = next(ursula for ursula in federated_ursulas if ursula.checksum_address == address)
+    flask_work_order = federated_bob.work_orders_for_capsules(capsule,
+                                                              treasure_map=treasure_map,
+                                                              alice_verifying_key=federated_alice.stamp.as_umbral_pubkey(),
+                                                              num_ursulas=len(federated_ursulas))[0][address]
+
+    server = AsyncRESTServer(ursula=node, reencryption_processes=2)
+    port = server.listen()
+
+    cert_filepath = str(tmpdir.join('async-reencryption-cert'))
+    with open(cert_filepath, 'wb') as f:
+        f.write(node.certificate.public_bytes(serialization.Encoding.PEM))
+
+    signature_length = Signature.expected_bytes_length()
+
+    def assert_signed_by_node(content: bytes):
+        signature, payload = Signature.from_bytes(content[:signature_length]), content[signature_length:]
+        assert signature.verify(payload, node.stamp.as_umbral_pubkey())
+
+    def compare_with_flask_app():
+        flask_client = node.rest_app.test_client()
+        url = f"https://{node.rest_url()}"
+
+        # Re-encryption, in a worker process.
+        path = f"/kFrag/{async_work_order.arrangement_id.hex()}/reencrypt"
+        response = requests.post(url + path, data=async_work_order.payload(), verify=cert_filepath)
+        assert response.status_code == 200
+        expected = flask_client.post(path, data=flask_work_order.payload())
+        assert expected.status_code == 200
+
+        # Both are properly signed by Ursula, and carry the same, correct, CFrag.
+        cfrags = async_work_order.complete(RestMiddleware.split_cfrags_and_signatures(response))
+        expected_cfrags = flask_work_order.complete(RestMiddleware.split_cfrags_and_signatures(expected))
+        assert len(cfrags) == len(expected_cfrags) == 1
+        cfrag_length = CapsuleFrag.expected_bytes_length()
+        assert bytes(cfrags[0])[:cfrag_length] == bytes(expected_cfrags[0])[:cfrag_length]
+        assert cfrags[0].verify_correctness(capsule)
+
+        # The same Work Order isn't served again.
+        response = requests.post(url + path, data=async_work_order.payload(), verify=cert_filepath)
+        assert response.status_code == 409
+
+        # Node metadata, with and without a matching fleet state.  Signatures differ; what they sign doesn't.
+        for path, fleet in (('/node_metadata', None), (f'/node_metadata?fleet={node.known_nodes.checksum}', 'match')):
+            if fleet:
+                response = requests.post(url + path, verify=cert_filepath)
+                expected = flask_client.post(path)
+            else:
+                response = requests.get(url + path, verify=cert_filepath)
+                expected = flask_client.get(path)
+            assert response.status_code == expected.status_code
+            if expected.status_code == 200:
+                assert response.content[signature_length:] == expected.data[signature_length:]
+                assert_signed_by_node(response.content)
+
+        # A stored TreasureMap, first from the datastore and then from memory.
+        node.treasure_maps.clear_cache()
+        path = f'/treasure_map/{map_id}'
+        expected = flask_client.get(path).data
+        node.treasure_maps.clear_cache()
+        for _ in range(2):
+            response = requests.get(url + path, verify=cert_filepath)
+            assert response.status_code == 200
+            assert response.content == expected
+
+    try:
+        yield threads.deferToThread(compare_with_flask_app)
+    finally:
+        yield port.stopListening()
+        server.shutdown_reencryption_pool()
@@ -0,0 +1,81 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest_twisted
+from cryptography.hazmat.primitives import serialization
+from twisted.internet import threads
+
+from nucypher.characters.lawful import Ursula
+from nucypher.network.async_server import AsyncRESTServer
+from nucypher.network.middleware import NucypherMiddlewareClient, PeerSessionPool
+from nucypher.utilities.sandbox.ursula import make_federated_ursulas
+
+
+def test_peer_sessions_are_keyed_by_certificate():
+    pool = PeerSessionPool(max_peers=2)
+    session = pool.session('127.0.0.1:10151', 'ursula.pem')
+    assert pool.session('127.0.0.1:10151', 'ursula.pem') is session
+
+    # A different certificate for the same address never shares connections.
+    assert pool.session('127.0.0.1:10151', 'vladimir.pem') is not session
+
+    # Beyond max_peers, the least recently used session is closed.
+    pool.session('127.0.0.1:10152', 'another.pem')
+    assert len(pool) == 2
+    assert pool.session('127.0.0.1:10151', 'ursula.pem') is not session
+
+    # Idle sessions are closed as well.
+    pool.idle_timeout = 0
+    pool.session('127.0.0.1:10153', 'yet-another.pem')
+    assert len(pool) == 1
+    pool.close()
+    assert len(pool) == 0
+
+
+@pytest_twisted.inlineCallbacks
+def test_middleware_client_reuses_tls_connections(ursula_federated_test_config, tmpdir):
+    node = make_federated_ursulas(ursula_config=ursula_federated_test_config, quantity=1).pop()
+    port = AsyncRESTServer(ursula=node, reencryption_processes=0).listen()
+
+    cert_filepath = str(tmpdir.join('pooled-cert'))
+    with open(cert_filepath, 'wb') as f:
+        f.write(node.certificate.public_bytes(serialization.Encoding.PEM))
+
+    client = NucypherMiddlewareClient()
+    host, rest_port = node.rest_interface.host, node.rest_interface.port
+
+    def fetch_public_information(times, certificate_filepath=cert_filepath):
+        for _ in range(times):
+            content = client.node_information(host, rest_port, certificate_filepath=certificate_filepath)
+            assert Ursula.from_bytes(content) == node
+
+    try:
+        yield threads.deferToThread(fetch_public_information, 5)
+        connections, requests_sent = client.sessions.stats()
+        assert requests_sent == 5
+        assert connections == 1  # One TLS handshake
+
+        # A request pinned to another certificate doesn't reuse a connection verified against the first.
+        other_cert_filepath = str(tmpdir.join('other-pooled-cert'))
+        with open(other_cert_filepath, 'wb') as f:
+            f.write(node.certificate.public_bytes(serialization.Encoding.PEM))
+        yield threads.deferToThread(fetch_public_information, 1, other_cert_filepath)
+        connections, requests_sent = client.sessions.stats()
+        assert len(client.sessions) == 2
+        assert connections == 2
+    finally:
+        client.sessions.close()
+        yield port.stopListening()
@@ -23,8 +23,9 @@ from nucypher.characters.lawful import Ursula
 from nucypher.characters.unlawful import Vladimir
 from nucypher.crypto.api import keccak_digest
 from nucypher.crypto.powers import SigningPower
+from nucypher.crypto.signing import verification_memo
 from nucypher.network.nicknames import nickname_from_seed
-from nucypher.network.nodes import FleetStateTracker
+from nucypher.network.nodes import FleetStateTracker, node_verification_cache
 from nucypher.utilities.sandbox.constants import INSECURE_DEVELOPMENT_PASSWORD
 from nucypher.utilities.sandbox.middleware import MockRestMiddleware
 
@@ -131,6 +132,74 @@ def test_treasure_map_is_legit(enacted_federated_policy):
         assert ursula_address in enacted_federated_policy.bob.known_nodes.addresses()
 
 
+def test_treasure_map_keeps_wire_bytes_and_verifies_once(enacted_federated_policy, mocker):
+    treasure_map = enacted_federated_policy.treasure_map
+    wire_bytes = bytes(treasure_map)
+
+    TreasureMap = treasure_map.__class__
+    verification_memo.clear()
+    verify_spy = mocker.spy(treasure_map._public_signature.__class__, 'verify')
+
+    first = TreasureMap.from_bytes(wire_bytes, verify=True)
+    second = TreasureMap.from_bytes(wire_bytes, verify=True)
+    assert verify_spy.call_count == 1
+    assert verification_memo.hits['treasure_map'] == 1
+
+    # The parsed map serves the bytes it was parsed from, and its ID is computed once.
+    assert bytes(first) == bytes(second) == wire_bytes
+    assert first.public_id() == treasure_map.public_id()
+    assert first._public_id is not None
+
+
+def test_node_verification_is_cached_across_instances(federated_ursulas, mocker):
+    ursula = list(federated_ursulas)[0]
+    middleware = MockRestMiddleware()
+    node_information = mocker.spy(middleware.client, 'node_information')
+    node_verification_cache.clear()
+
+    def fresh_instance():
+        return Ursula.from_bytes(bytes(ursula))
+
+    fresh_instance().verify_node(middleware.client, certificate_filepath="doesn't matter")
+    assert node_information.call_count == 1
+
+    # Another instance of the same node is already known to be good.
+    another = fresh_instance()
+    another.verify_node(middleware.client, certificate_filepath="doesn't matter")
+    assert another.verified_node
+    assert node_information.call_count == 1
+    assert node_verification_cache.hits == 1
+
+    # Forcing always goes back to the node.
+    another.verify_node(middleware.client, certificate_filepath="doesn't matter", force=True)
+    assert node_information.call_count == 2
+
+    # Once its certificate is rejected, the node is verified again on next use.
+    another.forget_verification()
+    fresh_instance().verify_node(middleware.client, certificate_filepath="doesn't matter")
+    assert node_information.call_count == 3
+
+
+def test_tampered_node_is_not_verified_by_the_cache(federated_ursulas, mocker):
+    ursula = list(federated_ursulas)[0]
+    middleware = MockRestMiddleware()
+    node_information = mocker.spy(middleware.client, 'node_information')
+    node_verification_cache.clear()
+
+    Ursula.from_bytes(bytes(ursula)).verify_node(middleware.client, certificate_filepath="doesn't matter")
+    assert node_information.call_count == 1
+
+    # Someone replays this node's metadata with a different timestamp, under the same interface signature.
+    tampered = Ursula.from_bytes(bytes(ursula))
+    tampered._timestamp = tampered.timestamp.add(days=1)
+    assert node_verification_cache.is_verified(tampered) is False
+
+    with pytest.raises(Ursula.InvalidNode):
+        tampered.verify_node(middleware.client, certificate_filepath="doesn't matter")
+    assert not tampered.verified_node
+    assert node_information.call_count == 1
+
+
 @pytest.mark.skip("See Issue #1075")  # TODO: Issue #1075
 def test_vladimir_illegal_interface_key_does_not_propagate(blockchain_ursulas):
     """